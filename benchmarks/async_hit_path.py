@@ -0,0 +1,63 @@
+"""
+Compares an asynchronous `shared_resource` with `async_lru.alru_cache` on two paths:
+
+* hit: awaiting an already built resource;
+* contended miss: many tasks requesting the same missing key at once, which must all share
+  a single initialization.
+
+`async-lru` is only needed for this benchmark (see requirements-dev.txt).
+
+Usage: python3 -m benchmarks.async_hit_path
+"""
+import asyncio
+from time import perf_counter
+from typing import Any, Awaitable, Callable, List
+
+from async_lru import alru_cache
+
+from vedro_shared_resource import shared_resource
+
+HITS = 200_000
+MISSES = 2_000
+WAITERS = 100
+
+
+async def factory(name: str, *, headless: bool = True) -> object:
+    await asyncio.sleep(0)
+    return object()
+
+
+async def measure_hits(fn: Callable[..., Awaitable[Any]]) -> float:
+    await fn("chromium", headless=False)
+    started_at = perf_counter()
+    for _ in range(HITS):
+        await fn("chromium", headless=False)
+    return (perf_counter() - started_at) / HITS * 1e9
+
+
+async def measure_contended_misses(make: Callable[[], Callable[..., Awaitable[Any]]]) -> float:
+    fn = make()
+    elapsed = 0.0
+    for idx in range(MISSES):
+        started_at = perf_counter()
+        results: List[Any] = await asyncio.gather(*[fn(f"browser-{idx}") for _ in range(WAITERS)])
+        elapsed += perf_counter() - started_at
+        assert all(result is results[0] for result in results)
+    return elapsed / MISSES * 1e6
+
+
+async def main() -> None:
+    cases = [
+        ("alru_cache", lambda: alru_cache(maxsize=None)(factory)),
+        ("shared_resource", lambda: shared_resource(max_instances=MISSES + 1)(factory)),
+    ]
+    print("hit")
+    for name, make in cases:
+        print(f"  {name:<16} {await measure_hits(make()):8.1f} ns/call")
+    print(f"contended miss ({WAITERS} waiters)")
+    for name, make in cases:
+        print(f"  {name:<16} {await measure_contended_misses(make):8.1f} us/key")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+"""
+Measures the cache-hit cost of a synchronous `shared_resource`.
+
+Besides the C-implemented `functools.lru_cache`, the results include a pure-Python memo with
+and without a lock, which shows how much of the hit cost comes from the single-flight locking
+rather than from running the wrapper in Python.
+
+Usage: python3 -m benchmarks.sync_hit_path
+"""
+from functools import lru_cache
+from threading import Lock
+from timeit import repeat
+from typing import Any, Callable, Dict
+
+from vedro_shared_resource import shared_resource
+
+NUMBER = 200_000
+
+
+def factory(name: str, *, headless: bool = True) -> object:
+    return object()
+
+
+def python_memo(fn: Callable[..., Any], *, locked: bool) -> Callable[..., Any]:
+    cache: Dict[Any, Any] = {}
+    lock = Lock()
+
+    def unlocked_wrapper(*args: Any, **kwargs: Any) -> Any:
+        key = (args, tuple(kwargs.items()))
+        try:
+            return cache[key]
+        except KeyError:
+            cache[key] = result = fn(*args, **kwargs)
+            return result
+
+    def locked_wrapper(*args: Any, **kwargs: Any) -> Any:
+        key = (args, tuple(kwargs.items()))
+        with lock:
+            if key in cache:
+                return cache[key]
+        cache[key] = result = fn(*args, **kwargs)
+        return result
+
+    return locked_wrapper if locked else unlocked_wrapper
+
+
+def measure(fn: Callable[..., Any], stmt: str) -> float:
+    timings = repeat(stmt, globals={"fn": fn}, number=NUMBER, repeat=5)
+    return min(timings) / NUMBER * 1e9
+
+
+def main() -> None:
+    cases = [
+        ("lru_cache", lru_cache(maxsize=128)(factory)),
+        ("python memo", python_memo(factory, locked=False)),
+        ("python memo+lock", python_memo(factory, locked=True)),
+        ("shared_resource", shared_resource()(factory)),
+    ]
+    for stmt in ["fn('chromium')", "fn('chromium', headless=False)"]:
+        print(stmt)
+        for name, fn in cases:
+            print(f"  {name:<18} {measure(fn, stmt):8.1f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
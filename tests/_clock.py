@@ -0,0 +1,20 @@
+from contextlib import ExitStack
+from unittest.mock import patch
+
+__all__ = ("FakeClock", "frozen",)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def frozen(clock, *modules, name="monotonic"):
+    # Replaces the clock function `name` in each given module of vedro_shared_resource
+    stack = ExitStack()
+    for module in modules:
+        stack.enter_context(patch(f"vedro_shared_resource.{module}.{name}", clock))
+    return stack
@@ -0,0 +1,123 @@
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock
+
+from vedro.core import (
+    Dispatcher,
+    Factory,
+    MonotonicScenarioScheduler,
+    Report,
+    ScenarioOrderer,
+    ScenarioResult,
+)
+from vedro.core.scenario_orderer import StableScenarioOrderer
+from vedro.events import (
+    ArgParsedEvent,
+    ArgParseEvent,
+    CleanupEvent,
+    ConfigLoadedEvent,
+    ScenarioPassedEvent,
+    ScenarioRunEvent,
+    StartupEvent,
+)
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import (
+    SharedResourceAffinity,
+    SharedResourceAffinityPlugin,
+    shared_resource,
+)
+
+
+async def make_dispatcher(path, args):
+    class AffinityConfig(SharedResourceAffinity):
+        usage_path = path
+
+    config = Mock(Registry=Mock(ScenarioOrderer=Factory[ScenarioOrderer](StableScenarioOrderer)))
+    dispatcher = Dispatcher()
+    SharedResourceAffinityPlugin(AffinityConfig).subscribe(dispatcher)
+
+    await dispatcher.fire(ConfigLoadedEvent(Path("vedro.cfg.py"), config))
+    arg_parser = ArgumentParser()
+    await dispatcher.fire(ArgParseEvent(arg_parser))
+    await dispatcher.fire(ArgParsedEvent(arg_parser.parse_args(args)))
+    return dispatcher, config.Registry.ScenarioOrderer()
+
+
+async def run_suite(path, scenarios, args=(), report=None):
+    # scenarios: list of (unique_id, callable run inside the scenario)
+    dispatcher, orderer = await make_dispatcher(path, list(args))
+    bodies = dict(scenarios)
+    virtual = [Mock(unique_id=uid, path=Path(f"scenarios/{uid}.py")) for uid, _ in scenarios]
+    ordered = await orderer.sort(virtual)
+    await dispatcher.fire(StartupEvent(MonotonicScenarioScheduler(ordered)))
+    for scn in ordered:
+        result = ScenarioResult(scn)
+        await dispatcher.fire(ScenarioRunEvent(result))
+        bodies[scn.unique_id]()
+        await dispatcher.fire(ScenarioPassedEvent(result))
+    await dispatcher.fire(CleanupEvent(Report() if report is None else report))
+    return [scn.unique_id for scn in ordered]
+
+
+def make_suite(browser):
+    return [("a", lambda: browser("chromium")), ("b", lambda: browser("firefox")),
+            ("c", lambda: browser("chromium")), ("d", lambda: None),
+            ("e", lambda: browser("firefox"))]
+
+
+@scenario
+async def keep_stable_order_without_flag():
+    with given:
+        tmp = TemporaryDirectory()
+        path = Path(tmp.name) / "usage.json"
+        browser = shared_resource(max_instances=1)(lambda name: name)
+        await run_suite(path, make_suite(browser))
+
+    with when:
+        order = await run_suite(path, make_suite(browser))
+
+    with then:
+        assert order == ["a", "b", "c", "d", "e"]
+        tmp.cleanup()
+
+
+@scenario
+async def group_scenarios_using_same_instances():
+    with given:
+        tmp = TemporaryDirectory()
+        path = Path(tmp.name) / "usage.json"
+        factory = Mock(side_effect=lambda name: name)
+        browser = shared_resource(max_instances=1)(lambda name: factory(name))
+        await run_suite(path, make_suite(browser))
+        browser.cache_clear()
+        factory.reset_mock()
+        report = Report()
+
+    with when:
+        order = await run_suite(path, make_suite(browser), ["--order-resources"], report)
+
+    with then:
+        assert order == ["a", "c", "b", "e", "d"]
+        assert factory.call_count == 2
+        assert report.summary == [
+            "Shared resources: 5 scenarios ordered by resource affinity, "
+            "estimated inits 4 -> 2 (2 saved)"
+        ]
+        tmp.cleanup()
+
+
+@scenario
+async def run_scenarios_without_recorded_usage_last():
+    with given:
+        tmp = TemporaryDirectory()
+        path = Path(tmp.name) / "usage.json"
+        browser = shared_resource(max_instances=1)(lambda name: name)
+
+    with when:
+        order = await run_suite(path, make_suite(browser), ["--order-resources"])
+
+    with then:
+        assert order == ["a", "b", "c", "d", "e"]
+        tmp.cleanup()
@@ -0,0 +1,53 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import shared_resource
+
+
+async def blob(size):
+    return "x" * size
+
+
+@scenario
+async def evict_least_recently_used_until_budget_fits():
+    with given:
+        finalizer = AsyncMock()
+        memoized = shared_resource(max_bytes=100, sizeof=len, finalizer=finalizer)(blob)
+        await memoized(30)
+        await memoized(40)
+        await memoized(20)
+
+    with when:
+        await memoized(50)
+        await memoized.cache_close()
+
+    with then:
+        assert finalizer.await_args_list[:2] == [(("x" * 30,),), (("x" * 40,),)]
+
+
+@scenario
+async def measure_resource_once_ready():
+    with given:
+        release = asyncio.Event()
+        finalizer = AsyncMock()
+
+        async def slow_blob(size):
+            if size == 60:
+                await release.wait()
+            return "x" * size
+
+        memoized = shared_resource(max_bytes=100, sizeof=len, finalizer=finalizer)(slow_blob)
+        await memoized(80)
+        pending = asyncio.ensure_future(memoized(60))
+        await asyncio.sleep(0)
+
+    with when:
+        release.set()
+        result = await pending
+        await memoized.cache_close()
+
+    with then:
+        assert len(result) == 60
+        assert finalizer.await_args_list == [(("x" * 80,),), (("x" * 60,),)]
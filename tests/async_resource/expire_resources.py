@@ -0,0 +1,70 @@
+from unittest.mock import AsyncMock, Mock
+
+from vedro_fn import given, scenario, then, when
+
+from tests._clock import FakeClock, frozen
+from vedro_shared_resource import shared_resource
+
+
+@scenario
+async def rebuild_resource_after_ttl():
+    with given:
+        clock = FakeClock()
+        factory, finalizer = AsyncMock(side_effect=[1, 2]), AsyncMock()
+        memoized = shared_resource(ttl=10, finalizer=finalizer)(factory)
+        with frozen(clock, "_async_resource"):
+            first = await memoized()
+
+    with when:
+        clock.now += 10
+        with frozen(clock, "_async_resource"):
+            second = await memoized()
+
+    with then:
+        assert (first, second) == (1, 2)
+        finalizer.assert_awaited_once_with(1)
+
+
+@scenario
+async def extend_idle_timeout_on_access():
+    with given:
+        clock = FakeClock()
+        factory = AsyncMock(side_effect=[1, 2])
+        memoized = shared_resource(idle_timeout=10)(factory)
+        with frozen(clock, "_async_resource"):
+            await memoized()
+            clock.now += 6
+            await memoized()
+
+    with when:
+        clock.now += 6
+        with frozen(clock, "_async_resource"):
+            result = await memoized()
+
+    with then:
+        assert result == 1
+        assert factory.await_count == 1
+
+
+@scenario
+async def count_lifetime_from_completed_initialization():
+    with given:
+        clock = FakeClock()
+        finalizer = Mock()
+
+        async def build(x):
+            clock.now += 20  # a slow initialization does not eat into the lifetime
+            return x
+
+        memoized = shared_resource(ttl=10, finalizer=finalizer)(build)
+        with frozen(clock, "_async_resource"):
+            await memoized(1)
+
+    with when:
+        clock.now += 5
+        with frozen(clock, "_async_resource"):
+            result = await memoized(1)
+
+    with then:
+        assert result == 1
+        assert finalizer.call_count == 0
@@ -0,0 +1,122 @@
+import asyncio
+import warnings
+from unittest.mock import AsyncMock, Mock
+
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import shared_resource
+
+
+async def add(a, b):
+    return a + b
+
+
+@scenario
+async def finalize_resource_on_eviction():
+    with given:
+        finalizer = Mock()
+        memoized = shared_resource(max_instances=1, finalizer=finalizer)(add)
+        await memoized(1, 2)
+
+    with when:
+        await memoized(2, 2)
+
+    with then:
+        assert finalizer.mock_calls == [((3,),)]
+
+
+@scenario
+async def await_async_finalizer_on_eviction():
+    with given:
+        finalizer = AsyncMock()
+        memoized = shared_resource(max_instances=1, finalizer=finalizer)(add)
+        await memoized(1, 2)
+
+    with when:
+        await memoized(2, 2)
+
+    with then:
+        finalizer.assert_awaited_once_with(3)
+
+
+@scenario
+async def finalize_all_resources_on_cache_close():
+    with given:
+        finalizer = AsyncMock()
+        memoized = shared_resource(finalizer=finalizer)(add)
+        await memoized(1, 2)
+        await memoized(2, 2)
+
+    with when:
+        await memoized.cache_close()
+
+    with then:
+        assert finalizer.await_args_list == [((3,),), ((4,),)]
+        assert memoized.cache_info().currsize == 0
+
+
+@scenario
+async def keep_pending_resource_until_its_callers_got_it():
+    with given:
+        class Connection:
+            closed = False
+
+            def close(self):
+                self.closed = True
+
+        async def connect(name, delay):
+            await asyncio.sleep(delay)
+            return Connection()
+
+        memoized = shared_resource(max_instances=1, finalizer=Connection.close)(connect)
+
+        async def use(name, delay):
+            conn = await memoized(name, delay)
+            await asyncio.sleep(0)
+            return conn.closed
+
+    with when:
+        closed_in_use = await asyncio.gather(use("slow", 0.02), use("fast", 0.01))
+        await asyncio.sleep(0.01)
+
+    with then:
+        assert closed_in_use == [False, False]
+        assert memoized.keys() == [("slow", 0.02)]
+
+
+@scenario
+async def warn_about_failing_finalizer_on_eviction():
+    with given:
+        finalizer = AsyncMock(side_effect=ConnectionError("closed"))
+        memoized = shared_resource(max_instances=1, finalizer=finalizer)(add)
+        await memoized(1, 2)
+
+    with when:
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            result = await memoized(2, 2)
+
+    with then:
+        assert result == 4
+        assert [w.category for w in caught] == [RuntimeWarning]
+        assert "ConnectionError('closed')" in str(caught[0].message)
+
+
+@scenario
+async def finalize_all_resources_before_raising_on_cache_close():
+    with given:
+        finalizer = AsyncMock(side_effect=[ConnectionError("closed"), None])
+        memoized = shared_resource(finalizer=finalizer)(add)
+        await memoized(1, 2)
+        await memoized(2, 2)
+
+    with when:
+        try:
+            await memoized.cache_close()
+        except ConnectionError as e:
+            exc = e
+
+    with then:
+        assert str(exc) == "closed"
+        assert finalizer.await_count == 2
+        assert memoized.cache_info().currsize == 0
@@ -0,0 +1,79 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import shared_resource
+
+
+def make_resource(finalizer=None, delay=0.0):
+    async def connect(name, retries=3):
+        await asyncio.sleep(delay)
+        return object()
+
+    return shared_resource(finalizer=finalizer)(connect)
+
+
+@scenario
+async def list_cached_keys():
+    with given:
+        connect = make_resource()
+        await connect("db")
+        await connect("cache", retries=1)
+
+    with when:
+        keys = connect.keys()
+
+    with then:
+        assert keys == [("db", 3), ("cache", 1)]
+
+
+@scenario
+async def peek_without_building():
+    with given:
+        connect = make_resource()
+        db = await connect("db")
+
+    with when:
+        peeked, missing = connect.peek("db"), connect.peek("cache")
+
+    with then:
+        assert peeked is db
+        assert missing is None
+        assert connect.contains("db")
+        assert not connect.contains("cache")
+        assert connect.cache_info().hits == 0
+
+
+@scenario
+async def peek_pending_instance():
+    with given:
+        connect = make_resource(delay=0.01)
+        building = asyncio.ensure_future(connect("db"))
+        await asyncio.sleep(0)
+
+    with when:
+        peeked = connect.peek("db")
+
+    with then:
+        assert peeked is None
+        assert connect.contains("db")  # being built counts as cached
+        assert await building is connect.peek("db")
+
+
+@scenario
+async def invalidate_single_instance():
+    with given:
+        finalizer = AsyncMock()
+        connect = make_resource(finalizer)
+        db, cache = await connect("db"), await connect("cache")
+
+    with when:
+        dropped = connect.invalidate("db")
+        await asyncio.sleep(0.01)  # finalized in the background
+
+    with then:
+        assert dropped is True
+        assert [call.args for call in finalizer.await_args_list] == [(db,)]
+        assert connect.keys() == [("cache", 3)]
+        assert await connect("cache") is cache
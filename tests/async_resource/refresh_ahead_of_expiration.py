@@ -0,0 +1,76 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+from vedro_fn import given, scenario, then, when
+
+from tests._clock import FakeClock, frozen
+from vedro_shared_resource import shared_resource
+
+
+@scenario
+async def serve_old_instance_while_refreshing():
+    with given:
+        clock, gate = FakeClock(), asyncio.Event()
+        calls = []
+
+        async def connect():
+            calls.append(len(calls) + 1)
+            if len(calls) > 1:
+                await gate.wait()  # the refresh is still running while the scenario calls
+            return calls[-1]
+
+        finalizer = AsyncMock()
+        memoized = shared_resource(ttl=10, refresh_ahead=0.5, finalizer=finalizer)(connect)
+        with frozen(clock, "_async_resource", "_base_resource"):
+            await memoized()
+
+    with when:
+        clock.now += 5
+        with frozen(clock, "_async_resource", "_base_resource"):
+            during = [await memoized(), await memoized()]
+            gate.set()
+            for _ in range(100):  # until the old instance is finalized
+                if finalizer.await_count:
+                    break
+                await asyncio.sleep(0)
+            after = await memoized()
+
+    with then:
+        assert during == [1, 1]
+        assert after == 2
+        assert calls == [1, 2]  # a single refresh
+        assert [call.args for call in finalizer.await_args_list] == [(1,)]
+        assert memoized.cache_info().currsize == 1
+
+
+@scenario
+async def evict_others_if_refreshed_instance_is_bigger():
+    with given:
+        clock = FakeClock()
+        values = {"a": iter(["old", "refreshed"]), "b": iter(["old"])}
+        finalizer = AsyncMock()
+
+        async def connect(name):
+            return next(values[name])
+
+        memoized = shared_resource(ttl=10, refresh_ahead=0.5, max_bytes=10, sizeof=len,
+                                   finalizer=finalizer)(connect)
+        with frozen(clock, "_async_resource", "_base_resource"):
+            await memoized("a")
+            clock.now += 3
+            await memoized("b")  # not due for a refresh yet
+
+    with when:
+        clock.now += 2
+        with frozen(clock, "_async_resource", "_base_resource"):
+            await memoized("a")
+            for _ in range(100):  # until the refresh and its evictions are finalized
+                if finalizer.await_count == 2:
+                    break
+                await asyncio.sleep(0)
+            cached = [memoized.peek("a"), memoized.peek("b")]
+
+    with then:
+        assert cached == ["refreshed", None]
+        assert [call.args for call in finalizer.await_args_list] == [("old",), ("old",)]
+        assert memoized.cache_info().currsize == 1
@@ -1,6 +1,9 @@
+import asyncio
+import inspect
+import sys
 from unittest.mock import AsyncMock
 
-from vedro import params
+from vedro import params, skip_if
 from vedro_fn import given, scenario, then, when
 
 from vedro_shared_resource import shared_resource
@@ -24,6 +27,30 @@ async def retrieve_resource_on_first_access():
         assert mock.call_count == 1
 
 
+@scenario
+def recognize_resource_as_coroutine_function():
+    with given:
+        memoized = shared_resource()(add)
+
+    with when:
+        result = asyncio.iscoroutinefunction(memoized)
+
+    with then:
+        assert result is True
+
+
+@scenario[skip_if(lambda: sys.version_info < (3, 12), "inspect marks coroutines since 3.12")]
+def recognize_resource_as_coroutine_function_with_inspect():
+    with given:
+        memoized = shared_resource()(add)
+
+    with when:
+        result = (inspect.iscoroutinefunction(memoized), asyncio.iscoroutinefunction(memoized))
+
+    with then:
+        assert result == (True, True)
+
+
 @scenario
 async def retrieve_cached_resource_on_subsequent_access():
     with given:
@@ -0,0 +1,110 @@
+import asyncio
+from threading import Barrier, Thread
+
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import shared_resource
+
+
+class Connection:
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.closed_on = None
+
+    async def close(self):
+        self.closed_on = asyncio.get_running_loop()
+
+
+def run_in_new_loop(coro):
+    # Scenarios run on vedro's own loop, so each `asyncio.run()` gets a thread of its own
+    results = []
+    thread = Thread(target=lambda: results.append(asyncio.run(coro)), daemon=True)
+    thread.start()
+    thread.join()
+    return results[0]
+
+
+def make_resource():
+    async def connect(name):
+        return Connection()
+
+    return shared_resource(finalizer=Connection.close)(connect)
+
+
+@scenario
+def rebuild_resource_for_new_event_loop():
+    with given:
+        connect = make_resource()
+        first = run_in_new_loop(connect("db"))
+
+    with when:
+        second = run_in_new_loop(connect("db"))
+
+    with then:
+        assert second is not first
+        assert second.loop is not first.loop
+        assert first.closed_on is not None  # dropped once its loop was closed
+        assert connect.cache_info().currsize == 1
+
+
+@scenario
+def share_resource_within_event_loop():
+    with given:
+        connect = make_resource()
+
+        async def use_twice():
+            return await connect("db"), await connect("db")
+
+    with when:
+        first, second = run_in_new_loop(use_twice())
+
+    with then:
+        assert first is second
+
+
+@scenario
+def build_separate_resources_for_concurrent_loops():
+    with given:
+        connect = make_resource()
+        barrier = Barrier(2)
+        results = {}
+
+        def worker(name):
+            async def use():
+                conn = await connect("db")
+                await asyncio.get_running_loop().run_in_executor(None, barrier.wait)
+                return conn, await connect("db")
+            results[name] = asyncio.run(use())
+
+        threads = [Thread(target=worker, args=(name,), daemon=True) for name in ("a", "b")]
+
+    with when:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    with then:
+        (a_first, a_second), (b_first, b_second) = results["a"], results["b"]
+        assert a_first is a_second
+        assert b_first is b_second
+        assert a_first is not b_first
+
+
+@scenario
+def finalize_resource_on_its_own_loop():
+    with given:
+        connect = make_resource()
+        owner = asyncio.new_event_loop()
+        thread = Thread(target=owner.run_forever, daemon=True)
+        thread.start()
+        conn = asyncio.run_coroutine_threadsafe(connect("db"), owner).result()
+
+    with when:
+        run_in_new_loop(connect.cache_close())
+
+    with then:
+        assert conn.closed_on is owner
+        owner.call_soon_threadsafe(owner.stop)
+        thread.join()
+        owner.close()
@@ -0,0 +1,76 @@
+import asyncio
+from unittest.mock import Mock
+
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import shared_resource
+
+
+@scenario
+async def share_single_initialization_between_waiters():
+    with given:
+        release = asyncio.Event()
+        factory = Mock(side_effect=lambda name: object())
+
+        async def connect(name):
+            await release.wait()
+            return factory(name)
+
+        memoized = shared_resource()(connect)
+        waiters = [asyncio.ensure_future(memoized("db")) for _ in range(10)]
+        await asyncio.sleep(0)
+
+    with when:
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+    with then:
+        assert factory.call_count == 1
+        assert all(result is results[0] for result in results)
+        assert memoized.cache_info().hits == 9
+
+
+@scenario
+async def keep_initialization_when_waiter_is_cancelled():
+    with given:
+        release = asyncio.Event()
+
+        async def connect(name):
+            await release.wait()
+            return name
+
+        memoized = shared_resource()(connect)
+        cancelled = asyncio.ensure_future(memoized("db"))
+        waiting = asyncio.ensure_future(memoized("db"))
+        await asyncio.sleep(0)
+
+    with when:
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        result = await waiting
+
+    with then:
+        assert cancelled.cancelled()
+        assert result == "db"
+        assert memoized.cache_info().currsize == 1
+
+
+@scenario
+async def return_ready_instance_without_suspending():
+    with given:
+        async def connect():
+            return "db"
+
+        memoized = shared_resource()(connect)
+        await memoized()
+        call = memoized()
+
+    with when:
+        try:
+            call.send(None)
+        except StopIteration as exc:
+            result = exc.value
+
+    with then:
+        assert result == "db"
@@ -0,0 +1,76 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import shared_resource
+
+
+class Connection:
+    def __init__(self, name):
+        self.name = name
+        self.alive = True
+
+
+async def connect(name):
+    return Connection(name)
+
+
+@scenario
+async def rebuild_resource_that_failed_validation():
+    with given:
+        async def ping(conn):
+            return conn.alive
+
+        finalizer = AsyncMock()
+        memoized = shared_resource(validate=ping, finalizer=finalizer)(connect)
+        dead = await memoized("db")
+        dead.alive = False
+
+    with when:
+        conn = await memoized("db")
+
+    with then:
+        assert conn is not dead
+        finalizer.assert_awaited_once_with(dead)
+        assert memoized.cache_info().currsize == 1
+
+
+@scenario
+async def keep_healthy_resource():
+    with given:
+        validate = Mock(return_value=True)
+        memoized = shared_resource(validate=validate)(connect)
+        conn = await memoized("db")
+
+    with when:
+        result = await memoized("db")
+
+    with then:
+        assert result is conn
+        assert validate.mock_calls == [((conn,),)]
+
+
+@scenario
+async def wait_for_validation_in_progress():
+    with given:
+        release = asyncio.Event()
+
+        async def ping(conn):
+            await release.wait()
+            return False
+
+        factory = AsyncMock(side_effect=connect)
+        memoized = shared_resource(validate=ping)(factory)
+        dead = await memoized("db")
+
+    with when:
+        tasks = [asyncio.ensure_future(memoized("db")) for _ in range(4)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+    with then:
+        assert dead not in results
+        assert len({id(conn) for conn in results}) == 1
+        assert factory.await_count == 2
@@ -0,0 +1,107 @@
+import multiprocessing
+import os
+
+from vedro import defer
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import ResourceCoordinator, shared_resource
+
+
+class Counter:
+    def __init__(self):
+        self._value = 0
+
+    def increment(self):
+        self._value += 1
+        return self._value
+
+
+@shared_resource(cross_process="value")
+def owner_pid(name):
+    return os.getpid()
+
+
+@shared_resource(cross_process="value")
+async def async_owner_pid(name):
+    return os.getpid()
+
+
+@shared_resource(cross_process="proxy")
+def counter(name):
+    return Counter()
+
+
+def call_in_worker(fn, *args):
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    process = ctx.Process(target=lambda: queue.put(fn(*args)))
+    process.start()
+    result = queue.get(timeout=10)
+    process.join(timeout=10)
+    return result
+
+
+def start_coordinator():
+    coordinator = ResourceCoordinator()
+    coordinator.start()
+    defer(coordinator.shutdown)
+    return coordinator
+
+
+@scenario
+def build_resource_in_coordinator_process():
+    with given:
+        start_coordinator()
+
+    with when:
+        result = owner_pid("build")
+
+    with then:
+        assert result != os.getpid()
+
+
+@scenario
+def share_one_instance_between_workers():
+    with given:
+        start_coordinator()
+
+    with when:
+        results = [call_in_worker(owner_pid, "share") for _ in range(2)]
+
+    with then:
+        assert results[0] == results[1]
+        assert results[0] != os.getpid()
+
+
+@scenario
+async def build_async_resource_in_coordinator_process():
+    with given:
+        start_coordinator()
+
+    with when:
+        result = await async_owner_pid("async")
+
+    with then:
+        assert result != os.getpid()
+
+
+@scenario
+def forward_method_calls_through_proxy():
+    with given:
+        start_coordinator()
+        call_in_worker(lambda: counter("proxy").increment())
+
+    with when:
+        result = counter("proxy").increment()
+
+    with then:
+        assert result == 2
+
+
+@scenario
+def build_resource_locally_without_coordinator():
+    with when:
+        result = owner_pid("local")
+
+    with then:
+        assert result == os.getpid()
@@ -0,0 +1,144 @@
+import asyncio
+from threading import Barrier
+from unittest.mock import Mock, patch
+
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import FinalizationCoordinator, shared_resource
+
+
+@shared_resource(depends_on=["cycle_b"])
+def cycle_a():
+    return "a"
+
+
+@shared_resource(depends_on=["cycle_a"])
+def cycle_b():
+    return "b"
+
+
+@scenario
+def build_independent_dependencies_in_parallel():
+    with given:
+        barrier = Barrier(2, timeout=5)
+
+        @shared_resource()
+        def db():
+            barrier.wait()  # fails unless the db and the cache are being built at the same time
+            return "db"
+
+        @shared_resource()
+        def cache():
+            barrier.wait()
+            return "cache"
+
+        @shared_resource(depends_on=[db, cache])
+        def app_server():
+            return f"app({db()}, {cache()})"
+
+    with when:
+        result = app_server()
+
+    with then:
+        assert result == "app(db, cache)"
+        assert db.cache_info().hits == 1
+        assert cache.cache_info().hits == 1
+
+
+@scenario
+def build_shared_dependency_once():
+    with given:
+        factory = Mock(return_value="db")
+        db = shared_resource()(lambda: factory())
+        app = shared_resource(depends_on=[db])(lambda: "app")
+        worker = shared_resource(depends_on=[db])(lambda: "worker")
+        browser = shared_resource(depends_on=[app, worker, db])(lambda: "browser")
+
+    with when:
+        browser()
+
+    with then:
+        assert factory.call_count == 1
+
+
+@scenario
+def propagate_dependency_failure():
+    with given:
+        db = shared_resource()(Mock(side_effect=ConnectionError("db is down")))
+        factory = Mock(return_value="app")
+        app = shared_resource(depends_on=[db])(factory)
+
+    with when:
+        try:
+            app()
+        except BaseException as e:
+            exc_info = e
+
+    with then:
+        assert isinstance(exc_info, ConnectionError)
+        assert factory.call_count == 0
+
+
+@scenario
+def reject_dependency_cycle():
+    with when:
+        try:
+            cycle_a()
+        except BaseException as e:
+            exc_info = e
+
+    with then:
+        assert isinstance(exc_info, ValueError)
+        assert str(exc_info) == ("Shared resources depend on each other: "
+                                 "cycle_a -> cycle_b -> cycle_a")
+
+
+@scenario
+async def finalize_dependents_before_dependencies():
+    with given:
+        finalized = []
+        coordinator = FinalizationCoordinator()
+        db = shared_resource(finalizer=finalized.append)(lambda: "db")
+        app = shared_resource(depends_on=[db], finalizer=finalized.append)(lambda: "app")
+        with patch("vedro_shared_resource._base_resource.finalization", coordinator), \
+             patch("vedro_shared_resource._finalization.defer_global"):
+            app()
+            db.cache_clear()
+            db()  # rebuilt after its dependent
+
+    with when:
+        await coordinator.close()
+
+    with then:
+        assert finalized == ["db", "app", "db"]
+
+
+@scenario
+async def build_async_dependencies_concurrently():
+    with given:
+        started = []
+
+        async def connect(name):
+            started.append(name)
+            await asyncio.sleep(0.01)
+            assert len(started) == 2  # the other dependency started meanwhile
+            return name
+
+        @shared_resource()
+        async def db():
+            return await connect("db")
+
+        @shared_resource()
+        async def cache():
+            return await connect("cache")
+
+        async def make_app():
+            return f"app({await db()}, {await cache()})"
+
+        app = shared_resource(depends_on=[db, cache])(make_app)
+
+    with when:
+        result = await app()
+
+    with then:
+        assert result == "app(db, cache)"
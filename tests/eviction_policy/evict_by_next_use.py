@@ -0,0 +1,84 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock
+
+from vedro.core import Dispatcher, MonotonicScenarioScheduler, Report, ScenarioResult
+from vedro.events import CleanupEvent, ScenarioPassedEvent, ScenarioRunEvent, StartupEvent
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import (
+    SharedResourceAffinity,
+    SharedResourceAffinityPlugin,
+    shared_resource,
+)
+
+
+async def run_suite(path, scenarios):
+    # scenarios: list of (unique_id, callable run inside the scenario)
+    class AffinityConfig(SharedResourceAffinity):
+        usage_path = path
+
+    dispatcher = Dispatcher()
+    SharedResourceAffinityPlugin(AffinityConfig).subscribe(dispatcher)
+    virtual = {uid: Mock(unique_id=uid) for uid, _ in scenarios}
+    await dispatcher.fire(StartupEvent(MonotonicScenarioScheduler(list(virtual.values()))))
+    for uid, body in scenarios:
+        result = ScenarioResult(virtual[uid])
+        await dispatcher.fire(ScenarioRunEvent(result))
+        body()
+        await dispatcher.fire(ScenarioPassedEvent(result))
+    await dispatcher.fire(CleanupEvent(Report()))
+
+
+def make_suite(browser):
+    return [(uid, lambda name=name: browser(name))
+            for uid, name in [("a", "A"), ("b", "B"), ("c", "C"), ("d", "A"), ("e", "B")]]
+
+
+@scenario
+async def evict_instance_used_furthest_in_future():
+    with given:
+        tmp = TemporaryDirectory()
+        path = Path(tmp.name) / "usage.json"
+        factory = Mock(side_effect=lambda name: name)
+        browser = shared_resource(max_instances=2, eviction="lookahead")(
+            lambda name: factory(name))
+        await run_suite(path, make_suite(browser))
+        browser.cache_clear()
+        factory.reset_mock()
+
+    with when:
+        await run_suite(path, make_suite(browser))
+
+    with then:
+        assert [c.args for c in factory.call_args_list] == [("A",), ("B",), ("C",), ("B",)]
+        tmp.cleanup()
+
+
+@scenario
+async def fall_back_to_lru_without_recorded_usage():
+    with given:
+        tmp = TemporaryDirectory()
+        path = Path(tmp.name) / "usage.json"
+        factory = Mock(side_effect=lambda name: name)
+        browser = shared_resource(max_instances=2, eviction="lookahead")(
+            lambda name: factory(name))
+
+    with when:
+        await run_suite(path, make_suite(browser))
+
+    with then:
+        assert factory.call_count == 5
+        tmp.cleanup()
+
+
+@scenario
+def reject_unknown_eviction_policy():
+    with when:
+        try:
+            shared_resource(eviction="fifo")
+        except ValueError as exc:
+            error = exc
+
+    with then:
+        assert str(error) == "Unknown eviction policy 'fifo', expected one of lru, lookahead, cost"
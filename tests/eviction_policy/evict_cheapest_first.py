@@ -0,0 +1,138 @@
+from unittest.mock import Mock
+
+from vedro_fn import given, scenario, then, when
+
+from tests._clock import FakeClock, frozen
+from vedro_shared_resource import CostAwareEviction, shared_resource
+
+
+@scenario
+def evict_cheapest_resource_first():
+    with given:
+        clock = FakeClock()
+        finalizer = Mock()
+
+        def start(name, cost):
+            clock.now += cost
+            return name
+
+        memoized = shared_resource(max_instances=2, eviction="cost", finalizer=finalizer)(start)
+        with frozen(clock, "_sync_resource", name="perf_counter"):
+            memoized("container", 30)
+            memoized("client", 0.005)
+
+    with when:
+        with frozen(clock, "_sync_resource", name="perf_counter"):
+            memoized("container", 30)
+            memoized("other client", 0.005)
+
+    with then:
+        assert finalizer.mock_calls == [(("client",),)]
+
+
+@scenario
+def evict_least_recently_used_among_equal_costs():
+    with given:
+        clock = FakeClock()
+        finalizer = Mock()
+        memoized = shared_resource(max_instances=2, eviction="cost", finalizer=finalizer)(
+            lambda name: name)
+        with frozen(clock, "_sync_resource", name="perf_counter"):
+            memoized("a")
+            memoized("b")
+            memoized("a")
+
+    with when:
+        with frozen(clock, "_sync_resource", name="perf_counter"):
+            memoized("c")
+
+    with then:
+        assert finalizer.mock_calls == [(("b",),)]
+
+
+@scenario
+def age_out_expensive_resources_no_longer_used():
+    with given:
+        clock = FakeClock()
+        finalizer = Mock()
+
+        def start(name, cost):
+            clock.now += cost
+            return name
+
+        memoized = shared_resource(max_instances=2, eviction="cost", finalizer=finalizer)(start)
+        with frozen(clock, "_sync_resource", name="perf_counter"):
+            memoized("container", 3)
+            for idx in range(3):
+                memoized(f"client-{idx}", 2)
+
+    with when:
+        with frozen(clock, "_sync_resource", name="perf_counter"):
+            memoized("client-3", 2)
+
+    with then:
+        assert finalizer.mock_calls == [(("client-0",),), (("client-1",),), (("container",),)]
+
+
+@scenario
+def rank_by_cost_per_byte():
+    with given:
+        clock = FakeClock()
+        finalizer = Mock()
+
+        def start(name, cost, size):
+            clock.now += cost
+            return "x" * size
+
+        eviction = CostAwareEviction(use_size=True)
+        memoized = shared_resource(max_instances=2, eviction=eviction, finalizer=finalizer,
+                                   sizeof=len, max_bytes=10_000)(start)
+        with frozen(clock, "_sync_resource", name="perf_counter"):
+            memoized("small", 1, 10)
+            memoized("large", 2, 1000)
+
+    with when:
+        with frozen(clock, "_sync_resource", name="perf_counter"):
+            memoized("another", 1, 10)
+
+    with then:
+        assert finalizer.mock_calls == [(("x" * 1000,),)]
+
+
+@scenario
+async def evict_cheapest_async_resource_first():
+    with given:
+        clock = FakeClock()
+        finalizer = Mock()
+
+        async def start(name, cost):
+            clock.now += cost
+            return name
+
+        memoized = shared_resource(max_instances=2, eviction="cost", finalizer=finalizer)(start)
+        with frozen(clock, "_async_resource", name="perf_counter"):
+            await memoized("container", 30)
+            await memoized("client", 0.005)
+
+    with when:
+        with frozen(clock, "_async_resource", name="perf_counter"):
+            await memoized("other client", 0.005)
+
+    with then:
+        assert finalizer.mock_calls == [(("client",),)]
+
+
+@scenario
+def reject_policy_shared_between_resources():
+    with given:
+        eviction = CostAwareEviction()
+        shared_resource(eviction=eviction)(lambda: 1)
+
+    with when:
+        try:
+            shared_resource(eviction=eviction)(lambda: 2)
+        except ValueError as exc:
+            error = exc
+
+    with then:
+        assert "is already used by" in str(error)
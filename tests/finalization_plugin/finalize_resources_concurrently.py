@@ -0,0 +1,157 @@
+import asyncio
+import time
+from collections import deque
+from unittest.mock import Mock, call, patch
+
+from vedro.core import Dispatcher, Report
+from vedro.events import CleanupEvent, StartupEvent
+from vedro.plugins.deferrer import Deferrer, DeferrerPlugin
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import (
+    FinalizationCoordinator,
+    SharedResourceFinalization,
+    SharedResourceFinalizationPlugin,
+    shared_resource,
+)
+
+
+def build(coordinator, *resources):
+    # Resources register with the given coordinator instead of the suite-wide one
+    with patch("vedro_shared_resource._base_resource.finalization", coordinator), \
+         patch("vedro_shared_resource._finalization.defer_global"):
+        for resource in resources:
+            resource()
+
+
+@scenario
+async def finalize_instance_built_before_startup_that_only_gets_hits():
+    with given:
+        global_queue = deque()
+        coordinator = FinalizationCoordinator()
+        finalizer = Mock()
+        db = shared_resource(finalizer=finalizer)(lambda: "db")
+        with patch("vedro_shared_resource._base_resource.finalization", coordinator), \
+             patch("vedro_shared_resource._finalization.defer_global",
+                   side_effect=lambda fn: global_queue.append((fn, (), {}))):
+            db()  # e.g. at import time
+
+        dispatcher = Dispatcher()
+        DeferrerPlugin(Deferrer, global_queue=global_queue).subscribe(dispatcher)
+        SharedResourceFinalizationPlugin(SharedResourceFinalization,
+                                         coordinator=coordinator).subscribe(dispatcher)
+
+    with when:
+        with patch("vedro_shared_resource._finalization.defer_global",
+                   side_effect=lambda fn: global_queue.append((fn, (), {}))):
+            await dispatcher.fire(StartupEvent(Mock()))  # the deferrer clears its queue
+            db()
+            db()
+            await dispatcher.fire(CleanupEvent(Report()))
+
+    with then:
+        assert finalizer.mock_calls == [call("db")]
+
+
+@scenario
+async def finalize_sync_resources_in_parallel():
+    with given:
+        coordinator = FinalizationCoordinator()
+        finalizer = Mock(side_effect=lambda _: time.sleep(0.1))
+        resources = [shared_resource(finalizer=finalizer)(lambda: name) for name in "abc"]
+        build(coordinator, *resources)
+
+    with when:
+        started_at = time.monotonic()
+        await coordinator.close()
+        elapsed = time.monotonic() - started_at
+
+    with then:
+        assert finalizer.call_count == 3
+        assert elapsed < 0.25  # each finalizer takes 0.1 s
+
+
+@scenario
+async def stop_waiting_for_finalizer_after_timeout():
+    with given:
+        coordinator = FinalizationCoordinator()
+        reporter = Mock()
+        coordinator.configure(timeout=0.05, reporter=reporter)
+        finalized = []
+
+        async def hang(value):
+            await asyncio.sleep(10)
+
+        async def make_db():
+            return "db"
+
+        async def make_cache():
+            return "cache"
+
+        db = shared_resource(finalizer=hang)(make_db)
+        cache = shared_resource(finalizer=finalized.append)(make_cache)
+        with patch("vedro_shared_resource._base_resource.finalization", coordinator), \
+             patch("vedro_shared_resource._finalization.defer_global"):
+            await db()
+            await cache()
+
+    with when:
+        await coordinator.close()
+
+    with then:
+        assert finalized == ["cache"]
+        records = reporter.call_args[0][0]
+        assert [(r.resource.split(".")[-1], r.key, r.timed_out) for r in records] == [
+            ("make_db", (), True)
+        ]
+
+
+@scenario
+async def reraise_finalizer_error_after_others_complete():
+    with given:
+        coordinator = FinalizationCoordinator()
+        finalized = []
+        failing = shared_resource(finalizer=Mock(side_effect=OSError("busy")))(lambda: "db")
+        other = shared_resource(finalizer=finalized.append)(lambda: "cache")
+        build(coordinator, failing, other)
+
+    with when:
+        try:
+            await coordinator.close()
+        except BaseException as e:
+            exc_info = e
+
+    with then:
+        assert isinstance(exc_info, OSError)
+        assert finalized == ["cache"]
+
+
+@scenario
+async def report_slow_teardowns():
+    with given:
+        coordinator = FinalizationCoordinator()
+
+        class FinalizationConfig(SharedResourceFinalization):
+            slow_threshold = 0.05
+
+        report = Report()
+        dispatcher = Dispatcher()
+        plugin = SharedResourceFinalizationPlugin(FinalizationConfig, coordinator=coordinator)
+        plugin.subscribe(dispatcher)
+        await dispatcher.fire(StartupEvent(Mock()))
+
+        def connect(name):
+            return name
+
+        slow = shared_resource(finalizer=lambda _: time.sleep(0.06))(connect)
+        fast = shared_resource(finalizer=lambda _: None)(lambda: "fast")
+        build(coordinator, lambda: slow("primary"), fast)
+
+    with when:
+        await coordinator.close()
+        await dispatcher.fire(CleanupEvent(report))
+
+    with then:
+        assert report.summary[0] == "Shared resources: 1 slow teardowns"
+        assert ".<locals>.connect('primary') " in report.summary[1]
+        assert coordinator.reporter is None  # reset after the run
@@ -0,0 +1,61 @@
+import asyncio
+
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import shared_resource
+
+
+def make_resource(log, **options):
+    async def connect(name):
+        log.append(f"open {name}")
+        yield name.upper()
+        await asyncio.sleep(0.05)
+        log.append(f"close {name}")
+
+    return shared_resource(**options)(connect)
+
+
+@scenario
+async def return_yielded_value():
+    with given:
+        log = []
+        connect = make_resource(log)
+
+    with when:
+        first, second = await asyncio.gather(connect("db"), connect("db"))
+
+    with then:
+        assert first == second == "DB"
+        assert log == ["open db"]
+
+
+@scenario
+async def tear_down_on_eviction():
+    with given:
+        log = []
+        connect = make_resource(log, max_instances=1)
+        await connect("db")
+
+    with when:
+        await connect("cache")
+
+    with then:
+        assert log == ["open db", "open cache", "close db"]
+
+
+@scenario
+async def tear_down_instances_concurrently_on_cache_close():
+    with given:
+        log = []
+        connect = make_resource(log)
+        for name in ("db", "cache", "queue", "browser"):
+            await connect(name)
+
+    with when:
+        started_at = asyncio.get_running_loop().time()
+        await connect.cache_close()
+        elapsed = asyncio.get_running_loop().time() - started_at
+
+    with then:
+        assert sorted(log[4:]) == ["close browser", "close cache", "close db", "close queue"]
+        assert elapsed < 0.15  # each teardown takes 0.05 s
@@ -0,0 +1,74 @@
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import shared_resource
+
+
+def make_resource(log, **options):
+    def connect(name):
+        log.append(f"open {name}")
+        yield name.upper()
+        log.append(f"close {name}")
+
+    return shared_resource(**options)(connect)
+
+
+@scenario
+def return_yielded_value():
+    with given:
+        log = []
+        connect = make_resource(log)
+
+    with when:
+        first, second = connect("db"), connect("db")
+
+    with then:
+        assert first == second == "DB"
+        assert log == ["open db"]
+
+
+@scenario
+def tear_down_on_eviction():
+    with given:
+        log = []
+        connect = make_resource(log, max_instances=1)
+        connect("db")
+
+    with when:
+        connect("cache")
+
+    with then:
+        assert log == ["open db", "open cache", "close db"]
+
+
+@scenario
+def tear_down_after_finalizer_on_cache_clear():
+    with given:
+        log = []
+        connect = make_resource(log, finalizer=lambda value: log.append(f"finalize {value}"))
+        connect("db")
+
+    with when:
+        connect.cache_clear()
+
+    with then:
+        assert log == ["open db", "finalize DB", "close db"]
+
+
+@scenario
+def reject_generator_without_yield():
+    with given:
+        def connect():
+            return
+            yield
+
+        memoized = shared_resource()(connect)
+
+    with when:
+        try:
+            memoized()
+        except RuntimeError as exc:
+            error = exc
+
+    with then:
+        assert "did not yield" in str(error)
+        assert memoized.cache_info().currsize == 0
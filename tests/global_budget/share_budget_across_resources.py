@@ -0,0 +1,119 @@
+import gc
+from contextlib import contextmanager
+from time import monotonic
+from unittest.mock import Mock, patch
+
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import set_cache_budget, shared_resource
+
+
+class TickingClock:
+    # Every reading is later than the previous one and than any real reading
+    def __init__(self):
+        self.now = monotonic() + 1_000_000
+
+    def __call__(self):
+        self.now += 1
+        return self.now
+
+
+@contextmanager
+def cache_budget(**limits):
+    gc.collect()  # resources of previous scenarios must not take part
+    clock = TickingClock()
+    set_cache_budget(**limits)
+    try:
+        with patch("vedro_shared_resource._sync_resource.monotonic", clock), \
+             patch("vedro_shared_resource._async_resource.monotonic", clock):
+            yield
+    finally:
+        set_cache_budget()
+
+
+@scenario
+def evict_least_recently_used_across_resources():
+    with given:
+        finalizer = Mock()
+        browser = shared_resource(finalizer=finalizer)(lambda name: f"browser-{name}")
+        client = shared_resource(finalizer=finalizer)(lambda name: f"client-{name}")
+
+    with when:
+        with cache_budget(max_instances=3):
+            browser("a")
+            client("b")
+            browser("c")
+            browser("a")
+            client("d")
+
+    with then:
+        assert finalizer.mock_calls == [(("client-b",),)]
+        assert browser.cache_info().currsize + client.cache_info().currsize == 3
+
+
+@scenario
+def keep_instances_of_resource_with_floor():
+    with given:
+        finalizer = Mock()
+        browser = shared_resource(min_instances=1, finalizer=finalizer)(lambda name: name)
+        client = shared_resource(finalizer=finalizer)(lambda name: name)
+
+    with when:
+        with cache_budget(max_instances=2):
+            browser("chromium")
+            client("a")
+            client("b")
+
+    with then:
+        assert finalizer.mock_calls == [(("a",),)]
+
+
+@scenario
+def evict_until_total_size_fits():
+    with given:
+        finalizer = Mock()
+        small = shared_resource(sizeof=len, finalizer=finalizer)(lambda size: "x" * size)
+        large = shared_resource(sizeof=len, finalizer=finalizer)(lambda size: "y" * size)
+
+    with when:
+        with cache_budget(max_bytes=100):
+            small(30)
+            small(40)
+            large(50)
+
+    with then:
+        assert finalizer.mock_calls == [(("x" * 30,),)]
+
+
+@scenario
+async def evict_async_resources_within_budget():
+    with given:
+        finalizer = Mock()
+
+        async def connect(name):
+            return name
+
+        db = shared_resource(finalizer=finalizer)(connect)
+        browser = shared_resource(finalizer=finalizer)(lambda name: name)
+
+    with when:
+        with cache_budget(max_instances=2):
+            await db("main")
+            browser("chromium")
+            await db("replica")
+            await db.cache_close()
+
+    with then:
+        assert finalizer.mock_calls[0] == (("main",),)
+
+
+@scenario
+def reject_non_positive_budget():
+    with when:
+        try:
+            set_cache_budget(max_instances=0)
+        except ValueError as exc:
+            error = exc
+
+    with then:
+        assert str(error) == "max_instances must be positive, got 0"
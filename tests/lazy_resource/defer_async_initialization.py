@@ -0,0 +1,73 @@
+import asyncio
+from unittest.mock import Mock
+
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import shared_resource
+
+
+class ApiClient:
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+    async def get(self, path):
+        return f"{self.base_url}{path}"
+
+    def url(self, path):
+        return f"{self.base_url}{path}"
+
+
+@scenario
+async def return_proxy_without_awaiting():
+    with given:
+        built = Mock()
+
+        async def api_client(base_url):
+            built()
+            return ApiClient(base_url)
+
+        memoized = shared_resource(lazy=True)(api_client)
+
+    with when:
+        client = memoized("http://api")
+
+    with then:
+        assert "AsyncLazyProxy" in repr(client)
+        assert built.call_count == 0
+
+
+@scenario
+async def await_proxy_for_instance():
+    with given:
+        async def api_client(base_url):
+            return ApiClient(base_url)
+
+        client = shared_resource(lazy=True)(api_client)("http://api")
+
+    with when:
+        instance = await client
+
+    with then:
+        assert isinstance(instance, ApiClient)
+        assert await client is instance
+
+
+@scenario
+async def await_attributes_and_methods():
+    with given:
+        built = Mock()
+
+        async def api_client(base_url):
+            built()
+            await asyncio.sleep(0)
+            return ApiClient(base_url)
+
+        client = shared_resource(lazy=True)(api_client)("http://api")
+
+    with when:
+        results = await asyncio.gather(client.get("/users"), client.url("/posts"),
+                                       client.base_url)
+
+    with then:
+        assert results == ["http://api/users", "http://api/posts", "http://api"]
+        assert built.call_count == 1
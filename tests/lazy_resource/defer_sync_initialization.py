@@ -0,0 +1,89 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import shared_resource
+
+
+class ApiClient:
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.headers = {"accept": "json"}
+
+    def get(self, path):
+        return f"{self.base_url}{path}"
+
+
+@scenario
+def return_proxy_without_building_resource():
+    with given:
+        factory = Mock(side_effect=ApiClient)
+        api_client = shared_resource(lazy=True)(factory)
+
+    with when:
+        client = api_client("http://api")
+
+    with then:
+        assert repr(client).startswith("<LazyProxy ")
+        assert factory.call_count == 0
+
+
+@scenario
+def build_resource_on_first_attribute_access():
+    with given:
+        factory = Mock(side_effect=ApiClient)
+        client = shared_resource(lazy=True)(factory)("http://api")
+
+    with when:
+        result = client.get("/users")
+
+    with then:
+        assert result == "http://api/users"
+        assert client.headers["accept"] == "json"
+        assert factory.call_count == 1
+
+
+@scenario
+def share_instance_between_proxies():
+    with given:
+        api_client = shared_resource(lazy=True)(ApiClient)
+        first, second = api_client("http://api"), api_client("http://api")
+
+    with when:
+        first.token = "secret"
+
+    with then:
+        assert second.token == "secret"
+        assert first.__wrapped__ is second.__wrapped__
+        assert isinstance(first.__wrapped__, ApiClient)
+
+
+@scenario
+def forward_container_protocols():
+    with given:
+        settings = shared_resource(lazy=True)(lambda: {"env": "ci"})()
+
+    with when:
+        settings["region"] = "eu"
+
+    with then:
+        assert settings["env"] == "ci"
+        assert "region" in settings
+        assert len(settings) == 2
+        assert settings == {"env": "ci", "region": "eu"}
+
+
+@scenario
+def build_once_on_concurrent_first_use():
+    with given:
+        factory = Mock(side_effect=ApiClient)
+        client = shared_resource(lazy=True)(factory)("http://api")
+
+    with when:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: client.get("/"), range(8)))
+
+    with then:
+        assert results == ["http://api/"] * 8
+        assert factory.call_count == 1
@@ -0,0 +1,65 @@
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from vedro.core import Dispatcher, Report
+from vedro.events import CleanupEvent
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import (
+    SharedResourceMetrics,
+    SharedResourceMetricsPlugin,
+    shared_resource,
+)
+
+
+def make_dispatcher(path=None):
+    class MetricsConfig(SharedResourceMetrics):
+        report_path = path
+
+    dispatcher = Dispatcher()
+    SharedResourceMetricsPlugin(MetricsConfig).subscribe(dispatcher)
+    return dispatcher
+
+
+@scenario
+async def add_stats_table_to_summary_on_cleanup():
+    with given:
+        @shared_resource()
+        def metrics_table_resource():
+            return "resource"
+
+        metrics_table_resource()
+        report = Report()
+        dispatcher = make_dispatcher()
+
+    with when:
+        await dispatcher.fire(CleanupEvent(report))
+
+    with then:
+        assert report.summary[0] == "Shared resources:"
+        row = next(line for line in report.summary if "metrics_table_resource" in line)
+        assert row.split()[1:4] == ["0", "1", "0"]
+
+
+@scenario
+async def write_stats_to_json_report():
+    with given:
+        @shared_resource()
+        def metrics_json_resource():
+            return "resource"
+
+        metrics_json_resource()
+        metrics_json_resource()
+        tmp_dir = TemporaryDirectory()
+        path = Path(tmp_dir.name) / "metrics.json"
+        dispatcher = make_dispatcher(path)
+
+    with when:
+        await dispatcher.fire(CleanupEvent(Report()))
+
+    with then:
+        report = json.loads(path.read_text())
+        tmp_dir.cleanup()
+        stats = next(s for s in report if s["name"].endswith("metrics_json_resource"))
+        assert (stats["hits"], stats["misses"], stats["inits"]) == (1, 1, 1)
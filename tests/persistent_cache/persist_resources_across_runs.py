@@ -0,0 +1,163 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, patch
+
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import shared_resource
+
+calls = Mock()
+
+
+def build_schema(name, version=1):
+    calls(name, version)
+    return {"name": name, "version": version, "fields": list(range(3))}
+
+
+async def build_schema_async(name):
+    calls(name)
+    return {"name": name}
+
+
+def build_query(*args, **kwargs):
+    calls(args, kwargs)
+    return {"args": list(args), "kwargs": kwargs}
+
+
+class UpperCodec:
+    name = "upper"
+
+    def dumps(self, value):
+        return value.upper().encode()
+
+    def loads(self, data):
+        return bytes(data).decode()
+
+
+@scenario
+def load_resource_persisted_by_previous_run():
+    with given:
+        calls.reset_mock()
+        tmp = TemporaryDirectory()
+        shared_resource(persist="pickle", persist_dir=tmp.name)(build_schema)("users")
+
+    with when:
+        # A fresh decoration of the same function stands for the next `vedro run`
+        result = shared_resource(persist="pickle", persist_dir=tmp.name)(build_schema)("users")
+
+    with then:
+        assert result == {"name": "users", "version": 1, "fields": [0, 1, 2]}
+        assert calls.mock_calls == [(("users", 1),)]
+        tmp.cleanup()
+
+
+@scenario
+def share_artifact_between_argument_spellings():
+    with given:
+        calls.reset_mock()
+        tmp = TemporaryDirectory()
+        shared_resource(persist="json", persist_dir=tmp.name)(build_schema)("users")
+
+    with when:
+        memoized = shared_resource(persist="json", persist_dir=tmp.name)(build_schema)
+        result = memoized(name="users", version=1)
+
+    with then:
+        assert result["name"] == "users"
+        assert calls.call_count == 1
+        tmp.cleanup()
+
+
+@scenario
+def keep_artifacts_of_extra_positional_and_keyword_arguments_apart():
+    with given:
+        calls.reset_mock()
+        tmp = TemporaryDirectory()
+        shared_resource(persist="json", persist_dir=tmp.name)(build_query)(("limit", 1))
+
+    with when:
+        result = shared_resource(persist="json", persist_dir=tmp.name)(build_query)(limit=1)
+
+    with then:
+        assert result == {"args": [], "kwargs": {"limit": 1}}
+        assert calls.call_count == 2
+        tmp.cleanup()
+
+
+@scenario
+def rebuild_when_artifact_is_corrupted():
+    with given:
+        calls.reset_mock()
+        tmp = TemporaryDirectory()
+        shared_resource(persist="marshal", persist_dir=tmp.name)(build_schema)("users")
+        for path in Path(tmp.name).rglob("*.marshal"):
+            path.write_bytes(b"garbage")
+
+    with when:
+        result = shared_resource(persist="marshal", persist_dir=tmp.name)(build_schema)("users")
+
+    with then:
+        assert result["name"] == "users"
+        assert calls.call_count == 2
+        tmp.cleanup()
+
+
+@scenario
+def load_large_artifact_through_mmap():
+    with given:
+        calls.reset_mock()
+        tmp = TemporaryDirectory()
+        shared_resource(persist="pickle", persist_dir=tmp.name)(build_schema)("users")
+
+    with when:
+        with patch("vedro_shared_resource._persistent.MMAP_THRESHOLD", 0):
+            memoized = shared_resource(persist="pickle", persist_dir=tmp.name)(build_schema)
+            result = memoized("users")
+
+    with then:
+        assert result["fields"] == [0, 1, 2]
+        assert calls.call_count == 1
+        tmp.cleanup()
+
+
+@scenario
+def use_custom_codec():
+    with given:
+        tmp = TemporaryDirectory()
+        shared_resource(persist=UpperCodec(), persist_dir=tmp.name)(str)("token")
+
+    with when:
+        result = shared_resource(persist=UpperCodec(), persist_dir=tmp.name)(str)("token")
+
+    with then:
+        assert result == "TOKEN"
+        tmp.cleanup()
+
+
+@scenario
+async def load_async_resource_persisted_by_previous_run():
+    with given:
+        calls.reset_mock()
+        tmp = TemporaryDirectory()
+        await shared_resource(persist="json", persist_dir=tmp.name)(build_schema_async)("users")
+
+    with when:
+        memoized = shared_resource(persist="json", persist_dir=tmp.name)(build_schema_async)
+        result = await memoized("users")
+
+    with then:
+        assert result == {"name": "users"}
+        assert calls.call_count == 1
+        tmp.cleanup()
+
+
+@scenario
+def reject_unknown_codec():
+    with when:
+        try:
+            shared_resource(persist="yaml")
+        except BaseException as e:
+            exc_info = e
+
+    with then:
+        assert isinstance(exc_info, ValueError)
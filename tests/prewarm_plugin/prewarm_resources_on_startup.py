@@ -0,0 +1,85 @@
+from threading import Event
+from unittest.mock import AsyncMock, Mock
+
+from vedro.core import Dispatcher, MonotonicScenarioScheduler, Report
+from vedro.events import CleanupEvent, StartupEvent
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import (
+    SharedResourcePrewarm,
+    SharedResourcePrewarmPlugin,
+    shared_resource,
+)
+
+
+def make_dispatcher(*targets):
+    class PrewarmConfig(SharedResourcePrewarm):
+        resources = targets
+
+    dispatcher = Dispatcher()
+    plugin = SharedResourcePrewarmPlugin(PrewarmConfig)
+    plugin.subscribe(dispatcher)
+    return dispatcher
+
+
+@scenario
+async def prewarm_sync_resource_in_background():
+    with given:
+        factory = Mock(return_value="resource")
+        resource = shared_resource()(factory)
+        dispatcher = make_dispatcher(resource)
+
+    with when:
+        await dispatcher.fire(StartupEvent(MonotonicScenarioScheduler([])))
+        result = resource()
+
+    with then:
+        assert result == "resource"
+        assert factory.call_count == 1
+
+        await dispatcher.fire(CleanupEvent(Report()))
+
+
+@scenario
+async def wait_for_in_flight_sync_resource():
+    with given:
+        started, release = Event(), Event()
+
+        def factory(name):
+            started.set()
+            release.wait(5)
+            return name
+
+        mock = Mock(side_effect=factory)
+        resource = shared_resource()(mock)
+        dispatcher = make_dispatcher((resource, [("db",)]))
+        await dispatcher.fire(StartupEvent(MonotonicScenarioScheduler([])))
+        started.wait(5)
+
+    with when:
+        release.set()
+        result = resource("db")
+
+    with then:
+        assert result == "db"
+        assert mock.call_count == 1
+
+        await dispatcher.fire(CleanupEvent(Report()))
+
+
+@scenario
+async def prewarm_async_resource_with_argument_sets():
+    with given:
+        factory = AsyncMock(side_effect=lambda headless: headless)
+        resource = shared_resource()(factory)
+        dispatcher = make_dispatcher((resource, [{"headless": True}, {"headless": False}]))
+
+    with when:
+        await dispatcher.fire(StartupEvent(MonotonicScenarioScheduler([])))
+        results = [await resource(headless=True), await resource(headless=False)]
+
+    with then:
+        assert results == [True, False]
+        assert factory.await_count == 2
+
+        await dispatcher.fire(CleanupEvent(Report()))
@@ -0,0 +1,154 @@
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import AsyncMock, Mock
+
+from vedro.core import Dispatcher, MonotonicScenarioScheduler, Report, ScenarioResult
+from vedro.events import (
+    CleanupEvent,
+    ScenarioPassedEvent,
+    ScenarioRunEvent,
+    ScenarioSkippedEvent,
+    StartupEvent,
+)
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import (
+    SharedResourceScoping,
+    SharedResourceScopingPlugin,
+    shared_resource,
+)
+
+
+def make_dispatcher(path):
+    class ScopingConfig(SharedResourceScoping):
+        usage_path = path
+
+    dispatcher = Dispatcher()
+    SharedResourceScopingPlugin(ScopingConfig).subscribe(dispatcher)
+    return dispatcher
+
+
+async def run_suite(path, scenarios):
+    # scenarios: list of (unique_id, callable run inside the scenario)
+    dispatcher = make_dispatcher(path)
+    virtual = {uid: Mock(unique_id=uid) for uid, _ in scenarios}
+    await dispatcher.fire(StartupEvent(MonotonicScenarioScheduler(list(virtual.values()))))
+    for uid, body in scenarios:
+        result = ScenarioResult(virtual[uid])
+        await dispatcher.fire(ScenarioRunEvent(result))
+        await body()
+        await dispatcher.fire(ScenarioPassedEvent(result))
+    await dispatcher.fire(CleanupEvent(Report()))
+
+
+@scenario
+async def record_resources_used_by_each_scenario():
+    with given:
+        tmp = TemporaryDirectory()
+        path = Path(tmp.name) / "usage.json"
+        browser = shared_resource()(lambda name: name)
+
+        async def use_chromium():
+            browser("chromium")
+
+        async def use_nothing():
+            pass
+
+    with when:
+        await run_suite(path, [("scenario_a", use_chromium), ("scenario_b", use_nothing)])
+
+    with then:
+        usage = json.loads(path.read_text())["scenarios"]
+        assert len(usage["scenario_a"]) == 1
+        assert usage["scenario_b"] == []
+        tmp.cleanup()
+
+
+@scenario
+async def record_extra_positional_and_keyword_arguments_apart():
+    with given:
+        tmp = TemporaryDirectory()
+        path = Path(tmp.name) / "usage.json"
+        query = shared_resource()(lambda *args, **kwargs: (args, kwargs))
+
+        async def use_positional():
+            query(("limit", 1))
+
+        async def use_keyword():
+            query(limit=1)
+
+    with when:
+        await run_suite(path, [("scenario_a", use_positional), ("scenario_b", use_keyword)])
+
+    with then:
+        usage = json.loads(path.read_text())["scenarios"]
+        assert usage["scenario_a"] != usage["scenario_b"]
+        tmp.cleanup()
+
+
+@scenario
+async def finalize_resource_after_last_scenario_using_it():
+    with given:
+        tmp = TemporaryDirectory()
+        path = Path(tmp.name) / "usage.json"
+        finalizer = Mock()
+        browser = shared_resource(finalizer=finalizer)(lambda name: f"<{name}>")
+        finalized_at = {}
+
+        def step(uid, *names):
+            async def body():
+                finalized_at[uid] = list(finalizer.mock_calls)
+                for name in names:
+                    browser(name)
+            return body
+
+        await run_suite(path, [("a", step("a", "chromium")), ("b", step("b", "chromium")),
+                               ("c", step("c", "firefox")), ("d", step("d"))])
+        browser.cache_clear()
+        finalizer.reset_mock()
+
+    with when:
+        await run_suite(path, [("a", step("a", "chromium")), ("b", step("b", "chromium")),
+                               ("c", step("c", "firefox")), ("d", step("d"))])
+
+    with then:
+        assert finalized_at["b"] == []  # still needed by "b"
+        assert finalized_at["c"] == [(("<chromium>",),)]
+        assert finalized_at["d"] == [(("<chromium>",),), (("<firefox>",),)]
+        tmp.cleanup()
+
+
+@scenario
+async def count_skipped_scenarios_as_finished():
+    with given:
+        tmp = TemporaryDirectory()
+        path = Path(tmp.name) / "usage.json"
+        finalizer = AsyncMock()
+
+        async def connect(name):
+            return name
+
+        db = shared_resource(finalizer=finalizer)(connect)
+
+        async def use_db():
+            await db("main")
+
+        await run_suite(path, [("a", use_db), ("b", use_db)])
+        await db.cache_close()
+        finalizer.reset_mock()
+
+        dispatcher = make_dispatcher(path)
+        a, b = Mock(unique_id="a"), Mock(unique_id="b")
+        await dispatcher.fire(StartupEvent(MonotonicScenarioScheduler([a, b])))
+        await dispatcher.fire(ScenarioRunEvent(ScenarioResult(a)))
+        await use_db()
+        await dispatcher.fire(ScenarioPassedEvent(ScenarioResult(a)))
+
+    with when:
+        await dispatcher.fire(ScenarioSkippedEvent(ScenarioResult(b)))
+
+    with then:
+        finalizer.assert_awaited_once_with("main")
+        await dispatcher.fire(CleanupEvent(Report()))
+        tmp.cleanup()
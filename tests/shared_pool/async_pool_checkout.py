@@ -0,0 +1,89 @@
+import asyncio
+from itertools import count
+from unittest.mock import AsyncMock, Mock
+
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import shared_pool
+
+
+def make_factory():
+    counter = count(1)
+
+    async def factory(name):
+        return f"{name}-{next(counter)}"
+
+    return AsyncMock(side_effect=factory)
+
+
+@scenario
+async def reuse_checked_in_instance():
+    with given:
+        factory = make_factory()
+        pool = shared_pool(max_size=2)(factory)
+        async with pool("db") as first:
+            pass
+
+    with when:
+        async with pool("db") as second:
+            pass
+
+    with then:
+        assert first == second == "db-1"
+        assert factory.await_count == 1
+
+
+@scenario
+async def serve_waiters_in_fifo_order():
+    with given:
+        pool = shared_pool(max_size=1)(make_factory())
+        instance = await pool.checkout("db")
+        order = []
+
+        async def borrow(idx):
+            async with pool("db"):
+                order.append(idx)
+
+        tasks = [asyncio.create_task(borrow(idx)) for idx in range(3)]
+        await asyncio.sleep(0)
+
+    with when:
+        await pool.checkin(instance)
+        await asyncio.gather(*tasks)
+
+    with then:
+        assert order == [0, 1, 2]
+        assert pool.pool_info().waits == 3
+
+
+@scenario
+async def pass_instance_on_when_waiter_is_cancelled():
+    with given:
+        pool = shared_pool(max_size=1)(make_factory())
+        instance = await pool.checkout("db")
+        cancelled = asyncio.create_task(pool.checkout("db"))
+        waiting = asyncio.create_task(pool.checkout("db"))
+        await asyncio.sleep(0)
+
+    with when:
+        cancelled.cancel()
+        await pool.checkin(instance)
+        result = await waiting
+
+    with then:
+        assert result == "db-1"
+        assert cancelled.cancelled()
+
+
+@scenario
+async def run_async_reset_hook_on_checkin():
+    with given:
+        reset = AsyncMock()
+        pool = shared_pool(reset=reset, finalizer=Mock())(make_factory())
+
+    with when:
+        async with pool("db"):
+            pass
+
+    with then:
+        reset.assert_awaited_once_with("db-1")
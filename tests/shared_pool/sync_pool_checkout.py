@@ -0,0 +1,156 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from time import sleep
+from unittest.mock import Mock, call, patch
+
+from vedro.core import Dispatcher, Report
+from vedro.events import CleanupEvent, StartupEvent
+from vedro.plugins.deferrer import Deferrer, DeferrerPlugin
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import (
+    FinalizationCoordinator,
+    SharedResourceFinalization,
+    SharedResourceFinalizationPlugin,
+    shared_pool,
+)
+
+
+def make_factory():
+    counter = count(1)
+    return Mock(side_effect=lambda name: f"{name}-{next(counter)}")
+
+
+@scenario
+def reuse_checked_in_instance():
+    with given:
+        factory = make_factory()
+        pool = shared_pool(max_size=2)(factory)
+        with pool("db") as first:
+            pass
+
+    with when:
+        with pool("db") as second:
+            pass
+
+    with then:
+        assert first == second == "db-1"
+        assert factory.call_count == 1
+
+
+@scenario
+def lend_distinct_instances_to_concurrent_callers():
+    with given:
+        pool = shared_pool(max_size=2)(make_factory())
+
+    with when:
+        with pool("db") as first, pool("db") as second:
+            pass
+
+    with then:
+        assert {first, second} == {"db-1", "db-2"}
+
+
+@scenario
+def check_in_same_object_returned_by_factory_twice():
+    with given:
+        pool = shared_pool(max_size=2)(lambda name: name)
+
+    with when:
+        with pool("db") as first, pool("db") as second:
+            pass
+
+    with then:
+        assert first is second
+        assert pool.pool_info().idle == 2
+
+
+@scenario
+def fill_pool_up_to_min_size_on_first_checkout():
+    with given:
+        factory = make_factory()
+        pool = shared_pool(min_size=3, max_size=4)(factory)
+
+    with when:
+        with pool("db"):
+            pass
+
+    with then:
+        assert factory.call_count == 3
+        assert pool.pool_info().idle == 3
+
+
+@scenario
+def serve_waiters_in_fifo_order():
+    with given:
+        pool = shared_pool(max_size=1)(make_factory())
+        instance = pool.checkout("db")
+        order = []
+
+        def borrow(idx):
+            with pool("db"):
+                order.append(idx)
+
+    with when:
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            for idx in range(3):
+                executor.submit(borrow, idx)
+                while pool.pool_info().checkouts < idx + 2:  # wait until it is queued
+                    sleep(0.001)
+            pool.checkin(instance)
+
+    with then:
+        assert order == [0, 1, 2]
+        info = pool.pool_info()
+        assert info.waits == 3
+        assert info.max_wait_time > 0
+
+
+@scenario
+def replace_instance_when_reset_fails():
+    with given:
+        finalizer = Mock()
+        pool = shared_pool(max_size=1, reset=Mock(side_effect=RuntimeError()),
+                           finalizer=finalizer)(make_factory())
+        with pool("db"):
+            pass
+
+    with when:
+        with pool("db") as instance:
+            pass
+
+    with then:
+        assert instance == "db-2"
+        finalizer.assert_any_call("db-1")
+
+
+@scenario
+async def close_pool_built_before_startup_at_end_of_run():
+    with given:
+        global_queue = deque()
+        coordinator = FinalizationCoordinator()
+        finalizer = Mock()
+        pool = shared_pool(max_size=2, finalizer=finalizer)(make_factory())
+        with patch("vedro_shared_resource._shared_pool.finalization", coordinator), \
+             patch("vedro_shared_resource._finalization.defer_global",
+                   side_effect=lambda fn: global_queue.append((fn, (), {}))):
+            with pool("db"):  # e.g. at import time
+                pass
+
+        dispatcher = Dispatcher()
+        DeferrerPlugin(Deferrer, global_queue=global_queue).subscribe(dispatcher)
+        SharedResourceFinalizationPlugin(SharedResourceFinalization,
+                                         coordinator=coordinator).subscribe(dispatcher)
+
+    with when:
+        with patch("vedro_shared_resource._finalization.defer_global",
+                   side_effect=lambda fn: global_queue.append((fn, (), {}))):
+            await dispatcher.fire(StartupEvent(Mock()))  # the deferrer clears its queue
+            with pool("db"):
+                pass
+            await dispatcher.fire(CleanupEvent(Report()))
+
+    with then:
+        assert finalizer.mock_calls == [call("db-1")]
+        assert pool.pool_info().size == 0
@@ -0,0 +1,68 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from time import sleep
+
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import shared_resource
+
+
+def add(a, b):
+    return a + b
+
+
+@scenario
+def count_hits_misses_and_evictions():
+    with given:
+        memoized = shared_resource(max_instances=1)(add)
+
+    with when:
+        memoized(1, 2)
+        memoized(1, 2)
+        memoized(2, 2)
+
+    with then:
+        stats = memoized.stats()
+        assert (stats.hits, stats.misses, stats.evictions, stats.inits) == (1, 2, 1, 2)
+        assert stats.init_time_total >= stats.init_time_p95 >= stats.init_time_p50 >= 0
+
+
+@scenario
+def keep_stats_after_cache_clear():
+    with given:
+        memoized = shared_resource()(add)
+        memoized(1, 2)
+        memoized(1, 2)
+
+    with when:
+        memoized.cache_clear()
+
+    with then:
+        assert memoized.cache_info().hits == 0
+        assert (memoized.stats().hits, memoized.stats().misses) == (1, 1)
+
+
+@scenario
+def measure_time_spent_waiting_for_in_flight_init():
+    with given:
+        started, release = Event(), Event()
+
+        def slow_factory():
+            started.set()
+            release.wait(5)
+            return "resource"
+
+        memoized = shared_resource()(slow_factory)
+
+    with when:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(memoized)
+            started.wait(5)
+            follower = executor.submit(memoized)
+            while memoized.cache_info().hits == 0:  # wait until it joins the in-flight init
+                sleep(0.001)
+            release.set()
+            leader.result(5), follower.result(5)
+
+    with then:
+        assert memoized.stats().wait_time_total > 0
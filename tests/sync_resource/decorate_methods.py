@@ -0,0 +1,26 @@
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import shared_resource
+
+
+class Client:
+    def __init__(self, name):
+        self.name = name
+
+    @shared_resource()
+    def connect(self, database):
+        return object()
+
+
+@scenario
+def cache_method_per_instance():
+    with given:
+        first, second = Client("first"), Client("second")
+
+    with when:
+        results = [first.connect("db"), first.connect("db"), second.connect("db")]
+
+    with then:
+        assert results[0] is results[1]
+        assert results[0] is not results[2]
+        assert first.connect.cache_info().hits == 1
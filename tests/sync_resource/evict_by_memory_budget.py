@@ -0,0 +1,90 @@
+from unittest.mock import Mock
+
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import shared_resource
+
+
+def blob(size):
+    return "x" * size
+
+
+@scenario
+def evict_least_recently_used_until_budget_fits():
+    with given:
+        finalizer = Mock()
+        memoized = shared_resource(max_bytes=100, sizeof=len, finalizer=finalizer)(blob)
+        memoized(30)
+        memoized(40)
+        memoized(20)
+
+    with when:
+        memoized(50)
+
+    with then:
+        assert finalizer.mock_calls == [((blob(30),),), ((blob(40),),)]
+        assert memoized.cache_info().currsize == 2
+
+
+@scenario
+def keep_recently_used_resource():
+    with given:
+        finalizer = Mock()
+        memoized = shared_resource(max_bytes=100, sizeof=len, finalizer=finalizer)(blob)
+        memoized(30)
+        memoized(40)
+        memoized(30)
+
+    with when:
+        memoized(50)
+
+    with then:
+        assert finalizer.mock_calls == [((blob(40),),)]
+
+
+@scenario
+def keep_resource_larger_than_budget():
+    with given:
+        finalizer = Mock()
+        memoized = shared_resource(max_bytes=100, sizeof=len, finalizer=finalizer)(blob)
+        memoized(10)
+
+    with when:
+        result = memoized(150)
+
+    with then:
+        assert len(result) == 150
+        assert finalizer.mock_calls == [((blob(10),),)]
+        assert memoized.cache_info().currsize == 1
+
+
+@scenario
+def release_budget_on_cache_clear():
+    with given:
+        finalizer = Mock()
+        memoized = shared_resource(max_bytes=100, sizeof=len, finalizer=finalizer)(blob)
+        memoized(60)
+        memoized.cache_clear()
+        finalizer.reset_mock()
+
+    with when:
+        memoized(70)
+
+    with then:
+        assert finalizer.call_count == 0
+
+
+@scenario
+def measure_nested_resources_by_default():
+    with given:
+        def rows(count):
+            return {"rows": [str(i) * 100 for i in range(count)]}
+
+        memoized = shared_resource(max_bytes=10_000)(rows)
+        memoized(10)
+
+    with when:
+        memoized(80)
+
+    with then:
+        assert memoized.cache_info().currsize == 1
@@ -0,0 +1,100 @@
+from unittest.mock import Mock
+
+from vedro_fn import given, scenario, then, when
+
+from tests._clock import FakeClock, frozen
+from vedro_shared_resource import shared_resource
+
+
+@scenario
+def rebuild_resource_after_ttl():
+    with given:
+        clock = FakeClock()
+        factory, finalizer = Mock(side_effect=[1, 2]), Mock()
+        memoized = shared_resource(ttl=10, finalizer=finalizer)(lambda: factory())
+        with frozen(clock, "_sync_resource"):
+            first = memoized()
+
+    with when:
+        clock.now += 10
+        with frozen(clock, "_sync_resource"):
+            second = memoized()
+
+    with then:
+        assert (first, second) == (1, 2)
+        assert finalizer.mock_calls == [((1,),)]
+        assert memoized.cache_info().currsize == 1
+
+
+@scenario
+def keep_resource_before_ttl():
+    with given:
+        clock = FakeClock()
+        factory = Mock(side_effect=[1, 2])
+        memoized = shared_resource(ttl=10)(lambda: factory())
+        with frozen(clock, "_sync_resource"):
+            memoized()
+
+    with when:
+        clock.now += 9.9
+        with frozen(clock, "_sync_resource"):
+            result = memoized()
+
+    with then:
+        assert result == 1
+        assert factory.call_count == 1
+
+
+@scenario
+def extend_idle_timeout_on_access():
+    with given:
+        clock = FakeClock()
+        factory = Mock(side_effect=[1, 2])
+        memoized = shared_resource(idle_timeout=10)(lambda: factory())
+        with frozen(clock, "_sync_resource"):
+            memoized()
+            for _ in range(3):
+                clock.now += 6
+                memoized()
+
+    with when:
+        clock.now += 10
+        with frozen(clock, "_sync_resource"):
+            result = memoized()
+
+    with then:
+        assert result == 2
+        assert factory.call_count == 2
+
+
+@scenario
+def expire_idle_resources_on_any_access():
+    with given:
+        clock = FakeClock()
+        finalizer = Mock()
+        memoized = shared_resource(idle_timeout=10, finalizer=finalizer)(lambda x: x)
+        with frozen(clock, "_sync_resource"):
+            memoized(1)
+            clock.now += 5
+            memoized(2)
+
+    with when:
+        clock.now += 5
+        with frozen(clock, "_sync_resource"):
+            memoized(3)
+
+    with then:
+        assert finalizer.mock_calls == [((1,),)]
+        assert memoized.cache_info().currsize == 2
+
+
+@scenario
+def reject_non_positive_ttl():
+    with when:
+        try:
+            shared_resource(ttl=0)
+        except BaseException as e:
+            exc_info = e
+
+    with then:
+        assert isinstance(exc_info, ValueError)
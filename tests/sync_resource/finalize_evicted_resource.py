@@ -0,0 +1,93 @@
+import warnings
+from unittest.mock import Mock
+
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import shared_resource
+
+
+def add(a, b):
+    return a + b
+
+
+@scenario
+def finalize_resource_on_eviction():
+    with given:
+        finalizer = Mock()
+        memoized = shared_resource(max_instances=1, finalizer=finalizer)(add)
+        memoized(1, 2)
+
+    with when:
+        memoized(2, 2)
+
+    with then:
+        assert finalizer.mock_calls == [((3,),)]
+
+
+@scenario
+def keep_resource_alive_on_cache_hit():
+    with given:
+        finalizer = Mock()
+        memoized = shared_resource(max_instances=1, finalizer=finalizer)(add)
+        memoized(1, 2)
+
+    with when:
+        result = memoized(1, 2)
+
+    with then:
+        assert result == 3
+        assert finalizer.call_count == 0
+
+
+@scenario
+def finalize_all_resources_on_cache_clear():
+    with given:
+        finalizer = Mock()
+        memoized = shared_resource(finalizer=finalizer)(add)
+        memoized(1, 2)
+        memoized(2, 2)
+
+    with when:
+        memoized.cache_clear()
+
+    with then:
+        assert finalizer.mock_calls == [((3,),), ((4,),)]
+        assert memoized.cache_info().currsize == 0
+
+
+@scenario
+def warn_about_failing_finalizer_on_eviction():
+    with given:
+        finalizer = Mock(side_effect=ConnectionError("closed"))
+        memoized = shared_resource(max_instances=1, finalizer=finalizer)(add)
+        memoized(1, 2)
+
+    with when:
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            result = memoized(2, 2)
+
+    with then:
+        assert result == 4
+        assert [w.category for w in caught] == [RuntimeWarning]
+        assert "ConnectionError('closed')" in str(caught[0].message)
+
+
+@scenario
+def finalize_all_resources_before_raising_on_cache_clear():
+    with given:
+        finalizer = Mock(side_effect=[ConnectionError("closed"), None])
+        memoized = shared_resource(finalizer=finalizer)(add)
+        memoized(1, 2)
+        memoized(2, 2)
+
+    with when:
+        try:
+            memoized.cache_clear()
+        except ConnectionError as e:
+            exc = e
+
+    with then:
+        assert str(exc) == "closed"
+        assert finalizer.mock_calls == [((3,),), ((4,),)]
+        assert memoized.cache_info().currsize == 0
@@ -0,0 +1,78 @@
+from unittest.mock import Mock
+
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import shared_resource
+
+
+def make_resource(finalizer=None):
+    def connect(name, retries=3):
+        return object()
+
+    return shared_resource(finalizer=finalizer)(connect)
+
+
+@scenario
+def list_cached_keys():
+    with given:
+        connect = make_resource()
+        connect("db")
+        connect("cache", retries=1)
+        connect(name="db")
+
+    with when:
+        keys = connect.keys()
+
+    with then:
+        assert keys == [("cache", 1), ("db", 3)]
+
+
+@scenario
+def peek_without_building():
+    with given:
+        connect = make_resource()
+        db = connect("db")
+
+    with when:
+        peeked, missing = connect.peek("db"), connect.peek("cache")
+
+    with then:
+        assert peeked is db
+        assert missing is None
+        assert connect.contains("db", retries=3)
+        assert not connect.contains("cache")
+        assert connect.cache_info().hits == 0
+        assert connect.cache_info().currsize == 1
+
+
+@scenario
+def invalidate_single_instance():
+    with given:
+        finalizer = Mock()
+        connect = make_resource(finalizer)
+        db, cache = connect("db"), connect("cache")
+
+    with when:
+        dropped = connect.invalidate("db")
+
+    with then:
+        assert dropped is True
+        assert finalizer.mock_calls == [((db,),)]
+        assert connect("cache") is cache
+        assert connect("db") is not db
+
+
+@scenario
+def invalidate_missing_instance():
+    with given:
+        finalizer = Mock()
+        connect = make_resource(finalizer)
+        connect("db")
+
+    with when:
+        dropped = connect.invalidate("cache")
+
+    with then:
+        assert dropped is False
+        assert finalizer.call_count == 0
+        assert connect.keys() == [("db", 3)]
@@ -0,0 +1,91 @@
+from unittest.mock import Mock
+
+from vedro import params
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import shared_resource
+
+
+def make_memoized():
+    def chromium(channel, headless=True, *, slow_mo=0):
+        return mock(channel, headless, slow_mo)
+
+    mock = Mock(side_effect=lambda *args: args)
+    return shared_resource()(chromium), mock
+
+
+@scenario([
+    params(lambda fn: fn("stable", headless=True)),
+    params(lambda fn: fn(channel="stable", headless=True)),
+    params(lambda fn: fn(headless=True, channel="stable")),
+    params(lambda fn: fn("stable", True, slow_mo=0)),
+])
+def share_instance_between_equivalent_calls(call):
+    with given:
+        memoized, mock = make_memoized()
+        memoized("stable")
+
+    with when:
+        result = call(memoized)
+
+    with then:
+        assert result == ("stable", True, 0)
+        assert mock.call_count == 1
+
+
+@scenario
+def build_distinct_instance_for_different_default_override():
+    with given:
+        memoized, mock = make_memoized()
+        memoized("stable")
+
+    with when:
+        memoized("stable", slow_mo=100)
+
+    with then:
+        assert mock.call_count == 2
+
+
+@scenario
+def ignore_order_of_extra_keyword_arguments():
+    with given:
+        mock = Mock(side_effect=lambda **kwargs: kwargs)
+        memoized = shared_resource()(lambda **kwargs: mock(**kwargs))
+        memoized(headless=True, devtools=False)
+
+    with when:
+        memoized(devtools=False, headless=True)
+
+    with then:
+        assert mock.call_count == 1
+
+
+@scenario
+def raise_original_error_for_unbindable_call():
+    with given:
+        memoized, _ = make_memoized()
+
+    with when:
+        try:
+            memoized(unknown=1)
+        except TypeError as e:
+            exc = e
+
+    with then:
+        assert "unexpected keyword argument 'unknown'" in str(exc)
+
+
+@scenario
+def raise_error_for_unbindable_call_matching_cached_key():
+    with given:
+        memoized, _ = make_memoized()
+        memoized("stable")
+
+    with when:
+        try:
+            memoized("stable", True, 0)  # `slow_mo` is keyword-only
+        except TypeError as e:
+            exc = e
+
+    with then:
+        assert "takes from 1 to 2 positional arguments but 3 were given" in str(exc)
@@ -0,0 +1,138 @@
+import time
+from threading import Event, Timer
+from unittest.mock import Mock, patch
+
+from vedro_fn import given, scenario, then, when
+
+from tests._clock import FakeClock, frozen
+from vedro_shared_resource import FinalizationCoordinator, shared_resource
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+@scenario
+def serve_old_instance_while_refreshing():
+    with given:
+        clock, gate = FakeClock(), Event()
+        calls = []
+
+        def connect():
+            calls.append(len(calls) + 1)
+            if len(calls) > 1:
+                gate.wait(2)  # the refresh is still running while the scenario calls
+            return calls[-1]
+
+        finalizer = Mock()
+        memoized = shared_resource(ttl=10, refresh_ahead=0.5, finalizer=finalizer)(connect)
+        with frozen(clock, "_sync_resource", "_base_resource"):
+            memoized()
+
+    with when:
+        clock.now += 5
+        with frozen(clock, "_sync_resource", "_base_resource"):
+            during = [memoized(), memoized()]
+            gate.set()
+            wait_until(lambda: memoized.peek() == 2)
+            after = memoized()
+
+    with then:
+        assert during == [1, 1]
+        assert after == 2
+        assert calls == [1, 2]  # a single refresh
+        assert finalizer.mock_calls == [((1,),)]
+
+
+@scenario
+def keep_old_instance_if_refresh_fails():
+    with given:
+        clock = FakeClock()
+        factory = Mock(side_effect=[1, ConnectionError("down"), 3])
+        memoized = shared_resource(ttl=10, refresh_ahead=0.5)(lambda: factory())
+        with frozen(clock, "_sync_resource", "_base_resource"):
+            memoized()
+
+    with when:
+        clock.now += 5
+        with frozen(clock, "_sync_resource", "_base_resource"):
+            result = memoized()
+            wait_until(lambda: factory.call_count == 2)
+            time.sleep(0.01)
+            again = memoized()
+
+    with then:
+        assert (result, again) == (1, 1)
+        assert factory.call_count == 2  # rebuilt once it expires, not refreshed again
+
+
+@scenario
+def evict_others_if_refreshed_instance_is_bigger():
+    with given:
+        clock = FakeClock()
+        values = {"a": iter(["old", "refreshed"]), "b": iter(["old"])}
+        finalizer = Mock()
+        memoized = shared_resource(ttl=10, refresh_ahead=0.5, max_bytes=10, sizeof=len,
+                                   finalizer=finalizer)(lambda name: next(values[name]))
+        with frozen(clock, "_sync_resource", "_base_resource"):
+            memoized("a")
+            clock.now += 3
+            memoized("b")  # not due for a refresh yet
+
+    with when:
+        clock.now += 2
+        with frozen(clock, "_sync_resource", "_base_resource"):
+            memoized("a")
+            wait_until(lambda: memoized.peek("a") == "refreshed")
+            wait_until(lambda: finalizer.call_count == 2)
+            cached = [memoized.peek("a"), memoized.peek("b")]
+
+    with then:
+        assert cached == ["refreshed", None]
+        assert finalizer.mock_calls == [(("old",),), (("old",),)]
+        assert memoized.cache_info().currsize == 1
+
+
+@scenario
+async def wait_for_refresh_at_end_of_run():
+    with given:
+        clock, gate = FakeClock(), Event()
+        coordinator = FinalizationCoordinator()
+        instances = iter(["stale", "replacement"])
+
+        def connect():
+            instance = next(instances)
+            if instance == "replacement":
+                gate.wait(2)
+            return instance
+
+        finalizer = Mock()
+        memoized = shared_resource(ttl=10, refresh_ahead=0.5, finalizer=finalizer)(connect)
+        with patch("vedro_shared_resource._base_resource.finalization", coordinator), \
+             patch("vedro_shared_resource._finalization.defer_global"), \
+             frozen(clock, "_sync_resource", "_base_resource"):
+            memoized()
+            clock.now += 5
+            memoized()  # starts a refresh that is still running when the run ends
+
+    with when:
+        Timer(0.05, gate.set).start()
+        await coordinator.close()
+
+    with then:
+        assert sorted(c.args[0] for c in finalizer.mock_calls) == ["replacement", "stale"]
+
+
+@scenario
+def reject_refresh_ahead_without_ttl():
+    with when:
+        try:
+            shared_resource(refresh_ahead=0.5)
+        except BaseException as e:
+            exc_info = e
+
+    with then:
+        assert isinstance(exc_info, ValueError)
+        assert str(exc_info) == "refresh_ahead requires a ttl"
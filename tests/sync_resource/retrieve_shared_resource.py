@@ -88,3 +88,34 @@ def retrieve_resource_respecting_type_sensitivity(type_sensitive: bool, mock_cal
     with then:
         assert result == 3.0
         assert mock.call_count == mock_call_count
+
+
+@scenario
+def keep_every_resource_without_instance_limit():
+    with given:
+        mock = Mock(side_effect=add)
+        memoized = shared_resource(max_instances=None)(mock)
+
+    with when:
+        for a in range(200):
+            memoized(a, 1)
+
+    with then:
+        assert mock.call_count == 200
+        assert memoized.cache_info() == (0, 200, None, 200)
+
+
+@scenario([
+    params(0),
+    params(-1),
+])
+def reject_non_positive_max_instances(max_instances):
+    with when:
+        try:
+            shared_resource(max_instances=max_instances)
+        except BaseException as e:
+            exc_info = e
+
+    with then:
+        assert isinstance(exc_info, ValueError)
+        assert str(exc_info) == f"max_instances must be positive or None, got {max_instances}"
@@ -0,0 +1,117 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier, Event
+from time import sleep
+from unittest.mock import Mock
+
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import EvictionPolicy, shared_resource
+
+
+@scenario
+def build_resource_once_for_concurrent_callers():
+    with given:
+        started, release = Event(), Event()
+
+        def factory(name):
+            started.set()
+            release.wait(5)
+            return name
+
+        mock = Mock(side_effect=factory)
+        memoized = shared_resource()(mock)
+
+    with when:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            first = executor.submit(memoized, "browser")
+            started.wait(5)
+            others = [executor.submit(memoized, "browser") for _ in range(3)]
+            release.set()
+            results = [f.result(5) for f in [first, *others]]
+
+    with then:
+        assert results == ["browser"] * 4
+        assert mock.call_count == 1
+
+
+@scenario
+def share_error_raised_after_build_with_concurrent_callers():
+    with given:
+        started, release = Event(), Event()
+
+        class FailingPolicy(EvictionPolicy):
+            def admit(self, entry):
+                raise RuntimeError("admission failed")
+
+        def factory(name):
+            started.set()
+            release.wait(5)
+            return name
+
+        memoized = shared_resource(eviction=FailingPolicy())(factory)
+
+    with when:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(memoized, "browser")
+            started.wait(5)
+            joined = executor.submit(memoized, "browser")
+            sleep(0.01)  # lets it join the in-flight initialization
+            release.set()
+            errors = [f.exception(5) for f in (first, joined)]
+
+    with then:
+        assert [str(e) for e in errors] == ["admission failed"] * 2
+
+
+@scenario
+def build_different_keys_in_parallel():
+    with given:
+        barrier = Barrier(2, timeout=5)
+
+        def factory(name):
+            barrier.wait()  # fails unless both keys are being built at the same time
+            return name
+
+        memoized = shared_resource()(factory)
+
+    with when:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(memoized, ["chromium", "firefox"]))
+
+    with then:
+        assert results == ["chromium", "firefox"]
+
+
+@scenario
+def retry_initialization_after_failure():
+    with given:
+        mock = Mock(side_effect=[ConnectionError(), "connection"])
+        memoized = shared_resource()(mock)
+        try:
+            memoized()
+        except ConnectionError:
+            pass
+
+    with when:
+        result = memoized()
+
+    with then:
+        assert result == "connection"
+        assert mock.call_count == 2
+
+
+@scenario
+def reject_recursive_initialization():
+    with given:
+        @shared_resource()
+        def recursive():
+            return recursive()
+
+    with when:
+        try:
+            recursive()
+        except RuntimeError as e:
+            exc = e
+
+    with then:
+        assert "recursively" in str(exc)
@@ -0,0 +1,118 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from unittest.mock import Mock
+
+from vedro_fn import given, scenario, then, when
+
+from tests._clock import FakeClock, frozen
+from vedro_shared_resource import shared_resource
+
+
+class Connection:
+    def __init__(self, name):
+        self.name = name
+        self.alive = True
+
+
+@scenario
+def rebuild_resource_that_failed_validation():
+    with given:
+        finalizer = Mock()
+        memoized = shared_resource(validate=lambda conn: conn.alive,
+                                   finalizer=finalizer)(Connection)
+        dead = memoized("db")
+        dead.alive = False
+
+    with when:
+        conn = memoized("db")
+
+    with then:
+        assert conn is not dead
+        assert conn.alive is True
+        assert finalizer.mock_calls == [((dead,),)]
+        assert memoized.cache_info().currsize == 1
+
+
+@scenario
+def treat_validator_error_as_unhealthy():
+    with given:
+        def ping(conn):
+            if not conn.alive:
+                raise ConnectionError()
+            return True
+
+        memoized = shared_resource(validate=ping)(Connection)
+        dead = memoized("db")
+        dead.alive = False
+
+    with when:
+        conn = memoized("db")
+
+    with then:
+        assert conn is not dead
+
+
+@scenario
+def keep_healthy_resource():
+    with given:
+        validate = Mock(return_value=True)
+        memoized = shared_resource(validate=validate)(Connection)
+        conn = memoized("db")
+
+    with when:
+        result = memoized("db")
+
+    with then:
+        assert result is conn
+        assert validate.mock_calls == [((conn,),)]
+        assert memoized.cache_info().hits == 1
+
+
+@scenario
+def rate_limit_validation():
+    with given:
+        clock = FakeClock()
+        validate = Mock(return_value=True)
+        memoized = shared_resource(validate=validate, validate_interval=5)(Connection)
+        with frozen(clock, "_sync_resource"):
+            conn = memoized("db")
+            for _ in range(3):
+                clock.now += 2
+                memoized("db")
+
+    with when:
+        clock.now += 2
+        with frozen(clock, "_sync_resource"):
+            memoized("db")
+
+    with then:
+        # validated at 106 only: 102 and 104 are too close to creation, 108 to the last check
+        assert validate.mock_calls == [((conn,),)]
+
+
+@scenario
+def wait_for_validation_in_progress():
+    with given:
+        started, release = Event(), Event()
+
+        def ping(conn):
+            started.set()
+            release.wait(5)
+            return False
+
+        factory = Mock(side_effect=Connection)
+        memoized = shared_resource(validate=ping)(factory)
+        dead = memoized("db")
+
+    with when:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            first = executor.submit(memoized, "db")
+            started.wait(5)
+            others = [executor.submit(memoized, "db") for _ in range(3)]
+            release.set()
+            results = [f.result(5) for f in [first, *others]]
+
+    with then:
+        assert dead not in results
+        assert len({id(conn) for conn in results}) == 1
+        assert factory.call_count == 2
@@ -0,0 +1,70 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+from vedro_fn import given, scenario, then, when
+
+from vedro_shared_resource import invalidate_tag, shared_resource
+
+
+def make_resource(tags, finalizer=None):
+    def connect(name):
+        return object()
+
+    return shared_resource(tags=tags, finalizer=finalizer)(connect)
+
+
+@scenario
+def drop_instances_of_all_tagged_resources():
+    with given:
+        finalizer = Mock()
+        orders = make_resource(["tag-db", "tag-orders"], finalizer)
+        users = make_resource("tag-db", finalizer)
+        config = make_resource(["tag-config"], finalizer)
+        first, second = orders("a"), orders("b")
+        user = users("a")
+        settings = config("a")
+
+    with when:
+        dropped = invalidate_tag("tag-db")
+
+    with then:
+        assert dropped == 3
+        assert finalizer.call_count == 3
+        assert {call.args[0] for call in finalizer.call_args_list} == {first, second, user}
+        assert orders.keys() == users.keys() == []
+        assert config("a") is settings
+
+
+@scenario
+def ignore_unknown_tag():
+    with given:
+        resource = make_resource(["tag-known"])
+        resource("a")
+
+    with when:
+        dropped = invalidate_tag("tag-unknown")
+
+    with then:
+        assert dropped == 0
+        assert resource.keys() == ["a"]
+
+
+@scenario
+async def finalize_async_instances_in_background():
+    with given:
+        finalizer = AsyncMock()
+
+        async def connect(name):
+            return name
+
+        resource = shared_resource(tags=["tag-async"], finalizer=finalizer)(connect)
+        await resource("a")
+
+    with when:
+        dropped = invalidate_tag("tag-async")
+        await asyncio.sleep(0.01)
+
+    with then:
+        assert dropped == 1
+        assert [call.args for call in finalizer.await_args_list] == [("a",)]
+        assert resource.cache_info().misses == 1  # statistics are kept
@@ -0,0 +1,171 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple, Type, Union
+
+from vedro.core import (
+    ConfigType,
+    Dispatcher,
+    Plugin,
+    PluginConfig,
+    ScenarioOrderer,
+    VirtualScenario,
+)
+from vedro.core.scenario_orderer import StableScenarioOrderer
+from vedro.events import (
+    ArgParsedEvent,
+    ArgParseEvent,
+    CleanupEvent,
+    ConfigLoadedEvent,
+    ScenarioFailedEvent,
+    ScenarioPassedEvent,
+    ScenarioRunEvent,
+    ScenarioSkippedEvent,
+    StartupEvent,
+)
+
+from ._registry import get_registered_resources
+from ._usage import Usage, UsageRecorder, load_usage, save_usage
+
+__all__ = ("SharedResourceAffinity", "SharedResourceAffinityPlugin",)
+
+
+def _count_inits(scenarios: List[VirtualScenario], usage: Dict[str, List[Usage]],
+                 capacities: Dict[str, Optional[int]]) -> int:
+    # Replays the recorded usage against an LRU cache per resource
+    caches: Dict[str, "OrderedDict[str, None]"] = {}
+    inits = 0
+    for scenario in scenarios:
+        for name, key in sorted(usage.get(scenario.unique_id, ())):
+            cache = caches.setdefault(name, OrderedDict())
+            if key in cache:
+                cache.move_to_end(key)
+                continue
+            inits += 1
+            cache[key] = None
+            capacity = capacities.get(name)
+            if capacity is not None and len(cache) > capacity:
+                cache.popitem(last=False)
+    return inits
+
+
+class _AffinityOrderer(ScenarioOrderer):
+    def __init__(self, usage_path: Path,
+                 on_sorted: Callable[[int, int, int], None]) -> None:
+        self._usage_path = usage_path
+        self._on_sorted = on_sorted
+
+    async def sort(self, scenarios: List[VirtualScenario]) -> List[VirtualScenario]:
+        stable = await StableScenarioOrderer().sort(scenarios)
+        usage = load_usage(self._usage_path)
+
+        # Scenarios with the same usage run back to back; groups are chained so that each one
+        # shares as many instances as possible with the previous one
+        groups: Dict[FrozenSet[Usage], List[VirtualScenario]] = {}
+        unknown = []
+        for scenario in stable:
+            used = usage.get(scenario.unique_id)
+            if used:
+                groups.setdefault(frozenset(used), []).append(scenario)
+            else:
+                unknown.append(scenario)
+
+        ordered: List[VirtualScenario] = []
+        pending = list(groups)
+        previous: FrozenSet[Usage] = frozenset()
+        while pending:
+            best = max(range(len(pending)), key=lambda idx: (len(pending[idx] & previous), -idx))
+            previous = pending.pop(best)
+            ordered.extend(groups[previous])
+        ordered.extend(unknown)
+
+        capacities = {resource._name: resource._max_instances
+                      for resource in get_registered_resources()}
+        self._on_sorted(len(ordered), _count_inits(stable, usage, capacities),
+                        _count_inits(ordered, usage, capacities))
+        return ordered
+
+
+class SharedResourceAffinityPlugin(Plugin):
+    """
+    Runs scenarios that use the same shared resource instances back to back.
+
+    With `--order-resources`, scenarios are grouped by the instances (resource and
+    arguments) they used during the previous run, and the groups are chained so that
+    neighbours share as many instances as possible. A small `max_instances` then no longer
+    makes the cache rebuild the same instances over and over. The order depends only on the
+    recorded usage and the scenario paths, so it is the same between runs with the same
+    usage. Scenarios without recorded usage run last, in the stable order.
+
+    At the end of the run, the number of initializations saved compared to the stable order
+    is added to the summary of the run report. It is estimated by replaying the recorded
+    usage against each resource's cache size.
+    """
+
+    def __init__(self, config: Type["SharedResourceAffinity"]) -> None:
+        super().__init__(config)
+        self._usage_path = Path(config.usage_path)
+        self._order_by_default = config.order_by_default
+        self._global_config: Optional[ConfigType] = None
+        self._recorder = UsageRecorder()
+        self._estimate: Optional[Tuple[int, int, int]] = None
+
+    def subscribe(self, dispatcher: Dispatcher) -> None:
+        dispatcher.listen(ConfigLoadedEvent, self.on_config_loaded) \
+                  .listen(ArgParseEvent, self.on_arg_parse) \
+                  .listen(ArgParsedEvent, self.on_arg_parsed) \
+                  .listen(StartupEvent, self.on_startup) \
+                  .listen(ScenarioRunEvent, self.on_scenario_run) \
+                  .listen(ScenarioPassedEvent, self.on_scenario_end) \
+                  .listen(ScenarioFailedEvent, self.on_scenario_end) \
+                  .listen(ScenarioSkippedEvent, self.on_scenario_end) \
+                  .listen(CleanupEvent, self.on_cleanup)
+
+    def on_config_loaded(self, event: ConfigLoadedEvent) -> None:
+        self._global_config = event.config
+
+    def on_arg_parse(self, event: ArgParseEvent) -> None:
+        group = event.arg_parser.add_argument_group("Shared Resources")
+        group.add_argument("--order-resources", action="store_true",
+                           default=self._order_by_default,
+                           help="Run scenarios using the same shared resources back to back")
+
+    def on_arg_parsed(self, event: ArgParsedEvent) -> None:
+        if event.args.order_resources and self._global_config is not None:
+            orderer = _AffinityOrderer(self._usage_path, self._on_sorted)
+            self._global_config.Registry.ScenarioOrderer.register(lambda: orderer, self)
+
+    def on_startup(self, event: StartupEvent) -> None:
+        scheduled = [scenario.unique_id for scenario in event.scheduler.scheduled]
+        self._recorder.start(scheduled, load_usage(self._usage_path))
+
+    def on_scenario_run(self, event: ScenarioRunEvent) -> None:
+        self._recorder.scenario_started(event.scenario_result.scenario.unique_id)
+
+    def on_scenario_end(self, event: Union[ScenarioPassedEvent, ScenarioFailedEvent,
+                                           ScenarioSkippedEvent]) -> None:
+        self._recorder.scenario_finished(event.scenario_result.scenario.unique_id)
+
+    def on_cleanup(self, event: CleanupEvent) -> None:
+        self._recorder.stop()
+        save_usage(self._usage_path, load_usage(self._usage_path), self._recorder.observed)
+        if self._estimate is not None:
+            total, before, after = self._estimate
+            event.report.add_summary(
+                f"Shared resources: {total} scenarios ordered by resource affinity, "
+                f"estimated inits {before} -> {after} ({before - after} saved)"
+            )
+
+    def _on_sorted(self, total: int, before: int, after: int) -> None:
+        self._estimate = (total, before, after)
+
+
+class SharedResourceAffinity(PluginConfig):
+    plugin = SharedResourceAffinityPlugin
+    description = "Orders scenarios so that those using the same shared resources run together"
+
+    # Path of the JSON file with the instances used by each scenario, updated on every run
+    # (the same file as SharedResourceScoping uses)
+    usage_path: Union[str, Path] = Path(".vedro") / "shared_resource_usage.json"
+
+    # Reorder even without --order-resources
+    order_by_default: bool = False
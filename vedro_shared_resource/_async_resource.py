@@ -0,0 +1,577 @@
+import asyncio
+import inspect
+import sys
+from asyncio import get_running_loop
+from functools import partial
+from inspect import isawaitable
+from math import inf
+from time import monotonic, perf_counter
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
+
+if sys.version_info >= (3, 10):
+    from typing import ParamSpec
+else:
+    from typing_extensions import ParamSpec
+
+from ._base_resource import BaseSharedResource, CacheEntry
+
+__all__ = ("AsyncSharedResource",)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_Teardown = AsyncGenerator[Any, None]
+
+
+class AsyncSharedResource(BaseSharedResource["asyncio.Future[R]"], Generic[P, R]):
+    """
+    An LRU cache around an asynchronous resource factory.
+
+    Each entry holds the task that builds the resource, so concurrent callers with the same
+    arguments await a single initialization. Waiters are shielded from each other: a caller
+    that is cancelled stops waiting, but neither cancels the initialization nor the other
+    callers. Evicted instances are passed to the finalizer (which may be a coroutine
+    function) as soon as they drop out of the cache. Async generator factories yield the
+    instance, and the code after `yield` tears it down; instances dropped together are torn
+    down concurrently.
+
+    Entries are scoped to the event loop they were built on: callers running on another loop
+    (a later `asyncio.run()`, or a thread with its own loop) get their own instance, and each
+    instance is finalized on its own loop while that loop is running. Instances of loops that
+    have been closed are dropped on the next miss.
+    """
+
+    def __init__(self, func: Callable[P, Union[Awaitable[R], AsyncGenerator[R, None]]],
+                 **options: Any) -> None:
+        super().__init__(func, **options)
+        # Event loops that instances were built on, checked for being closed on misses
+        self._loops: "Set[asyncio.AbstractEventLoop]" = set()
+        # Finalizations started from done callbacks and background refreshes, kept alive
+        # until they complete
+        self._finalizing: "Set[asyncio.Future[None]]" = set()
+        # Makes `inspect.iscoroutinefunction()` and `asyncio.iscoroutinefunction()` recognize
+        # the wrapper; before 3.12 only the latter can, through a private marker
+        if sys.version_info >= (3, 12):
+            inspect.markcoroutinefunction(self)
+        elif hasattr(asyncio.coroutines, "_is_coroutine"):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    async def __call__(self, *args: P.args, **kwargs: P.kwargs) -> R:
+        # The hit path is inlined here: ready instances are returned without awaiting anything,
+        # pending ones are awaited; misses (and expiring or validated resources) go through
+        # `_call`
+        key = self._key_maker(args, kwargs)
+        if not self._tracks_hits:
+            slot = (key, get_running_loop())
+            with self._lock:
+                entry = self._entries.get(slot)
+                if entry is not None:
+                    self._entries.move_to_end(slot)
+                    self._hits += 1
+            if entry is not None:
+                task = entry.value
+                if task.done():
+                    return task.result()
+                return await self._wait(entry)
+        return await self._call(args, kwargs, remote=True, key=key)
+
+    def peek(self, *args: P.args, **kwargs: P.kwargs) -> Optional[R]:
+        """
+        Return the instance cached for the given arguments without building it, and without
+        counting a hit or refreshing its recency.
+
+        Inside an event loop, the instance of that loop is returned; outside of one, the most
+        recently used instance of any loop.
+
+        :return: The instance, or None if it is not cached, not built yet, or has expired.
+        """
+        key = self._make_key(args, kwargs)
+        with self._lock:
+            entry = self._lookup(key)
+        if entry is None or not _succeeded(entry.value):
+            return None
+        return entry.value.result()
+
+    async def _call_local(self, *args: P.args, **kwargs: P.kwargs) -> R:
+        # Entry point of the cross-process coordinator, which owns the instances it builds
+        return await self._call(args, kwargs, remote=False)
+
+    async def _call(self, args: Any, kwargs: Any, *, remote: bool,
+                    key: Optional[Hashable] = None) -> R:
+        if key is None:
+            key = self._make_key(args, kwargs)
+        if self._recorder is not None:
+            self._recorder(self, key)
+        slot = (key, get_running_loop())
+        now = monotonic() if self._tracks_hits else 0.0
+        if self._expires:
+            with self._lock:
+                expired = self._collect_expired(now)
+            if expired:
+                await self._finalize_or_warn(expired)
+
+        with self._lock:
+            entry = self._entries.get(slot)
+            revalidating = False
+            if entry is None:
+                self._misses += 1
+                abandoned = self._take_abandoned()
+                entry = self._start_build(key, slot, args, kwargs, remote)
+                evicted = abandoned + self._evict_overflow(keep=entry)
+                self._register_cleanup()
+            else:
+                self._entries.move_to_end(slot)
+                entry.last_access = now
+                self._eviction.access(entry)
+                revalidating = self._validation_due(entry, now) and _succeeded(entry.value)
+                if revalidating:
+                    entry = self._start_revalidation(entry, args, kwargs, remote)
+                else:
+                    self._hits += 1
+                    if now >= entry.refresh_at:
+                        entry.refresh_at = inf  # a single refresh per instance
+                        self._start_refresh(entry, args, kwargs, remote)
+                evicted = None
+
+        if revalidating:
+            return await self._wait(entry, shared=False)
+        if evicted is not None:
+            try:
+                return await self._wait(entry, shared=False)
+            finally:
+                await self._finalize_or_warn(evicted)
+        if entry.value.done():
+            return entry.value.result()
+        return await self._wait(entry)
+
+    async def _wait(self, entry: CacheEntry["asyncio.Future[R]"], *, shared: bool = True) -> R:
+        # The entry is not evicted while callers are waiting for it, since they would get an
+        # instance that is finalized already; the overflow it caused is resolved once the last
+        # of them got it
+        started_at = perf_counter()
+        with self._lock:
+            entry.waiters += 1
+        try:
+            return await asyncio.shield(entry.value)
+        finally:
+            if shared:
+                # Unlocked: a wait time lost to a race between threads is not worth a lock
+                self._metrics.record_wait(perf_counter() - started_at)
+            with self._lock:
+                entry.waiters -= 1
+                evicted = [] if entry.waiters else self._evict_overflow(keep=entry)
+            self._finalize_evicted(evicted)
+
+    def _start_build(self, key: Hashable, slot: Hashable, args: Any, kwargs: Any,
+                     remote: bool) -> CacheEntry["asyncio.Future[R]"]:
+        client = self._get_coordinator_client(remote)
+        # The task is set below, since building attaches the generator teardown to the entry
+        entry = CacheEntry(key, cast("asyncio.Future[R]", None), owned=(client is None),
+                           slot=slot)
+        if client is not None:
+            # The coordinator builds the resource on its own loop, the worker only waits for it
+            loop = get_running_loop()
+            task: "asyncio.Future[R]" = loop.run_in_executor(
+                None, partial(client.acquire, self._name, args, kwargs))
+        else:
+            task = asyncio.ensure_future(self._build(entry, args, kwargs))
+        entry.value = task
+        task.add_done_callback(partial(self._forget_failed, slot))
+        if self._tracks_hits:
+            task.add_done_callback(partial(self._start_tracking, slot))
+        if self._measures_size:
+            task.add_done_callback(partial(self._account, slot))
+        task.add_done_callback(partial(self._record_init, slot, perf_counter()))
+        self._entries[slot] = entry
+        self._loops.add(task.get_loop())
+        return entry
+
+    def _slots(self, key: Hashable) -> List[Hashable]:
+        return [(key, loop) for loop in self._loops]
+
+    def _lookup(self, key: Hashable) -> Optional[CacheEntry["asyncio.Future[R]"]]:
+        try:
+            loop = get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None:
+            return super()._lookup((key, loop))
+        # No running loop, so the most recently used instance of any loop
+        for entry in reversed(self._entries.values()):
+            if entry.key == key and not self._has_expired(entry):
+                return entry
+        return None
+
+    def _take_abandoned(self) -> List[CacheEntry["asyncio.Future[R]"]]:
+        # Instances built on event loops that are closed by now can no longer be used
+        closed = [loop for loop in self._loops if loop.is_closed()]
+        if not closed:
+            return []
+        self._loops.difference_update(closed)
+        abandoned = [entry for entry in self._entries.values()
+                     if entry.value.get_loop().is_closed()]
+        for entry in abandoned:
+            self._remove(entry)
+        return abandoned
+
+    def _start_revalidation(self, suspect: CacheEntry["asyncio.Future[R]"],
+                            args: Any, kwargs: Any,
+                            remote: bool) -> CacheEntry["asyncio.Future[R]"]:
+        # The suspect is replaced by an entry whose task either confirms it or rebuilds it,
+        # so callers with the same key wait for the verdict instead of validating again
+        entry = CacheEntry(suspect.key, suspect.value, owned=suspect.owned, slot=suspect.slot)
+        entry.cost, entry.priority = suspect.cost, suspect.priority
+        entry.value = asyncio.ensure_future(self._revalidate(entry, suspect, args, kwargs, remote))
+        entry.value.add_done_callback(partial(self._forget_failed, suspect.slot))
+        if self._measures_size:
+            entry.value.add_done_callback(partial(self._account, suspect.slot))
+        self._entries[suspect.slot] = entry
+        self._total_bytes -= suspect.size
+        return entry
+
+    async def _revalidate(self, entry: CacheEntry["asyncio.Future[R]"],
+                          suspect: CacheEntry["asyncio.Future[R]"],
+                          args: Any, kwargs: Any, remote: bool) -> R:
+        value = suspect.value.result()
+        if await self._is_healthy(value):
+            with self._lock:
+                self._hits += 1
+                entry.last_access = entry.validated_at = monotonic()
+                entry.expires_at = suspect.expires_at
+                entry.refresh_at = suspect.refresh_at
+                entry.teardown = suspect.teardown
+                if self._entries.get(entry.slot) is entry:
+                    entry.size = suspect.size  # the same instance, not measured again
+                    self._total_bytes += entry.size
+                    if self._expires:
+                        self._push_expiry(entry)
+            return value
+
+        with self._lock:
+            self._misses += 1
+        await self._finalize_or_warn([suspect])
+        started_at = perf_counter()
+        client = self._get_coordinator_client(remote)
+        if client is not None:
+            loop = get_running_loop()
+            value = await loop.run_in_executor(
+                None, partial(client.acquire, self._name, args, kwargs))
+        else:
+            value = await self._build(entry, args, kwargs)
+        with self._lock:
+            entry.cost = perf_counter() - started_at
+            self._metrics.record_init(entry.cost)
+            entry.owned = client is None
+            if self._entries.get(entry.slot) is entry:
+                self._track(entry, monotonic())
+                self._eviction.admit(entry)
+        return value
+
+    def _start_refresh(self, stale: CacheEntry["asyncio.Future[R]"], args: Any, kwargs: Any,
+                       remote: bool) -> None:
+        refreshing = asyncio.ensure_future(self._refresh(stale, args, kwargs, remote))
+        self._finalizing.add(refreshing)
+        refreshing.add_done_callback(self._finalizing.discard)
+
+    async def _refresh(self, stale: CacheEntry["asyncio.Future[R]"], args: Any, kwargs: Any,
+                       remote: bool) -> None:
+        # Builds the replacement while callers keep getting the stale instance; if the build
+        # fails, the stale one is simply rebuilt once it expires
+        loop = get_running_loop()
+        client = self._get_coordinator_client(remote)
+        entry = CacheEntry(stale.key, cast("asyncio.Future[R]", None), owned=(client is None),
+                           slot=stale.slot)
+        started_at = perf_counter()
+        try:
+            if client is not None:
+                value = await loop.run_in_executor(
+                    None, partial(client.acquire, self._name, args, kwargs))
+            else:
+                value = await self._build(entry, args, kwargs)
+        except Exception:
+            return
+        entry.value = loop.create_future()
+        entry.value.set_result(value)
+        if self._measures_size:
+            entry.size = self._sizeof(value)
+        with self._lock:
+            entry.cost = perf_counter() - started_at
+            self._metrics.record_init(entry.cost)
+            if self._entries.get(stale.slot) is stale:
+                self._entries[stale.slot] = entry
+                self._total_bytes += entry.size - stale.size
+                self._eviction.admit(entry)
+                self._track(entry, monotonic())
+                # The replacement may be bigger than the stale instance it took over from
+                replaced = [stale] + self._evict_overflow(keep=entry)
+            else:
+                replaced = [entry]  # dropped meanwhile, so the replacement is not needed either
+        await self._finalize_or_warn(replaced)
+        if self._budget is not None and replaced[0] is stale:
+            self._budget.enforce(keep=entry)
+
+    async def _build(self, entry: CacheEntry["asyncio.Future[R]"], args: Any, kwargs: Any) -> R:
+        if self._store is None:
+            value, entry.teardown = await self._run_factory(args, kwargs)
+            return value
+        # Disk access runs in the default executor to keep the event loop responsive; instances
+        # loaded from disk were not set up by the generator, so there is nothing to tear down
+        loop = asyncio.get_running_loop()
+        found, value = await loop.run_in_executor(None, self._store.load, entry.key)
+        if not found:
+            value, entry.teardown = await self._run_factory(args, kwargs)
+            await loop.run_in_executor(None, self._store.store, entry.key, value)
+        return value
+
+    async def _run_factory(self, args: Any, kwargs: Any) -> Tuple[R, Optional[_Teardown]]:
+        if self._depends_on:
+            await self._build_dependencies()
+        if not self._generator:
+            value: R = await self._func(*args, **kwargs)
+            return value, None
+        generator = self._func(*args, **kwargs)
+        try:
+            value = await generator.__anext__()
+        except StopAsyncIteration:
+            raise RuntimeError(f"Generator resource {self!r} did not yield") from None
+        return value, generator
+
+    async def _build_dependencies(self) -> None:
+        # Dependencies are built concurrently (synchronous ones in the default executor), so
+        # the whole graph takes as long as its critical path
+        loop = asyncio.get_running_loop()
+        pending: List[Awaitable[Any]] = []
+        for dependency in self._get_dependencies():
+            if isinstance(dependency, AsyncSharedResource):
+                pending.append(dependency._call((), {}, remote=True))
+            else:
+                pending.append(loop.run_in_executor(
+                    None, partial(dependency._call, (), {}, remote=True)))
+        await asyncio.gather(*pending)
+
+    async def _is_healthy(self, value: R) -> bool:
+        try:
+            healthy = self._validate(value)  # type: ignore[misc]
+            if isawaitable(healthy):
+                healthy = await healthy
+        except Exception:
+            return False
+        return bool(healthy)
+
+    def _prewarm(self, args: Any, kwargs: Any) -> "asyncio.Future[R]":
+        # The in-flight entry is shared with later callers, so they only wait for it
+        task = asyncio.ensure_future(self._call(args, kwargs, remote=True))
+        task.add_done_callback(_consume_exception)
+        return task
+
+    def cache_clear(self) -> None:
+        """
+        Drop all cached instances.
+
+        Finalizers of the dropped instances are scheduled on the running event loop (and
+        their errors issued as a `RuntimeWarning`); use `cache_close()` to wait for them to
+        complete.
+        """
+        dropped = self._take_all()
+        if not self._finalizes or not dropped:
+            return
+        try:
+            get_running_loop()
+        except RuntimeError:
+            asyncio.run(self._finalize(dropped))
+        else:
+            self._finalize_evicted(dropped)
+
+    async def cache_close(self) -> None:
+        """
+        Drop all cached instances and wait until each of them is finalized.
+
+        Every instance is finalized even if some finalizers fail; the first error is then
+        re-raised.
+        """
+        try:
+            await self._finalize(self._take_all())
+        finally:
+            await self._wait_finalizing()
+
+    def _take_all(self) -> List[CacheEntry["asyncio.Future[R]"]]:
+        with self._lock:
+            self._cleanup_registered = False
+            return self._drop_all()
+
+    async def _wait_finalizing(self) -> None:
+        # Finalizations started on another (already closed) event loop cannot be awaited here
+        loop = get_running_loop()
+        pending = [f for f in self._finalizing if f.get_loop() is loop]
+        if pending:
+            await asyncio.wait(pending)
+
+    async def _release(self, predicate: Callable[[Hashable], bool]) -> None:
+        # Drops and finalizes the instances whose keys match, e.g. once no remaining
+        # scenario needs them
+        with self._lock:
+            taken = self._take_entries(predicate)
+        await self._finalize(taken)
+
+    def _is_settled(self, entry: CacheEntry["asyncio.Future[R]"]) -> bool:
+        return _succeeded(entry.value)
+
+    def _can_evict(self, entry: CacheEntry["asyncio.Future[R]"]) -> bool:
+        return not entry.waiters and _succeeded(entry.value)
+
+    def _budget_victim(self, keep: Optional[CacheEntry["asyncio.Future[R]"]]
+                       ) -> Optional[CacheEntry["asyncio.Future[R]"]]:
+        with self._lock:
+            return super()._budget_victim(keep)
+
+    def _budget_remove(self, entry: CacheEntry["asyncio.Future[R]"]) -> bool:
+        with self._lock:
+            return super()._budget_remove(entry)
+
+    def _finalize_evicted(self, entries: List[CacheEntry["asyncio.Future[R]"]]) -> None:
+        # Called from done callbacks and from other resources, so the finalization runs in
+        # the background and `cache_close()` waits for it
+        if not entries or not self._finalizes:
+            return
+        try:
+            get_running_loop()
+        except RuntimeError:
+            asyncio.run(self._finalize_or_warn(entries))
+            return
+        finalizing = asyncio.ensure_future(self._finalize_or_warn(entries))
+        self._finalizing.add(finalizing)
+        finalizing.add_done_callback(self._finalizing.discard)
+
+    async def _finalize_or_warn(self, entries: List[CacheEntry["asyncio.Future[R]"]]) -> None:
+        try:
+            await self._finalize(entries)
+        except Exception as exc:
+            self._warn_finalizer_failed(exc)
+
+    async def _finalize(self, entries: Iterable[CacheEntry["asyncio.Future[R]"]]) -> None:
+        if not self._finalizes:
+            return
+        # Instances are independent of each other, so they are finalized concurrently; the
+        # first error is raised once all of them are
+        owned = [entry for entry in entries if entry.owned]
+        if len(owned) == 1:
+            await self._finalize_on_owner(owned[0])
+        elif owned:
+            results = await asyncio.gather(*(self._finalize_on_owner(entry) for entry in owned),
+                                           return_exceptions=True)
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+
+    async def _finalize_on_owner(self, entry: CacheEntry["asyncio.Future[R]"]) -> None:
+        owner = entry.value.get_loop()
+        if owner is get_running_loop() or not owner.is_running():
+            await self._finalize_entry(entry)
+        else:
+            # Instances are finalized on the loop (and thread) they were built on
+            future = asyncio.run_coroutine_threadsafe(self._finalize_entry(entry), owner)
+            await asyncio.wrap_future(future)
+
+    async def _finalize_entry(self, entry: CacheEntry["asyncio.Future[R]"]) -> None:
+        task = entry.value
+        if not task.done():
+            if task.get_loop() is not get_running_loop():
+                return  # its loop is gone, so it was never built
+            await asyncio.wait([task])
+        if task.cancelled() or task.exception() is not None:
+            return
+        try:
+            if self._finalizer is not None:
+                result = self._finalizer(task.result())
+                if isawaitable(result):
+                    await result
+        finally:
+            if entry.teardown is not None:
+                await _tear_down(entry.teardown)
+
+    def _record_init(self, slot: Hashable, started_at: float, task: "asyncio.Future[R]") -> None:
+        # Runs after `_account`, so the policy sees the measured size as well
+        if not _succeeded(task):
+            return
+        duration = perf_counter() - started_at
+        with self._lock:
+            self._metrics.record_init(duration)
+            entry = self._entries.get(slot)
+            if entry is None or entry.value is not task:
+                return
+            entry.cost = duration
+            self._eviction.admit(entry)
+            # Pending instances are skipped by eviction, so the overflow they caused is
+            # resolved once they are ready (or once their callers got them)
+            evicted = self._evict_overflow(keep=entry)
+        self._finalize_evicted(evicted)
+        if self._budget is not None:
+            # Pending instances cannot be evicted, so the budget is enforced once ready
+            self._budget.enforce(keep=entry)
+
+    def _start_tracking(self, slot: Hashable, task: "asyncio.Future[R]") -> None:
+        # Lifetimes are counted from the moment the resource is ready, pending entries never expire
+        if not _succeeded(task):
+            return
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is not None and entry.value is task:
+                self._track(entry, monotonic())
+
+    def _forget_failed(self, slot: Hashable, task: "asyncio.Future[R]") -> None:
+        # Failed or cancelled initializations are not cached, so the next call retries
+        if not task.cancelled() and task.exception() is None:
+            return
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is not None and entry.value is task:
+                self._remove(entry)
+
+    def _account(self, slot: Hashable, task: "asyncio.Future[R]") -> None:
+        # Instances are measured once they are ready, so the byte budget is enforced here
+        if not _succeeded(task):
+            return
+        size = self._sizeof(task.result())
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is None or entry.value is not task or entry.size:
+                return
+            entry.size = size
+            self._total_bytes += entry.size
+            evicted = self._evict_overflow(keep=entry)
+        self._finalize_evicted(evicted)
+
+
+async def _tear_down(generator: _Teardown) -> None:
+    # Runs the code after `yield`, like the exit of `contextlib.asynccontextmanager`
+    try:
+        await generator.__anext__()
+    except StopAsyncIteration:
+        return
+    await generator.aclose()
+    raise RuntimeError(f"Generator {generator!r} of a shared resource yielded more than once")
+
+
+def _succeeded(task: "asyncio.Future[Any]") -> bool:
+    return task.done() and not task.cancelled() and task.exception() is None
+
+
+def _consume_exception(task: "asyncio.Future[Any]") -> None:
+    # Errors of background initializations are re-raised to the callers, not logged here
+    if not task.cancelled():
+        task.exception()
@@ -0,0 +1,458 @@
+import warnings
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import update_wrapper
+from heapq import heappop, heappush
+from inspect import isasyncgenfunction, isgeneratorfunction
+from itertools import count, islice
+from math import inf
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+from types import MethodType
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Hashable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
+from weakref import WeakSet
+
+from ._budget import CacheBudget, get_cache_budget
+from ._coordinator import CoordinatorClient, get_coordinator_client
+from ._dependencies import Dependency, find_cycle, resolve_dependency
+from ._eviction import EvictionPolicy, LRUEviction
+from ._finalization import finalization
+from ._keys import KeyMaker
+from ._metrics import ResourceMetrics, ResourceStats
+from ._persistent import DEFAULT_CACHE_DIR, Codec, PersistentStore
+from ._registry import register_resource
+from ._sizing import SizeEstimator, deep_sizeof
+from ._tags import register_tags
+
+__all__ = ("BaseSharedResource", "CacheEntry", "CacheInfo", "Finalizer", "Validator",)
+
+R = TypeVar("R")
+
+Finalizer = Callable[[Any], Any]
+Validator = Callable[[Any], Any]
+
+
+class CacheInfo(NamedTuple):
+    """
+    Statistics of a shared resource cache, compatible with `functools.lru_cache().cache_info()`.
+    """
+
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class CacheEntry(Generic[R]):
+    """
+    A single cached resource instance together with the key it was created for.
+    """
+
+    __slots__ = ("key", "slot", "value", "owned", "expires_at", "last_access", "validated_at",
+                 "size", "cost", "priority", "teardown", "refresh_at", "waiters",)
+
+    def __init__(self, key: Hashable, value: R, *, owned: bool = True,
+                 slot: Optional[Hashable] = None) -> None:
+        self.key = key
+        # The key of the entry in the cache, which may also include a scope (the event loop
+        # of asynchronous resources)
+        self.slot = key if slot is None else slot
+        self.value = value
+        # Instances owned by a cross-process coordinator are finalized there, not here
+        self.owned = owned
+        # Monotonic timestamps, maintained only for resources with `ttl`, `idle_timeout`
+        # or `validate`
+        self.expires_at = inf
+        # When a hit starts rebuilding the instance in the background (`refresh_ahead`)
+        self.refresh_at = inf
+        self.last_access = 0.0
+        self.validated_at = 0.0
+        # Estimated footprint in bytes, measured only for resources with `max_bytes`
+        self.size = 0
+        # Measured initialization time in seconds, and the rank given by a cost-aware eviction
+        # policy (entries that are still being built rank last)
+        self.cost = 0.0
+        self.priority = inf
+        # The suspended generator of a generator factory, resumed to tear the instance down
+        self.teardown: Any = None
+        # Callers of an asynchronous resource that are still waiting for the instance, which
+        # is not evicted before they got it
+        self.waiters = 0
+
+
+class BaseSharedResource(ABC, Generic[R]):
+    """
+    Common state and bookkeeping for the synchronous and asynchronous shared resources.
+
+    Entries are kept in insertion/access order so that the first entry is always the
+    least-recently-used one; the eviction policy decides which of them go first once the
+    cache overflows. Subclasses are responsible for running the finalizer (and the
+    generator teardown) of the entries returned by `_evict_overflow` and `_drop_all`.
+    """
+
+    def __init__(self, func: Callable[..., Any], *,
+                 max_instances: Optional[int],
+                 min_instances: int = 0,
+                 type_sensitive: bool,
+                 finalizer: Optional[Finalizer] = None,
+                 cross_process: Optional[str] = None,
+                 ttl: Optional[float] = None,
+                 refresh_ahead: Optional[float] = None,
+                 idle_timeout: Optional[float] = None,
+                 validate: Optional[Validator] = None,
+                 validate_interval: float = 0.0,
+                 persist: Optional[Codec] = None,
+                 persist_dir: Union[str, Path] = DEFAULT_CACHE_DIR,
+                 max_bytes: Optional[int] = None,
+                 sizeof: SizeEstimator = deep_sizeof,
+                 depends_on: Sequence[Dependency] = (),
+                 eviction: Optional[EvictionPolicy] = None,
+                 tags: Sequence[str] = ()) -> None:
+        update_wrapper(self, func)  # type: ignore[arg-type]
+        self._func = func
+        self._name = f"{getattr(func, '__module__', None)}:{getattr(func, '__qualname__', None)}"
+        self._cross_process = cross_process
+        self._max_instances = max_instances
+        self._min_instances = min_instances
+        self._type_sensitive = type_sensitive
+        self._key_maker = KeyMaker(func, type_sensitive)
+        self._finalizer = finalizer
+        # Generator factories yield the instance and tear it down once resumed
+        self._generator = isgeneratorfunction(func) or isasyncgenfunction(func)
+        self._finalizes = finalizer is not None or self._generator
+        self._entries: "OrderedDict[Hashable, CacheEntry[R]]" = OrderedDict()
+        # Guards the entries, which may be shared by several threads (and, for asynchronous
+        # resources, by the event loops they run)
+        self._lock = Lock()
+        self._eviction = eviction if eviction is not None else LRUEviction()
+        self._eviction.bind(self._name)
+        self._max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._total_bytes = 0
+        self._ttl = ttl
+        self._refresh_ahead = refresh_ahead
+        self._idle_timeout = idle_timeout
+        self._expires = ttl is not None or idle_timeout is not None
+        self._expiry_heap: List[Tuple[float, int, CacheEntry[R]]] = []
+        self._expiry_seq = count()
+        self._validate = validate
+        self._validate_interval = validate_interval
+        self._store = PersistentStore(func, persist, persist_dir) if persist is not None else None
+        # Called with each accessed key, while a plugin records which scenarios use what
+        self._recorder: Optional[Callable[[Any, Hashable], None]] = None
+        self._budget: Optional[CacheBudget] = get_cache_budget()
+        self._tracks_hits = False
+        self._measures_size = False
+        self._refresh_tracking()
+        self._depends_on = tuple(depends_on)
+        self._dependencies: Optional[Tuple[Any, ...]] = None
+        self._dependencies_checked = False
+        self._dependents: "WeakSet[BaseSharedResource[Any]]" = WeakSet()
+        self._hits = 0
+        self._misses = 0
+        self._metrics = ResourceMetrics()
+        self._cleanup_registered = False
+        self._tags = frozenset(tags)
+        register_resource(self)
+        register_tags(self, self._tags)
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Return the hit/miss statistics and the current size of the cache.
+
+        :return: A `CacheInfo` named tuple.
+        """
+        return CacheInfo(self._hits, self._misses, self._max_instances, len(self._entries))
+
+    def keys(self) -> List[Hashable]:
+        """
+        Return the keys of the cached instances, from the least to the most recently used one.
+
+        A key is the tuple of arguments bound against the function signature, with defaults
+        applied, so `resource("a", retries=3)` is cached under `("a", 3)`. Like in
+        `functools.lru_cache`, a single `int` or `str` argument is the key itself.
+
+        :return: A list of keys.
+        """
+        with self._lock:
+            return list(dict.fromkeys(entry.key for entry in self._entries.values()))
+
+    def contains(self, *args: Any, **kwargs: Any) -> bool:
+        """
+        Check whether an instance is cached for the given arguments, without building it.
+
+        Expired instances count as not cached, even before they are finalized.
+
+        :return: True if a call with the same arguments would be a cache hit.
+        """
+        key = self._make_key(args, kwargs)
+        with self._lock:
+            return self._lookup(key) is not None
+
+    def invalidate(self, *args: Any, **kwargs: Any) -> bool:
+        """
+        Drop the instance cached for the given arguments and finalize it; other instances
+        are kept. The next call with the same arguments builds a new instance.
+
+        :return: True if an instance was dropped.
+        """
+        key = self._make_key(args, kwargs)
+        with self._lock:
+            dropped = [entry for entry in map(self._entries.get, self._slots(key))
+                       if entry is not None]
+            for entry in dropped:
+                self._remove(entry)
+        self._finalize_evicted(dropped)
+        return bool(dropped)
+
+    def _invalidate_all(self) -> int:
+        # Unlike `cache_clear()`, keeps the statistics; used by `invalidate_tag()`
+        with self._lock:
+            dropped = list(self._entries.values())
+            for entry in dropped:
+                self._remove(entry)
+        self._finalize_evicted(dropped)
+        return len(dropped)
+
+    def stats(self) -> ResourceStats:
+        """
+        Return cumulative hit, miss, eviction and timing statistics of this resource.
+
+        :return: A `ResourceStats` named tuple.
+        """
+        name = getattr(self, "__qualname__", self._name)
+        return self._metrics.snapshot(name, self._hits, self._misses)
+
+    def _make_key(self, args: Any, kwargs: Any) -> Hashable:
+        return self._key_maker(args, kwargs)
+
+    def _get_coordinator_client(self, remote: bool) -> Optional[CoordinatorClient]:
+        if not remote or self._cross_process is None:
+            return None
+        return get_coordinator_client()
+
+    def _slots(self, key: Hashable) -> List[Hashable]:
+        # Every slot an instance with this key may be cached under
+        return [key]
+
+    def _lookup(self, key: Hashable) -> Optional[CacheEntry[R]]:
+        # Called under the lock; the entry a call from here would get, unless it expired
+        entry = self._entries.get(key)
+        return None if entry is None or self._has_expired(entry) else entry
+
+    def _has_expired(self, entry: CacheEntry[R]) -> bool:
+        # Pending entries never expire
+        return self._expires and self._is_settled(entry) and self._is_stale(entry, monotonic())
+
+    def _remove(self, entry: CacheEntry[R]) -> None:
+        del self._entries[entry.slot]
+        self._total_bytes -= entry.size
+
+    def _evict_overflow(self, keep: Optional[CacheEntry[R]] = None) -> List[CacheEntry[R]]:
+        evicted = []
+        excess = 0 if self._max_instances is None else len(self._entries) - self._max_instances
+        if excess > 0:
+            # The entry just added is never its own victim, and instances are not evicted
+            # before their callers got them; the cache then stays over its limit until they did
+            candidates = self._eviction.victims(self._entries.values())
+            evicted = list(islice((e for e in candidates
+                                   if e is not keep and self._can_evict(e)), excess))
+            for entry in evicted:
+                self._remove(entry)
+                self._eviction.evicted(entry)
+        if self._max_bytes is not None and self._total_bytes > self._max_bytes:
+            evicted += self._evict_bytes(keep)
+        self._metrics.evictions += len(evicted)
+        return evicted
+
+    def _evict_bytes(self, keep: Optional[CacheEntry[R]]) -> List[CacheEntry[R]]:
+        # Entries go in the policy's order until the weighted total fits the budget. The
+        # entry just measured is kept even if it alone exceeds the budget, since its caller is
+        # about to use it; pending (not yet measured) entries free nothing and are skipped
+        assert self._max_bytes is not None
+        excess = self._total_bytes - self._max_bytes
+        victims = []
+        for entry in self._eviction.victims(self._entries.values()):
+            if excess <= 0:
+                break
+            if entry is keep or entry.size == 0 or not self._can_evict(entry):
+                continue
+            victims.append(entry)
+            excess -= entry.size
+        for entry in victims:
+            self._remove(entry)
+            self._eviction.evicted(entry)
+        return victims
+
+    def _track(self, entry: CacheEntry[R], now: float) -> None:
+        # A freshly built instance counts as validated and starts its lifetime
+        entry.last_access = now
+        entry.validated_at = now
+        if self._ttl is not None:
+            entry.expires_at = now + self._ttl
+            if self._refresh_ahead is not None:
+                entry.refresh_at = now + self._ttl * self._refresh_ahead
+        if self._expires:
+            self._push_expiry(entry)
+
+    def _validation_due(self, entry: CacheEntry[R], now: float) -> bool:
+        if self._validate is None:
+            return False
+        return now - entry.validated_at >= self._validate_interval
+
+    def _push_expiry(self, entry: CacheEntry[R]) -> None:
+        # The heap deadline is a lower bound: hits move `last_access` forward without touching
+        # the heap, so an idle deadline is re-checked (and re-pushed) only when it is reached
+        deadline = entry.expires_at
+        if self._idle_timeout is not None:
+            deadline = min(deadline, entry.last_access + self._idle_timeout)
+        heappush(self._expiry_heap, (deadline, next(self._expiry_seq), entry))
+
+    def _is_stale(self, entry: CacheEntry[R], now: float) -> bool:
+        if now >= entry.expires_at:
+            return True
+        return self._idle_timeout is not None and now - entry.last_access >= self._idle_timeout
+
+    def _collect_expired(self, now: float) -> List[CacheEntry[R]]:
+        expired: List[CacheEntry[R]] = []
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            _, _, entry = heappop(heap)
+            if self._entries.get(entry.slot) is not entry:
+                continue  # already evicted or replaced
+            if self._is_stale(entry, now):
+                self._remove(entry)
+                expired.append(entry)
+            else:
+                self._push_expiry(entry)
+        return expired
+
+    def _drop_all(self) -> List[CacheEntry[R]]:
+        dropped = list(self._entries.values())
+        self._entries.clear()
+        self._total_bytes = 0
+        self._expiry_heap.clear()
+        self._metrics.carry(self._hits, self._misses)
+        self._hits = 0
+        self._misses = 0
+        return dropped
+
+    def _refresh_tracking(self) -> None:
+        # Hits of expiring, validated or recorded resources (or of those ranked by recency
+        # against other resources or by a policy that counts hits) skip the fast path
+        self._tracks_hits = (self._expires or self._validate is not None
+                             or self._recorder is not None or self._budget is not None
+                             or self._eviction.tracks_access)
+        self._measures_size = self._max_bytes is not None or (
+            self._budget is not None and self._budget.max_bytes is not None)
+
+    def _set_recorder(self, recorder: Optional[Callable[[Any, Hashable], None]]) -> None:
+        self._recorder = recorder
+        self._refresh_tracking()
+
+    def _set_budget(self, budget: Optional[CacheBudget]) -> None:
+        self._budget = budget
+        self._refresh_tracking()
+
+    def _is_settled(self, entry: CacheEntry[R]) -> bool:
+        return True
+
+    def _can_evict(self, entry: CacheEntry[R]) -> bool:
+        return True
+
+    def _budget_victim(self, keep: Optional[CacheEntry[R]]) -> Optional[CacheEntry[R]]:
+        # The least-recently-used instance the global budget may take from this resource
+        if len(self._entries) <= self._min_instances:
+            return None
+        for entry in self._entries.values():
+            if entry is not keep and self._can_evict(entry):
+                return entry
+        return None
+
+    def _budget_remove(self, entry: CacheEntry[R]) -> bool:
+        if self._entries.get(entry.slot) is not entry:
+            return False
+        self._remove(entry)
+        self._metrics.evictions += 1
+        return True
+
+    @abstractmethod
+    def _finalize_evicted(self, entries: List[CacheEntry[R]]) -> None:
+        """
+        Finalize entries dropped on behalf of a caller (evicted, expired, or invalidated),
+        issuing a failing finalizer as a `RuntimeWarning` instead of raising it.
+        """
+
+    def _warn_finalizer_failed(self, exc: Exception) -> None:
+        # Instances are evicted on behalf of callers whose own calls succeeded, so a failing
+        # finalizer is reported instead of being raised at them
+        warnings.warn(f"{self!r} failed to finalize an evicted instance: {exc!r}",
+                      RuntimeWarning)
+
+    @abstractmethod
+    def _take_all(self) -> List[CacheEntry[R]]:
+        """
+        Drop every entry for the caller to finalize, e.g. the finalization coordinator.
+        """
+
+    async def _wait_finalizing(self) -> None:
+        # Waits for finalizations that run in the background, if the resource starts any
+        pass
+
+    def _take_entries(self, predicate: Callable[[Hashable], bool]) -> List[CacheEntry[R]]:
+        taken = [entry for entry in self._entries.values() if predicate(entry.key)]
+        for entry in taken:
+            self._remove(entry)
+        return taken
+
+    def _declared_dependencies(self) -> Tuple[Any, ...]:
+        if self._dependencies is None:
+            self._dependencies = tuple(resolve_dependency(self._func, dependency)
+                                       for dependency in self._depends_on)
+        return self._dependencies
+
+    def _get_dependencies(self) -> Tuple[Any, ...]:
+        # Names are resolved and the graph is checked on first use, so dependencies may be
+        # declared before the resources they refer to are defined
+        dependencies = self._declared_dependencies()
+        if not self._dependencies_checked:
+            cycle = find_cycle(self)
+            if cycle is not None:
+                path = " -> ".join(getattr(r, "__qualname__", repr(r)) for r in cycle)
+                raise ValueError(f"Shared resources depend on each other: {path}")
+            for dependency in dependencies:
+                dependency._dependents.add(self)
+            self._dependencies_checked = True
+        return dependencies
+
+    def _register_cleanup(self) -> None:
+        # Instances still cached when the suite ends are finalized by the finalization
+        # coordinator, which takes care of the order between dependents and dependencies
+        if not self._finalizes or self._cleanup_registered:
+            return
+        self._cleanup_registered = True
+        finalization.schedule()
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        # Decorated methods are bound like plain functions (and like `functools.lru_cache`),
+        # so the instance becomes the first argument and part of the cache key
+        if instance is None:
+            return self
+        return MethodType(cast(Callable[..., Any], self), instance)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self._func!r}>"
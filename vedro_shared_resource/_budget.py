@@ -0,0 +1,101 @@
+from threading import Lock
+from typing import Any, List, Optional, Tuple
+
+from ._registry import get_registered_resources
+
+__all__ = ("CacheBudget", "set_cache_budget", "get_cache_budget",)
+
+
+class CacheBudget:
+    """
+    A process-wide limit on the instances cached by all shared resources together.
+
+    Once the total number of instances or their total estimated size exceeds the budget, the
+    least-recently-used instances across all resources are evicted (and finalized), except
+    that a resource never drops below its `min_instances`.
+    """
+
+    def __init__(self, max_instances: Optional[int] = None,
+                 max_bytes: Optional[int] = None) -> None:
+        self.max_instances = max_instances
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+
+    def enforce(self, keep: Any = None) -> None:
+        """
+        Evict instances until the budget fits.
+
+        Must be called without holding any resource lock.
+
+        :param keep: A cache entry that must not be evicted (the one just built).
+        """
+        taken: List[Tuple[Any, Any]] = []
+        with self._lock:
+            resources = get_registered_resources()
+            while self._exceeded(resources):
+                candidates = []
+                for idx, resource in enumerate(resources):
+                    entry = resource._budget_victim(keep)
+                    if entry is not None:
+                        candidates.append((entry.last_access, idx, resource, entry))
+                if not candidates:
+                    break  # everything left is pending, protected or at its floor
+                _, _, resource, entry = min(candidates, key=lambda c: (c[0], c[1]))
+                if resource._budget_remove(entry):
+                    taken.append((resource, entry))
+        # Finalizers run outside the budget lock, so slow ones do not block other resources
+        for resource, entry in taken:
+            resource._finalize_evicted([entry])
+
+    def _exceeded(self, resources: List[Any]) -> bool:
+        if self.max_instances is not None:
+            if sum(len(resource._entries) for resource in resources) > self.max_instances:
+                return True
+        if self.max_bytes is not None:
+            if sum(resource._total_bytes for resource in resources) > self.max_bytes:
+                return True
+        return False
+
+    def __repr__(self) -> str:
+        return (f"<{self.__class__.__name__} max_instances={self.max_instances} "
+                f"max_bytes={self.max_bytes}>")
+
+
+_budget: Optional[CacheBudget] = None
+
+
+def get_cache_budget() -> Optional[CacheBudget]:
+    """
+    Return the process-wide cache budget, if one is set.
+
+    :return: The budget or None.
+    """
+    return _budget
+
+
+def set_cache_budget(*, max_instances: Optional[int] = None,
+                     max_bytes: Optional[int] = None) -> None:
+    """
+    Limit the instances cached by all shared resources of the process together.
+
+    The budget applies on top of each function's own `max_instances` and `max_bytes`, and
+    evicts the least-recently-used instances across all functions first. Functions keep at
+    least their `min_instances`. Calling it without limits removes the budget.
+
+    :param max_instances: The maximum total number of cached instances. Defaults to None.
+    :param max_bytes: The maximum total estimated size of cached instances in bytes; every
+                      instance is then measured with its resource's `sizeof`. Defaults to None.
+    :raises ValueError: If a limit is not positive.
+    """
+    global _budget
+    for name, limit in (("max_instances", max_instances), ("max_bytes", max_bytes)):
+        if limit is not None and limit <= 0:
+            raise ValueError(f"{name} must be positive, got {limit!r}")
+    if max_instances is None and max_bytes is None:
+        _budget = None
+    else:
+        _budget = CacheBudget(max_instances, max_bytes)
+    for resource in get_registered_resources():
+        resource._set_budget(_budget)
+    if _budget is not None:
+        _budget.enforce()
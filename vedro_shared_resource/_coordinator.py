@@ -0,0 +1,225 @@
+import asyncio
+import os
+import secrets
+import tempfile
+from importlib import import_module
+from multiprocessing.managers import BaseManager
+from threading import Lock, Thread
+from typing import Any, Dict, Optional, Tuple
+
+__all__ = ("ResourceCoordinator", "CoordinatorClient", "get_coordinator_client",
+           "ENV_ADDRESS", "ENV_AUTHKEY",)
+
+ENV_ADDRESS = "VEDRO_SHARED_RESOURCE_COORDINATOR"
+ENV_AUTHKEY = "VEDRO_SHARED_RESOURCE_AUTHKEY"
+
+
+def _resolve_resource(name: str) -> Any:
+    module_name, _, qualname = name.partition(":")
+    obj: Any = import_module(module_name)
+    for attr in qualname.split("."):
+        obj = getattr(obj, attr)
+    return obj
+
+
+class _CoordinatorService:
+    """
+    Lives in the coordinator process and owns every resource requested by the workers.
+
+    Resources are built through the same decorated objects as in the workers, so their
+    `max_instances`, `type_sensitive` and `finalizer` options apply in the coordinator.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._resources: Dict[str, Any] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def acquire(self, name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        resource = self._get_resource(name)
+        if asyncio.iscoroutinefunction(resource):
+            future = asyncio.run_coroutine_threadsafe(resource._call_local(*args, **kwargs),
+                                                      self._get_loop())
+            return future.result()
+        return resource._call_local(*args, **kwargs)
+
+    def acquire_proxy(self, name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        return self.acquire(name, args, kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            resources = list(self._resources.values())
+            self._resources.clear()
+        for resource in resources:
+            if asyncio.iscoroutinefunction(resource):
+                asyncio.run_coroutine_threadsafe(resource.cache_close(), self._get_loop()).result()
+            else:
+                resource.cache_clear()
+
+    def _get_resource(self, name: str) -> Any:
+        with self._lock:
+            if name not in self._resources:
+                self._resources[name] = _resolve_resource(name)
+            return self._resources[name]
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        # Async resources are built on one dedicated loop, so they stay bound to a live loop
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                Thread(target=self._loop.run_forever, daemon=True).start()
+            return self._loop
+
+
+_service: Optional[_CoordinatorService] = None
+
+
+def _get_service() -> _CoordinatorService:
+    global _service
+    if _service is None:
+        _service = _CoordinatorService()
+    return _service
+
+
+class _CoordinatorManager(BaseManager):
+    pass
+
+
+_CoordinatorManager.register("service", callable=_get_service,
+                             method_to_typeid={"acquire_proxy": "resource"})
+_CoordinatorManager.register("resource", create_method=False)
+
+
+class CoordinatorClient:
+    """
+    A worker-side connection to a running `ResourceCoordinator`.
+    """
+
+    def __init__(self, address: str, authkey: bytes) -> None:
+        self._manager = _CoordinatorManager(address=address, authkey=authkey)
+        self._manager.connect()
+        self._service = self._manager.service()  # type: ignore[attr-defined]
+
+    def acquire(self, name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any], *,
+                proxy: bool = False) -> Any:
+        """
+        Return the coordinator-owned resource registered under `name` for the given arguments.
+
+        :param name: The importable name of the decorated function (`module:qualname`).
+        :param args: Positional arguments of the call.
+        :param kwargs: Keyword arguments of the call.
+        :param proxy: If True, a proxy forwarding method calls to the coordinator is returned;
+                      otherwise the resource is returned as a pickled copy.
+        :return: The resource copy or proxy.
+        """
+        if proxy:
+            return self._service.acquire_proxy(name, args, kwargs)
+        return self._service.acquire(name, args, kwargs)
+
+
+_client: Optional[CoordinatorClient] = None
+_client_pid: Optional[int] = None
+_client_lock = Lock()
+
+
+def get_coordinator_client() -> Optional[CoordinatorClient]:
+    """
+    Return the connection to the coordinator announced via the environment, if any.
+
+    The connection is established lazily once per process. Inside the coordinator process
+    itself there is no client, so resources are built locally there.
+
+    :return: A `CoordinatorClient` instance, or None if no coordinator is configured.
+    """
+    global _client, _client_pid
+    address = os.environ.get(ENV_ADDRESS)
+    if address is None or _service is not None:
+        return None
+    pid = os.getpid()
+    with _client_lock:
+        if _client is None or _client_pid != pid:
+            authkey = bytes.fromhex(os.environ.get(ENV_AUTHKEY, ""))
+            _client = CoordinatorClient(address, authkey)
+            _client_pid = pid
+        return _client
+
+
+def _reset_client() -> None:
+    global _client, _client_pid
+    with _client_lock:
+        _client = None
+        _client_pid = None
+
+
+class ResourceCoordinator:
+    """
+    A local process that owns cross-process shared resources.
+
+    Starting the coordinator spawns a server listening on a unix socket and exports its
+    address via environment variables, so worker processes started afterwards attach to it
+    automatically. Resources decorated with `shared_resource(cross_process=...)` are then
+    built once in the coordinator and handed to every worker as a copy or a proxy.
+
+    Example:
+
+        with ResourceCoordinator():
+            run_workers()
+    """
+
+    def __init__(self, address: Optional[str] = None, *,
+                 authkey: Optional[bytes] = None) -> None:
+        """
+        Initialize the coordinator.
+
+        :param address: The unix socket path to listen on. Defaults to a path inside a new
+                        temporary directory.
+        :param authkey: The key workers authenticate with. Defaults to a random key.
+        """
+        if address is None:
+            address = os.path.join(tempfile.mkdtemp(prefix="vedro-shared-resource-"),
+                                   "coordinator.sock")
+        self._address = address
+        self._authkey = authkey if authkey is not None else secrets.token_bytes(32)
+        self._manager: Optional[_CoordinatorManager] = None
+
+    @property
+    def address(self) -> str:
+        return self._address
+
+    def start(self) -> None:
+        """
+        Start the coordinator process and export its address to the environment.
+        """
+        if self._manager is not None:
+            raise RuntimeError(f"{self!r} is already started")
+        self._manager = _CoordinatorManager(address=self._address, authkey=self._authkey)
+        self._manager.start()
+        os.environ[ENV_ADDRESS] = self._address
+        os.environ[ENV_AUTHKEY] = self._authkey.hex()
+        _reset_client()
+
+    def shutdown(self) -> None:
+        """
+        Finalize all coordinator-owned resources and stop the coordinator process.
+        """
+        if self._manager is None:
+            return
+        try:
+            self._manager.service().close()  # type: ignore[attr-defined]
+        finally:
+            self._manager.shutdown()
+            self._manager = None
+            if os.environ.get(ENV_ADDRESS) == self._address:
+                del os.environ[ENV_ADDRESS]
+                os.environ.pop(ENV_AUTHKEY, None)
+            _reset_client()
+
+    def __enter__(self) -> "ResourceCoordinator":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} address={self._address!r}>"
@@ -0,0 +1,65 @@
+import sys
+from typing import Any, Callable, List, Optional, Union
+
+__all__ = ("Dependency", "resolve_dependency", "find_cycle",)
+
+# A decorated shared resource, or its name in the module of the dependent factory (a forward
+# reference to a resource defined further down)
+Dependency = Union[Callable[..., Any], str]
+
+
+def resolve_dependency(owner: Callable[..., Any], dependency: Dependency) -> Any:
+    """
+    Turn a declared dependency into the shared resource object it refers to.
+
+    :param owner: The factory function that declared the dependency.
+    :param dependency: A shared resource or the (dotted) name of one in the owner's module.
+    :return: The shared resource object.
+    :raises ValueError: If a name cannot be resolved.
+    :raises TypeError: If the dependency is not a shared resource.
+    """
+    resource: Any = dependency
+    if isinstance(dependency, str):
+        module = sys.modules.get(getattr(owner, "__module__", None) or "")
+        resource = module
+        for part in dependency.split("."):
+            resource = getattr(resource, part, None)
+        if resource is None:
+            raise ValueError(
+                f"Dependency {dependency!r} of {owner!r} is not defined in {owner.__module__}"
+            )
+    if not callable(getattr(resource, "_get_dependencies", None)):
+        raise TypeError(
+            f"Dependency {dependency!r} of {owner!r} must be decorated with @shared_resource()"
+        )
+    return resource
+
+
+def find_cycle(start: Any) -> Optional[List[Any]]:
+    """
+    Search the dependency graph reachable from a resource for a cycle.
+
+    :param start: The shared resource to start from.
+    :return: The resources forming the cycle (the first one repeated at the end), or None.
+    """
+    path: List[Any] = []
+    on_path = set()
+    done = set()
+
+    def visit(node: Any) -> Optional[List[Any]]:
+        if id(node) in on_path:
+            return path[path.index(node):] + [node]
+        if id(node) in done:
+            return None
+        path.append(node)
+        on_path.add(id(node))
+        for dependency in node._declared_dependencies():
+            cycle = visit(dependency)
+            if cycle is not None:
+                return cycle
+        path.pop()
+        on_path.discard(id(node))
+        done.add(id(node))
+        return None
+
+    return visit(start)
@@ -0,0 +1,172 @@
+from math import inf
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+
+from ._usage import key_id, schedule
+
+__all__ = ("EvictionPolicy", "LRUEviction", "LookaheadEviction", "CostAwareEviction",
+           "resolve_eviction",)
+
+
+class EvictionPolicy:
+    """
+    Decides which cached instances are dropped first once a shared resource exceeds its
+    `max_instances` or `max_bytes`.
+
+    A policy instance belongs to a single decorated function. The base class evicts the
+    least-recently-used instances first. Policies are called under the resource lock.
+    """
+
+    # Whether `access()` needs to see every cache hit (hits then skip the inlined fast path)
+    tracks_access = False
+
+    def __init__(self) -> None:
+        self._resource_name: Optional[str] = None
+
+    def bind(self, resource_name: str) -> None:
+        """
+        Attach the policy to the shared resource it serves.
+
+        :param resource_name: The name the resource is recorded under in the usage log.
+        :raises ValueError: If the policy is already used by another resource.
+        """
+        if self._resource_name is not None:
+            raise ValueError(f"{self!r} is already used by {self._resource_name}")
+        self._resource_name = resource_name
+
+    def admit(self, entry: Any) -> None:
+        """
+        Called once an entry's instance is built, with `entry.cost` (and `entry.size` for
+        resources with `max_bytes`) measured.
+
+        :param entry: The cache entry.
+        """
+
+    def access(self, entry: Any) -> None:
+        """
+        Called on cache hits of resources that track them (see `tracks_access`).
+
+        :param entry: The cache entry.
+        """
+
+    def evicted(self, entry: Any) -> None:
+        """
+        Called for every entry evicted in the order given by `victims()`.
+
+        :param entry: The cache entry.
+        """
+
+    def victims(self, entries: Iterable[Any]) -> Iterable[Any]:
+        """
+        Order cached entries for eviction.
+
+        :param entries: The cached entries, from the least to the most recently used one.
+        :return: The same entries, the first one to evict first. May be lazy.
+        """
+        return entries
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}>"
+
+
+class LRUEviction(EvictionPolicy):
+    """
+    Evicts the least-recently-used instances first (the default).
+    """
+
+
+class LookaheadEviction(EvictionPolicy):
+    """
+    Evicts the instance whose next use in the scenario schedule is the furthest away
+    (Belady's algorithm).
+
+    The planned accesses come from the usage recorded during the previous run by
+    `SharedResourceScoping` or `SharedResourceAffinity`, so one of them must be enabled.
+    Instances that no remaining scenario uses go first, then instances that are not in the
+    plan at all (least-recently-used first), then the others by their next use. Without a
+    plan the policy is plain LRU.
+    """
+
+    def victims(self, entries: Iterable[Any]) -> Iterable[Any]:
+        name = self._resource_name or ""
+
+        def rank(item: Tuple[int, Any]) -> Tuple[int, float]:
+            recency, entry = item
+            next_use = schedule.next_use((name, key_id(entry.key)))
+            if next_use is None:
+                return 1, recency
+            if next_use == inf:
+                return 0, recency
+            return 2, -next_use
+
+        return [entry for _, entry in sorted(enumerate(entries), key=rank)]
+
+
+class CostAwareEviction(EvictionPolicy):
+    """
+    Evicts the instances that are cheapest to rebuild first, favouring recently used ones
+    (GreedyDual-Size).
+
+    Each instance is ranked by `L + cost`, where `cost` is its measured initialization time
+    (divided by its size with `use_size=True`, for resources with `max_bytes`). The rank is
+    refreshed on every hit, and `L` rises to the rank of each evicted instance, so expensive
+    instances that stop being used age out eventually.
+
+    :param use_size: Rank by the initialization time per byte, so that large cheap instances
+                     go before small expensive ones. Defaults to False.
+    """
+
+    tracks_access = True
+
+    def __init__(self, *, use_size: bool = False) -> None:
+        super().__init__()
+        self._use_size = use_size
+        self._inflation = 0.0
+
+    def admit(self, entry: Any) -> None:
+        entry.priority = self._inflation + self._value(entry)
+
+    def access(self, entry: Any) -> None:
+        if entry.priority < inf:  # otherwise still being built
+            entry.priority = self._inflation + self._value(entry)
+
+    def evicted(self, entry: Any) -> None:
+        if entry.priority < inf:
+            self._inflation = max(self._inflation, entry.priority)
+
+    def victims(self, entries: Iterable[Any]) -> Iterable[Any]:
+        # Ties (e.g. instances loaded from the persistent cache) go in LRU order
+        return [entry for _, entry in sorted(enumerate(entries),
+                                             key=lambda item: (item[1].priority, item[0]))]
+
+    def _value(self, entry: Any) -> float:
+        cost: float = entry.cost
+        if self._use_size and entry.size > 0:
+            return cost / int(entry.size)
+        return cost
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} use_size={self._use_size}>"
+
+
+_POLICIES: Dict[str, Callable[[], EvictionPolicy]] = {
+    "lru": LRUEviction,
+    "lookahead": LookaheadEviction,
+    "cost": CostAwareEviction,
+}
+
+
+def resolve_eviction(eviction: Union[str, EvictionPolicy]) -> EvictionPolicy:
+    """
+    Return a policy instance for a built-in policy name or a custom policy object.
+
+    :param eviction: `"lru"`, `"lookahead"`, `"cost"` or an `EvictionPolicy` instance.
+    :return: The policy instance.
+    :raises ValueError: If the name is not a built-in policy.
+    """
+    if not isinstance(eviction, str):
+        return eviction
+    if eviction not in _POLICIES:
+        raise ValueError(
+            f"Unknown eviction policy {eviction!r}, expected one of {', '.join(_POLICIES)}"
+        )
+    return _POLICIES[eviction]()
@@ -0,0 +1,170 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from inspect import iscoroutinefunction
+from time import perf_counter
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional
+from weakref import WeakSet
+
+from vedro import defer_global
+
+from ._registry import get_registered_resources
+
+__all__ = ("FinalizationCoordinator", "TeardownRecord", "finalization",)
+
+
+class TeardownRecord(NamedTuple):
+    """
+    The finalization of a single instance at the end of the suite that was slow or timed out.
+    """
+
+    resource: str
+    key: Hashable
+    duration: float
+    timed_out: bool
+
+    def describe(self) -> str:
+        args = self.key if isinstance(self.key, tuple) else (self.key,)
+        return f"{self.resource}({', '.join(repr(arg) for arg in args)})"
+
+
+class FinalizationCoordinator:
+    """
+    Finalizes the instances that are still cached when the suite ends, and closes the shared
+    pools.
+
+    All resources are finalized at once instead of one after another: asynchronous
+    finalizers run concurrently on the event loop and synchronous ones in a thread pool. A
+    resource is finalized only after every resource that depends on it (see `depends_on`),
+    while independent branches of the dependency graph run in parallel.
+
+    Each instance may take at most `timeout` seconds; the coordinator then stops waiting for
+    it (a synchronous finalizer keeps running in its thread) and moves on. Instances that
+    took at least `slow_threshold` seconds, or timed out, are passed to the `reporter`.
+    The first error raised by a finalizer is re-raised once all the others have completed.
+    """
+
+    def __init__(self) -> None:
+        self.timeout: Optional[float] = None
+        self.slow_threshold = 1.0
+        self.max_workers: Optional[int] = None
+        self.reporter: Optional[Callable[[List[TeardownRecord]], None]] = None
+        self._scheduled = False
+        self._pools: "WeakSet[Any]" = WeakSet()
+
+    def configure(self, *, timeout: Optional[float] = None, slow_threshold: float = 1.0,
+                  max_workers: Optional[int] = None,
+                  reporter: Optional[Callable[[List[TeardownRecord]], None]] = None) -> None:
+        """
+        Set the options of the next finalization.
+
+        :param timeout: The maximum number of seconds to wait for a single instance.
+                        Defaults to None (no limit).
+        :param slow_threshold: The number of seconds from which a teardown is reported as
+                               slow. Defaults to 1.
+        :param max_workers: The maximum number of threads running synchronous finalizers.
+                            Defaults to None (the ThreadPoolExecutor default).
+        :param reporter: Receives the slow and timed out teardowns, slowest first, if there
+                         are any. Defaults to None.
+        """
+        self.timeout = timeout
+        self.slow_threshold = slow_threshold
+        self.max_workers = max_workers
+        self.reporter = reporter
+
+    def schedule(self) -> None:
+        # The whole finalization takes a single slot in the global deferrer
+        if not self._scheduled:
+            self._scheduled = True
+            defer_global(self.close)
+
+    def schedule_pool(self, pool: Any) -> None:
+        # Pools are closed in the same slot, so a pool built before the run starts is closed
+        # at its end as well (see `rearm`)
+        self._pools.add(pool)
+        self.schedule()
+
+    def rearm(self) -> None:
+        """
+        Take the slot in the global deferrer again after the deferrer has cleared its queue,
+        which it does when a run starts.
+
+        Instances built before that (e.g. at import time) are then finalized at the end of the
+        run, even if they only get cache hits during it.
+        """
+        self._scheduled = False
+        if any(owner._cleanup_registered for owner in [*get_registered_resources(), *self._pools]):
+            self.schedule()
+
+    async def close(self) -> None:
+        """
+        Finalize all cached instances of all shared resources and close all shared pools.
+        """
+        self._scheduled = False
+        resources = [resource for resource in get_registered_resources()
+                     if resource._cleanup_registered]
+        pools = [pool for pool in self._pools if pool._cleanup_registered]
+        if not resources and not pools:
+            return
+        finished = {id(resource): asyncio.Event() for resource in resources}
+        records: List[TeardownRecord] = []
+        executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                      thread_name_prefix="shared-resource-finalizer")
+
+        async def close_resource(resource: Any) -> None:
+            try:
+                for dependent in list(resource._dependents):
+                    if id(dependent) in finished:
+                        await finished[id(dependent)].wait()
+                await self._close_resource(resource, executor, records)
+            finally:
+                finished[id(resource)].set()
+
+        async def close_pool(pool: Any) -> None:
+            if iscoroutinefunction(pool.close):
+                await pool.close()
+            else:
+                await asyncio.get_running_loop().run_in_executor(executor, pool.close)
+
+        try:
+            results = await asyncio.gather(*(close_resource(r) for r in resources),
+                                           *(close_pool(p) for p in pools),
+                                           return_exceptions=True)
+        finally:
+            executor.shutdown(wait=False)
+        if records and self.reporter is not None:
+            self.reporter(sorted(records, key=lambda record: -record.duration))
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def _close_resource(self, resource: Any, executor: ThreadPoolExecutor,
+                              records: List[TeardownRecord]) -> None:
+        entries = resource._take_all()
+        errors: Dict[int, BaseException] = {}
+
+        async def close_entry(idx: int, entry: Any) -> None:
+            started_at = perf_counter()
+            if iscoroutinefunction(resource._finalize):
+                finalizing = asyncio.ensure_future(resource._finalize([entry]))
+            else:
+                loop = asyncio.get_running_loop()
+                finalizing = loop.run_in_executor(executor, resource._finalize, [entry])
+            timed_out = False
+            try:
+                await asyncio.wait_for(finalizing, self.timeout)
+            except asyncio.TimeoutError:
+                timed_out = True
+            except Exception as exc:
+                errors[idx] = exc
+            duration = perf_counter() - started_at
+            if timed_out or duration >= self.slow_threshold:
+                name = getattr(resource, "__qualname__", resource._name)
+                records.append(TeardownRecord(name, entry.key, duration, timed_out))
+
+        await asyncio.gather(*(close_entry(idx, entry) for idx, entry in enumerate(entries)))
+        await resource._wait_finalizing()
+        if errors:
+            raise errors[min(errors)]
+
+
+finalization = FinalizationCoordinator()
@@ -0,0 +1,75 @@
+from typing import List, Optional, Type
+
+from vedro.core import Dispatcher, Plugin, PluginConfig
+from vedro.events import CleanupEvent, StartupEvent
+
+from ._finalization import FinalizationCoordinator, TeardownRecord, finalization
+from ._formatting import format_duration
+
+__all__ = ("SharedResourceFinalization", "SharedResourceFinalizationPlugin",)
+
+
+class SharedResourceFinalizationPlugin(Plugin):
+    """
+    Limits how long the finalization of a shared resource instance may take at the end of
+    the run, and adds the teardowns that were slow or timed out to the report summary.
+
+    It also schedules the finalization again once the deferrer has cleared its queue at the
+    start of the run, so instances built before (e.g. at import time) are finalized as well.
+
+    Instances are finalized concurrently in any case (see `FinalizationCoordinator`); the
+    plugin only configures the timeout and the threshold of the report.
+    """
+
+    def __init__(self, config: Type["SharedResourceFinalization"], *,
+                 coordinator: FinalizationCoordinator = finalization) -> None:
+        super().__init__(config)
+        self._timeout = config.timeout
+        self._slow_threshold = config.slow_threshold
+        self._max_workers = config.max_workers
+        self._coordinator = coordinator
+        self._summary: List[str] = []
+
+    def subscribe(self, dispatcher: Dispatcher) -> None:
+        # Plugins are subscribed after the deferrer (which clears its queue on startup and
+        # finalizes the resources on cleanup) and before the reporter (which prints the
+        # summary) listens, so with the same priority the handlers run between them
+        dispatcher.listen(StartupEvent, self.on_startup) \
+                  .listen(CleanupEvent, self.on_cleanup)
+
+    def on_startup(self, event: StartupEvent) -> None:
+        self._summary = []
+        self._coordinator.configure(timeout=self._timeout, slow_threshold=self._slow_threshold,
+                                    max_workers=self._max_workers, reporter=self._report)
+        self._coordinator.rearm()
+
+    def on_cleanup(self, event: CleanupEvent) -> None:
+        self._coordinator.configure()
+        for line in self._summary:
+            event.report.add_summary(line)
+
+    def _report(self, records: List[TeardownRecord]) -> None:
+        lines = [f"Shared resources: {len(records)} slow teardowns"]
+        for record in records:
+            if record.timed_out:
+                lines.append(f"  {record.describe()} timed out after "
+                             f"{format_duration(record.duration)}")
+            else:
+                lines.append(f"  {record.describe()} {format_duration(record.duration)}")
+        self._summary = lines
+
+
+class SharedResourceFinalization(PluginConfig):
+    plugin = SharedResourceFinalizationPlugin
+    description = "Limits and reports the teardown time of shared resources"
+
+    # Maximum number of seconds to wait for the finalization of a single instance (None
+    # waits as long as it takes)
+    timeout: Optional[float] = None
+
+    # Teardowns taking at least this many seconds are reported
+    slow_threshold: float = 1.0
+
+    # Maximum number of threads running synchronous finalizers (None means the
+    # ThreadPoolExecutor default)
+    max_workers: Optional[int] = None
@@ -0,0 +1,13 @@
+__all__ = ("format_duration",)
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Format a duration for the report summary, in milliseconds below one second.
+
+    :param seconds: The duration in seconds.
+    :return: The formatted duration, e.g. "12.5ms" or "1.50s".
+    """
+    if seconds < 1:
+        return f"{seconds * 1000:.1f}ms"
+    return f"{seconds:.2f}s"
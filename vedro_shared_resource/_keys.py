@@ -0,0 +1,244 @@
+import pickle
+from inspect import Parameter, signature
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+__all__ = ("make_key", "encode_key", "KeyMaker",)
+
+
+class _Sentinel:
+    # A key item that stands for a marker of the key layout or an omitted unhashable
+    # default; equal only to itself, and encoded by its token (see `encode_key`)
+    __slots__ = ("token",)
+
+    def __init__(self, token: str) -> None:
+        self.token = token
+
+    def __repr__(self) -> str:
+        return f"<{self.token}>"
+
+
+_KWARGS_MARK = (_Sentinel("kwargs"),)
+_VARARGS_MARK = (_Sentinel("varargs"),)
+_UNBOUND_MARK = (_Sentinel("unbound"),)
+
+
+def make_key(args: Tuple[Any, ...], kwargs: Dict[str, Any], typed: bool) -> Hashable:
+    """
+    Build a hashable cache key from positional and keyword arguments.
+
+    Mirrors the key layout used by `functools.lru_cache`, so arguments that were considered
+    equal by the previous `lru_cache`/`alru_cache` backends are still considered equal.
+
+    :param args: Positional arguments of the call.
+    :param kwargs: Keyword arguments of the call.
+    :param typed: If True, the types of the arguments are included in the key.
+    :return: A hashable key identifying the call.
+    """
+    key: Tuple[Any, ...] = args
+    if kwargs:
+        key += _KWARGS_MARK
+        for item in kwargs.items():
+            key += item
+    if typed:
+        key += tuple(type(v) for v in args)
+        if kwargs:
+            key += tuple(type(v) for v in kwargs.values())
+    elif len(key) == 1 and type(key[0]) in {int, str}:
+        return key[0]  # type: ignore[no-any-return]
+    return key
+
+
+def encode_key(key: Hashable) -> bytes:
+    """
+    Encode a cache key into bytes that are the same for equal keys in every run.
+
+    Tuples and frozensets are encoded item by item (frozensets in a sorted order, which does
+    not depend on hash randomization), sentinels by their role, and other items are pickled.
+    Keys that differ only in their sentinels, e.g. the markers of extra positional and
+    keyword arguments, therefore never share an encoding.
+
+    :param key: A cache key.
+    :return: The encoded key.
+    :raises Exception: If an item of the key cannot be pickled.
+    """
+    parts: List[bytes] = []
+    _encode(key, parts)
+    return b"".join(parts)
+
+
+def _encode(value: Any, parts: List[bytes]) -> None:
+    # Every part is tagged and sized, so the concatenation is unambiguous
+    if type(value) is tuple:
+        parts.append(b"t%d:" % len(value))
+        for item in value:
+            _encode(item, parts)
+    elif type(value) is frozenset:
+        parts.append(b"f%d:" % len(value))
+        parts.extend(sorted(encode_key(item) for item in value))
+    elif type(value) is _Sentinel:
+        token = value.token.encode()
+        parts.append(b"s%d:%s" % (len(token), token))
+    else:
+        data = pickle.dumps(value, protocol=4)
+        parts.append(b"p%d:%s" % (len(data), data))
+
+
+class _Missing:
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+_MISSING: Any = _Missing()
+
+# Key items following the positional arguments: defaults, with the (index, name) slots
+# that are filled from keyword arguments
+_Plan = Tuple[List[Any], List[Tuple[int, str]]]
+
+
+def _hashable_default(param: Parameter) -> Any:
+    # An unhashable default cannot be part of a key, so omitting it is represented by
+    # a per-parameter sentinel instead (passing it explicitly still works, if hashable)
+    if param.default is Parameter.empty:
+        return _MISSING
+    try:
+        hash(param.default)
+    except TypeError:
+        return _Sentinel(f"default of {param.name}")
+    return param.default
+
+
+class KeyMaker:
+    """
+    Builds cache keys that do not depend on how the arguments are spelled.
+
+    Arguments are bound against the function signature, so `f(1, b=2)`, `f(a=1, b=2)` and
+    `f(b=2, a=1)` share one key, and so do an omitted argument and its explicitly passed
+    default. The binding plan is computed once per function; calls without keyword arguments
+    take a fast path that appends the precomputed defaults to the arguments tuple.
+
+    If the signature cannot be inspected, the plain `make_key` layout is used. So it is for
+    calls that do not bind (they are about to fail with a `TypeError` anyway), but marked,
+    since e.g. `f(1, 2, 3)` would otherwise share the key of `f(1)` for
+    `def f(a, b=2, *, c=3)` and be served its instance instead of failing.
+    """
+
+    __slots__ = ("_typed", "_plan", "_positional", "_keyword_only", "_var_positional",
+                 "_var_keyword", "_tails", "_plans",)
+
+    def __init__(self, func: Callable[..., Any], typed: bool) -> None:
+        self._typed = typed
+        self._plan = False
+        self._positional: List[Tuple[str, Any, bool]] = []
+        self._keyword_only: List[Tuple[str, Any]] = []
+        self._var_positional = False
+        self._var_keyword = False
+        # Number of positional arguments -> defaults completing the key, for keyword-less calls
+        self._tails: Dict[int, Tuple[Any, ...]] = {}
+        # (number of positional arguments, keyword names) -> how to complete the key
+        self._plans: Dict[Tuple[int, Tuple[str, ...]], Optional[_Plan]] = {}
+        try:
+            params = signature(func).parameters.values()
+        except (TypeError, ValueError):
+            return
+        for param in params:
+            if param.kind is Parameter.POSITIONAL_ONLY:
+                self._positional.append((param.name, _hashable_default(param), True))
+            elif param.kind is Parameter.POSITIONAL_OR_KEYWORD:
+                self._positional.append((param.name, _hashable_default(param), False))
+            elif param.kind is Parameter.KEYWORD_ONLY:
+                self._keyword_only.append((param.name, _hashable_default(param)))
+            elif param.kind is Parameter.VAR_POSITIONAL:
+                self._var_positional = True
+            else:
+                self._var_keyword = True
+        self._plan = True
+
+        defaults = [default for _, default, _ in self._positional]
+        defaults += [default for _, default in self._keyword_only]
+        for count in range(len(self._positional) + 1):
+            tail = tuple(defaults[count:])
+            if _MISSING not in tail:
+                self._tails[count] = tail
+
+    def __call__(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Hashable:
+        if self._plan:
+            key: Optional[Tuple[Any, ...]]
+            if not kwargs:
+                tail = self._tails.get(len(args))
+                key = (args + tail if tail else args) if tail is not None else self._bind(args, {})
+            elif self._var_positional or self._var_keyword:
+                key = self._bind(args, kwargs)
+            else:
+                pattern = (len(args), tuple(kwargs))
+                plan = self._plans.get(pattern, _MISSING)
+                if plan is _MISSING:
+                    plan = self._plans[pattern] = self._compile(*pattern)
+                if plan is None:
+                    key = None
+                else:
+                    template, slots = plan
+                    values = template.copy()
+                    for idx, name in slots:
+                        values[idx] = kwargs[name]
+                    key = args + tuple(values)
+            if key is not None:
+                if self._typed:
+                    return key + tuple(type(v) for v in key)
+                if len(key) == 1 and type(key[0]) in {int, str}:
+                    return key[0]  # type: ignore[no-any-return]
+                return key
+            unbound = make_key(args, kwargs, self._typed)
+            return _UNBOUND_MARK + (unbound if type(unbound) is tuple else (unbound,))
+        return make_key(args, kwargs, self._typed)
+
+    def _compile(self, nargs: int, names: Tuple[str, ...]) -> Optional[_Plan]:
+        # A symbolic `_bind` for one calling pattern: key items are either defaults or
+        # slots filled from keyword arguments
+        if nargs > len(self._positional):
+            return None
+        remaining = set(names)
+        params = [(name, default, not positional_only)
+                  for name, default, positional_only in self._positional[nargs:]]
+        params += [(name, default, True) for name, default in self._keyword_only]
+
+        template: List[Any] = []
+        slots: List[Tuple[int, str]] = []
+        for name, default, by_name in params:
+            if by_name and name in remaining:
+                remaining.discard(name)
+                slots.append((len(template), name))
+                template.append(None)
+            elif default is _MISSING:
+                return None
+            else:
+                template.append(default)
+        return None if remaining else (template, slots)
+
+    def _bind(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+        positional = self._positional
+        if len(args) > len(positional) and not self._var_positional:
+            return None
+
+        values = list(args[:len(positional)])
+        remaining = dict(kwargs)
+        for name, default, positional_only in positional[len(args):]:
+            if not positional_only and name in remaining:
+                values.append(remaining.pop(name))
+            elif default is _MISSING:
+                return None
+            else:
+                values.append(default)
+        for name, default in self._keyword_only:
+            value = remaining.pop(name, default)
+            if value is _MISSING:
+                return None
+            values.append(value)
+
+        key = tuple(values)
+        if len(args) > len(positional):
+            key += _VARARGS_MARK + args[len(positional):]
+        if remaining:
+            if not self._var_keyword:
+                return None
+            key += _KWARGS_MARK + tuple(sorted(remaining.items()))
+        return key
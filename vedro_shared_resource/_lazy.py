@@ -0,0 +1,205 @@
+import sys
+from inspect import isawaitable
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+if sys.version_info >= (3, 10):
+    from typing import ParamSpec
+else:
+    from typing_extensions import ParamSpec
+
+from ._async_resource import AsyncSharedResource
+from ._sync_resource import SyncSharedResource
+
+__all__ = ("LazyProxy", "AsyncLazyProxy", "LazySyncSharedResource", "LazyAsyncSharedResource",)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+class LazyProxy:
+    """
+    A transparent stand-in for a synchronous shared resource that is built on first use.
+
+    Attribute access, calls and the common container/context manager protocols are forwarded
+    to the instance, which is looked up in the resource cache on every access (a cache hit
+    after the first one), so expiration and health checks keep applying. `repr()` never
+    triggers the initialization. `proxy.__wrapped__` returns the instance itself, e.g. for
+    `isinstance` checks.
+    """
+
+    __slots__ = ("_lazy_resource", "_lazy_args", "_lazy_kwargs",)
+
+    def __init__(self, resource: "LazySyncSharedResource[Any, Any]",
+                 args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+        object.__setattr__(self, "_lazy_resource", resource)
+        object.__setattr__(self, "_lazy_args", args)
+        object.__setattr__(self, "_lazy_kwargs", kwargs)
+
+    @property
+    def __wrapped__(self) -> Any:
+        return self._lazy_resource._resolve(self._lazy_args, self._lazy_kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.__wrapped__, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.__wrapped__, name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self.__wrapped__, name)
+
+    def __dir__(self) -> Any:
+        return dir(self.__wrapped__)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.__wrapped__(*args, **kwargs)
+
+    def __bool__(self) -> bool:
+        return bool(self.__wrapped__)
+
+    def __len__(self) -> int:
+        return len(self.__wrapped__)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.__wrapped__)
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self.__wrapped__
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.__wrapped__[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self.__wrapped__[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        del self.__wrapped__[key]
+
+    def __eq__(self, other: Any) -> bool:
+        return bool(self.__wrapped__ == other)
+
+    def __ne__(self, other: Any) -> bool:
+        return bool(self.__wrapped__ != other)
+
+    def __hash__(self) -> int:
+        return hash(self.__wrapped__)
+
+    def __str__(self) -> str:
+        return str(self.__wrapped__)
+
+    def __enter__(self) -> Any:
+        return self.__wrapped__.__enter__()
+
+    def __exit__(self, *exc_info: Any) -> Any:
+        return self.__wrapped__.__exit__(*exc_info)
+
+    def __repr__(self) -> str:
+        call = _format_call(self._lazy_resource, self._lazy_args, self._lazy_kwargs)
+        return f"<LazyProxy {call}>"
+
+
+class AsyncLazyProxy:
+    """
+    A stand-in for an asynchronous shared resource that is built on first use.
+
+    `await proxy` returns the instance. Attributes are awaitable and callable, so
+    `await proxy.attr` reads an attribute and `await proxy.method(...)` calls a method (and
+    awaits its result if it is awaitable), building the instance first if needed.
+    """
+
+    __slots__ = ("_lazy_resource", "_lazy_args", "_lazy_kwargs",)
+
+    def __init__(self, resource: "LazyAsyncSharedResource[Any, Any]",
+                 args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+        self._lazy_resource = resource
+        self._lazy_args = args
+        self._lazy_kwargs = kwargs
+
+    def __await__(self) -> Generator[Any, None, Any]:
+        return self._lazy_resource._resolve(self._lazy_args, self._lazy_kwargs).__await__()
+
+    def __getattr__(self, name: str) -> "_AwaitableAttribute":
+        return _AwaitableAttribute(self, (name,))
+
+    def __repr__(self) -> str:
+        call = _format_call(self._lazy_resource, self._lazy_args, self._lazy_kwargs)
+        return f"<AsyncLazyProxy {call}>"
+
+
+class _AwaitableAttribute:
+    __slots__ = ("_lazy_proxy", "_lazy_path",)
+
+    def __init__(self, proxy: AsyncLazyProxy, path: Tuple[str, ...]) -> None:
+        self._lazy_proxy = proxy
+        self._lazy_path = path
+
+    def __getattr__(self, name: str) -> "_AwaitableAttribute":
+        return _AwaitableAttribute(self._lazy_proxy, self._lazy_path + (name,))
+
+    def __await__(self) -> Generator[Any, None, Any]:
+        return self._lazy_get().__await__()
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Awaitable[Any]:
+        return self._lazy_invoke(args, kwargs)
+
+    async def _lazy_get(self) -> Any:
+        target = await self._lazy_proxy
+        for name in self._lazy_path:
+            target = getattr(target, name)
+        return target
+
+    async def _lazy_invoke(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        method = await self._lazy_get()
+        result = method(*args, **kwargs)
+        if isawaitable(result):
+            result = await result
+        return result
+
+    def __repr__(self) -> str:
+        return f"<awaitable attribute {'.'.join(self._lazy_path)} of {self._lazy_proxy!r}>"
+
+
+def _format_call(resource: Any, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+    params = [repr(arg) for arg in args] + [f"{name}={value!r}" for name, value in kwargs.items()]
+    return f"{getattr(resource, '__qualname__', resource)!s}({', '.join(params)})"
+
+
+class LazySyncSharedResource(SyncSharedResource[P, R]):
+    """
+    A synchronous shared resource whose calls return a `LazyProxy` instead of the instance.
+    """
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> R:
+        return LazyProxy(self, args, kwargs)  # type: ignore[return-value]
+
+    def _resolve(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> R:
+        return super().__call__(*args, **kwargs)
+
+
+class LazyAsyncSharedResource(AsyncSharedResource[P, R]):
+    """
+    An asynchronous shared resource whose calls return an `AsyncLazyProxy` without awaiting.
+    """
+
+    def __init__(self, func: Callable[P, Union[Awaitable[R], AsyncGenerator[R, None]]],
+                 **options: Any) -> None:
+        super().__init__(func, **options)
+        # Calls return a proxy, not a coroutine
+        self.__dict__.pop("_is_coroutine", None)
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> R:  # type: ignore[override]
+        return AsyncLazyProxy(self, args, kwargs)  # type: ignore[return-value]
+
+    def _resolve(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Awaitable[R]:
+        return super().__call__(*args, **kwargs)
@@ -0,0 +1,71 @@
+from math import ceil
+from typing import List, NamedTuple
+
+__all__ = ("ResourceMetrics", "ResourceStats",)
+
+
+class ResourceStats(NamedTuple):
+    """
+    Cumulative statistics of a single decorated function.
+
+    Unlike `cache_info()`, the counters are not reset by `cache_clear()`. Times are in seconds.
+    """
+
+    name: str
+    hits: int
+    misses: int
+    evictions: int
+    inits: int
+    init_time_total: float
+    init_time_p50: float
+    init_time_p95: float
+    wait_time_total: float
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(ceil(percent / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class ResourceMetrics:
+    """
+    Collects initialization and waiting timings of a shared resource.
+
+    Hits and misses are counted by the resource itself (they are on the hot path); the values
+    dropped by `cache_clear()` are carried over here so the totals stay cumulative.
+    """
+
+    __slots__ = ("hits_carried", "misses_carried", "evictions", "init_times", "wait_time",)
+
+    def __init__(self) -> None:
+        self.hits_carried = 0
+        self.misses_carried = 0
+        self.evictions = 0
+        self.init_times: List[float] = []
+        self.wait_time = 0.0
+
+    def record_init(self, duration: float) -> None:
+        self.init_times.append(duration)
+
+    def record_wait(self, duration: float) -> None:
+        self.wait_time += duration
+
+    def carry(self, hits: int, misses: int) -> None:
+        self.hits_carried += hits
+        self.misses_carried += misses
+
+    def snapshot(self, name: str, hits: int, misses: int) -> ResourceStats:
+        init_times = sorted(self.init_times)
+        return ResourceStats(
+            name=name,
+            hits=self.hits_carried + hits,
+            misses=self.misses_carried + misses,
+            evictions=self.evictions,
+            inits=len(init_times),
+            init_time_total=sum(init_times),
+            init_time_p50=_percentile(init_times, 50),
+            init_time_p95=_percentile(init_times, 95),
+            wait_time_total=self.wait_time,
+        )
@@ -0,0 +1,73 @@
+import json
+from pathlib import Path
+from typing import List, Optional, Type, Union
+
+from vedro.core import Dispatcher, Plugin, PluginConfig
+from vedro.events import CleanupEvent
+
+from ._formatting import format_duration
+from ._metrics import ResourceStats
+from ._registry import get_registered_resources
+
+__all__ = ("SharedResourceMetrics", "SharedResourceMetricsPlugin",)
+
+_COLUMNS = ("Resource", "Hits", "Misses", "Evictions", "Init total", "Init p50", "Init p95",
+            "Waited")
+
+
+class SharedResourceMetricsPlugin(Plugin):
+    """
+    Adds per-resource cache statistics to the summary of the run report and optionally
+    saves them as JSON.
+
+    Resources are sorted by their total initialization time, so the factories that dominate
+    startup come first. A number of evictions close to the number of misses means that
+    `max_instances` is too small for the way the resource is used.
+    """
+
+    def __init__(self, config: Type["SharedResourceMetrics"]) -> None:
+        super().__init__(config)
+        self._report_path = config.report_path
+        self._show_table = config.show_table
+
+    def subscribe(self, dispatcher: Dispatcher) -> None:
+        dispatcher.listen(CleanupEvent, self.on_cleanup)
+
+    def on_cleanup(self, event: CleanupEvent) -> None:
+        stats = self._collect_stats()
+        if self._show_table and stats:
+            for line in self._format_table(stats):
+                event.report.add_summary(line)
+        if self._report_path is not None:
+            report = [s._asdict() for s in stats]
+            Path(self._report_path).write_text(json.dumps(report, indent=2))
+
+    def _collect_stats(self) -> List[ResourceStats]:
+        stats = [resource.stats() for resource in get_registered_resources()]
+        used = [s for s in stats if s.hits or s.misses]
+        return sorted(used, key=lambda s: (-s.init_time_total, s.name))
+
+    def _format_table(self, stats: List[ResourceStats]) -> List[str]:
+        rows = [_COLUMNS] + [(
+            s.name, str(s.hits), str(s.misses), str(s.evictions),
+            format_duration(s.init_time_total), format_duration(s.init_time_p50),
+            format_duration(s.init_time_p95), format_duration(s.wait_time_total),
+        ) for s in stats]
+        widths = [max(len(row[idx]) for row in rows) for idx in range(len(_COLUMNS))]
+        lines = ["Shared resources:"]
+        for row in rows:
+            cells = [row[0].ljust(widths[0])]
+            cells += [cell.rjust(width) for cell, width in zip(row[1:], widths[1:])]
+            lines.append("  " + "  ".join(cells))
+        return lines
+
+
+class SharedResourceMetrics(PluginConfig):
+    plugin = SharedResourceMetricsPlugin
+    description = "Reports shared resource hit/miss and init time statistics after the run"
+
+    # Add the statistics table to the summary of the run
+    show_table: bool = True
+
+    # Path of a JSON file to write the statistics to (None disables the JSON report)
+    report_path: Optional[Union[str, Path]] = None
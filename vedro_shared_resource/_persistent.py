@@ -0,0 +1,180 @@
+import hashlib
+import json
+import marshal
+import os
+import pickle
+import re
+import sys
+import warnings
+from inspect import getsource
+from mmap import ACCESS_READ, mmap
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any, Callable, Dict, Hashable, Optional, Protocol, Tuple, Union
+
+from ._keys import encode_key
+
+__all__ = ("Codec", "PickleCodec", "MarshalCodec", "JsonCodec", "PersistentStore",
+           "resolve_codec", "DEFAULT_CACHE_DIR",)
+
+DEFAULT_CACHE_DIR = Path(".vedro") / "shared_resources"
+
+# Artifacts of at least this many bytes are memory-mapped instead of read into a buffer
+MMAP_THRESHOLD = 1 << 20
+
+
+class Codec(Protocol):
+    """
+    Serializes resource instances for the persistent cache.
+
+    `loads()` receives a bytes-like object, which is a memory map for large artifacts.
+    """
+
+    name: str
+
+    def dumps(self, value: Any) -> bytes:
+        ...
+
+    def loads(self, data: Any) -> Any:
+        ...
+
+
+class PickleCodec:
+    name = "pickle"
+
+    def dumps(self, value: Any) -> bytes:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, data: Any) -> Any:
+        return pickle.loads(data)
+
+
+class MarshalCodec:
+    name = "marshal"
+
+    def dumps(self, value: Any) -> bytes:
+        return marshal.dumps(value)
+
+    def loads(self, data: Any) -> Any:
+        return marshal.loads(data)
+
+
+class JsonCodec:
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value).encode()
+
+    def loads(self, data: Any) -> Any:
+        return json.loads(bytes(data))
+
+
+_CODECS: Dict[str, Callable[[], Codec]] = {
+    PickleCodec.name: PickleCodec,
+    MarshalCodec.name: MarshalCodec,
+    JsonCodec.name: JsonCodec,
+}
+
+
+def resolve_codec(codec: Union[str, Codec]) -> Codec:
+    """
+    Return a codec instance for a built-in codec name or a custom codec object.
+
+    :param codec: `"pickle"`, `"marshal"`, `"json"` or an object implementing `Codec`.
+    :return: The codec instance.
+    :raises ValueError: If the name is not a built-in codec.
+    """
+    if not isinstance(codec, str):
+        return codec
+    if codec not in _CODECS:
+        raise ValueError(f"Unknown codec {codec!r}, expected one of {', '.join(_CODECS)}")
+    return _CODECS[codec]()
+
+
+def _fingerprint(func: Callable[..., Any]) -> bytes:
+    # Editing the function invalidates its artifacts; the code object is used for functions
+    # without source (e.g. defined in a REPL)
+    try:
+        return getsource(func).encode()
+    except (OSError, TypeError):
+        code = getattr(func, "__code__", None)
+        return marshal.dumps(code) if code is not None else repr(func).encode()
+
+
+class PersistentStore:
+    """
+    An on-disk tier of a shared resource cache, kept between runs.
+
+    Artifacts live in a directory named after the function and a hash of its source, the
+    codec and the Python version, so editing the factory never returns stale data. Each file
+    is named after a hash of the cache key. Writes are atomic, and unreadable artifacts are
+    treated as missing.
+    """
+
+    def __init__(self, func: Callable[..., Any], codec: Codec,
+                 directory: Union[str, Path]) -> None:
+        self._func = func
+        self._codec = codec
+        self._root = Path(directory)
+        self._directory: Optional[Path] = None
+
+    def load(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Load the artifact stored for a cache key.
+
+        :param key: The cache key of the call.
+        :return: A `(found, value)` tuple.
+        """
+        path = self._path(key)
+        if path is None:
+            return False, None
+        try:
+            with open(path, "rb") as file:
+                size = os.fstat(file.fileno()).st_size
+                if size < MMAP_THRESHOLD:
+                    return True, self._codec.loads(file.read())
+                with mmap(file.fileno(), 0, access=ACCESS_READ) as mapped:
+                    return True, self._codec.loads(mapped)
+        except FileNotFoundError:
+            return False, None
+        except Exception:
+            path.unlink(missing_ok=True)
+            return False, None
+
+    def store(self, key: Hashable, value: Any) -> None:
+        """
+        Save a freshly built instance for a cache key.
+
+        Values the codec cannot encode are not persisted (a `RuntimeWarning` is issued).
+
+        :param key: The cache key of the call.
+        :param value: The instance returned by the factory.
+        """
+        path = self._path(key)
+        if path is None:
+            return
+        try:
+            data = self._codec.dumps(value)
+        except Exception as exc:
+            warnings.warn(f"{self._func!r} result is not persisted: {exc!r}", RuntimeWarning)
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile(dir=path.parent, delete=False) as file:
+            file.write(data)
+        os.replace(file.name, path)
+
+    def _path(self, key: Hashable) -> Optional[Path]:
+        try:
+            digest = hashlib.sha256(encode_key(key)).hexdigest()
+        except Exception:
+            return None  # arguments that cannot be pickled are cached in memory only
+        return self._get_directory() / f"{digest}.{self._codec.name}"
+
+    def _get_directory(self) -> Path:
+        if self._directory is None:
+            version = hashlib.sha256(_fingerprint(self._func))
+            version.update(f"{self._codec.name}:{sys.version_info[:2]}".encode())
+            name = getattr(self._func, "__qualname__", None) or repr(self._func)
+            name = re.sub(r"[^\w.-]", "_", f"{getattr(self._func, '__module__', '')}.{name}")
+            self._directory = self._root / f"{name}-{version.hexdigest()[:16]}"
+        return self._directory
@@ -0,0 +1,83 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type, Union
+
+from vedro.core import Dispatcher, Plugin, PluginConfig
+from vedro.events import CleanupEvent, StartupEvent
+
+from ._async_resource import AsyncSharedResource
+from ._sync_resource import SyncSharedResource
+
+__all__ = ("SharedResourcePrewarm", "SharedResourcePrewarmPlugin", "PrewarmTarget",)
+
+ArgumentSet = Union[Tuple[Any, ...], Dict[str, Any]]
+PrewarmTarget = Union[Callable[..., Any], Tuple[Callable[..., Any], Sequence[ArgumentSet]]]
+
+
+class SharedResourcePrewarmPlugin(Plugin):
+    """
+    Starts shared resources in the background before the first scenario runs.
+
+    Asynchronous resources are started as asyncio tasks and synchronous ones in a thread pool,
+    all of them concurrently. A scenario that calls a resource which is still being built only
+    waits for that particular resource.
+    """
+
+    def __init__(self, config: Type["SharedResourcePrewarm"]) -> None:
+        super().__init__(config)
+        self._resources = config.resources
+        self._max_workers = config.max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: List["Union[Future[Any], asyncio.Future[Any]]"] = []
+
+    def subscribe(self, dispatcher: Dispatcher) -> None:
+        # Warm-up starts after the deferrer resets its global queue and is awaited
+        # before the deferrer finalizes resources at the end of the run
+        dispatcher.listen(StartupEvent, self.on_startup, priority=100) \
+                  .listen(CleanupEvent, self.on_cleanup, priority=-100)
+
+    def on_startup(self, event: StartupEvent) -> None:
+        for resource, args, kwargs in self._iter_calls():
+            if isinstance(resource, AsyncSharedResource):
+                self._futures.append(resource._prewarm(args, kwargs))
+            elif isinstance(resource, SyncSharedResource):
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self._max_workers,
+                                                        thread_name_prefix="shared-resource")
+                self._futures.append(resource._prewarm(self._executor, args, kwargs))
+            else:
+                raise TypeError(f"{resource!r} is not decorated with @shared_resource()")
+
+    async def on_cleanup(self, event: CleanupEvent) -> None:
+        futures = [asyncio.wrap_future(f) for f in self._futures]
+        self._futures.clear()
+        await asyncio.gather(*futures, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _iter_calls(self) -> Iterator[Tuple[Any, Tuple[Any, ...], Dict[str, Any]]]:
+        for target in self._resources:
+            if not isinstance(target, tuple):
+                yield target, (), {}
+                continue
+            resource, arg_sets = target
+            for arg_set in arg_sets:
+                if isinstance(arg_set, dict):
+                    yield resource, (), arg_set
+                else:
+                    yield resource, tuple(arg_set), {}
+
+
+class SharedResourcePrewarm(PluginConfig):
+    plugin = SharedResourcePrewarmPlugin
+    description = "Starts shared resources in the background before the first scenario"
+
+    # Resources to start: a decorated function (called without arguments) or a tuple of
+    # a decorated function and a list of argument sets, where each argument set is either
+    # a tuple of positional arguments or a dict of keyword arguments
+    resources: Sequence[PrewarmTarget] = ()
+
+    # Maximum number of threads building synchronous resources (None means the
+    # ThreadPoolExecutor default)
+    max_workers: Optional[int] = None
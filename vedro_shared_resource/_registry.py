@@ -0,0 +1,26 @@
+from typing import Any, List
+from weakref import WeakSet
+
+__all__ = ("register_resource", "get_registered_resources",)
+
+_resources: "WeakSet[Any]" = WeakSet()
+
+
+def register_resource(resource: Any) -> None:
+    """
+    Remember a decorated function so that plugins can inspect every shared resource.
+
+    Resources are held weakly, so functions decorated on the fly (e.g. in tests) do not leak.
+
+    :param resource: The decorated function object.
+    """
+    _resources.add(resource)
+
+
+def get_registered_resources() -> List[Any]:
+    """
+    Return all live decorated functions.
+
+    :return: A list of shared resource objects.
+    """
+    return list(_resources)
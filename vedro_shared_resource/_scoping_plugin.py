@@ -0,0 +1,103 @@
+from pathlib import Path
+from typing import Callable, Dict, Hashable, List, Set, Type, Union
+
+from vedro.core import Dispatcher, Plugin, PluginConfig
+from vedro.events import (
+    CleanupEvent,
+    ScenarioFailedEvent,
+    ScenarioPassedEvent,
+    ScenarioRunEvent,
+    ScenarioSkippedEvent,
+    StartupEvent,
+)
+
+from ._async_resource import AsyncSharedResource
+from ._registry import get_registered_resources
+from ._usage import Usage, UsageRecorder, key_id, load_usage, save_usage
+
+__all__ = ("SharedResourceScoping", "SharedResourceScopingPlugin",)
+
+
+def _matching(key_ids: Set[str]) -> Callable[[Hashable], bool]:
+    return lambda key: key_id(key) in key_ids
+
+
+class SharedResourceScopingPlugin(Plugin):
+    """
+    Finalizes each cached instance right after the last scenario that needs it.
+
+    Every run records which instances (resource and arguments) each scenario uses. The next
+    run counts, for every instance, the scheduled scenarios that used it last time and drops
+    the instance once all of them have finished, instead of keeping it until the end of the
+    suite. Peak memory then follows the resources that are actually live at each point of
+    the schedule.
+
+    Scenarios that are new (not in the recorded usage) are not accounted for: if one of them
+    needs an instance that was already released, the instance is simply built again.
+    """
+
+    def __init__(self, config: Type["SharedResourceScoping"]) -> None:
+        super().__init__(config)
+        self._usage_path = Path(config.usage_path)
+        self._recorded: Dict[str, List[Usage]] = {}
+        self._remaining: Dict[Usage, Set[str]] = {}
+        self._recorder = UsageRecorder()
+
+    def subscribe(self, dispatcher: Dispatcher) -> None:
+        # Instances are released after the deferrer has run the scenario's own cleanups
+        dispatcher.listen(StartupEvent, self.on_startup) \
+                  .listen(ScenarioRunEvent, self.on_scenario_run) \
+                  .listen(ScenarioPassedEvent, self.on_scenario_end, priority=100) \
+                  .listen(ScenarioFailedEvent, self.on_scenario_end, priority=100) \
+                  .listen(ScenarioSkippedEvent, self.on_scenario_end, priority=100) \
+                  .listen(CleanupEvent, self.on_cleanup)
+
+    def on_startup(self, event: StartupEvent) -> None:
+        self._recorded = load_usage(self._usage_path)
+        scheduled = [scenario.unique_id for scenario in event.scheduler.scheduled]
+        for unique_id in scheduled:
+            for usage in self._recorded.get(unique_id, []):
+                self._remaining.setdefault(usage, set()).add(unique_id)
+        self._recorder.start(scheduled, self._recorded)
+
+    def on_scenario_run(self, event: ScenarioRunEvent) -> None:
+        self._recorder.scenario_started(event.scenario_result.scenario.unique_id)
+
+    async def on_scenario_end(self, event: Union[ScenarioPassedEvent, ScenarioFailedEvent,
+                                                 ScenarioSkippedEvent]) -> None:
+        unique_id = event.scenario_result.scenario.unique_id
+        self._recorder.scenario_finished(unique_id)
+        released: Dict[str, Set[str]] = {}
+        for usage in self._recorded.get(unique_id, []):
+            users = self._remaining.get(usage)
+            if users is None:
+                continue
+            users.discard(unique_id)
+            if not users:
+                del self._remaining[usage]
+                name, key = usage
+                released.setdefault(name, set()).add(key)
+        if released:
+            await self._release(released)
+
+    def on_cleanup(self, event: CleanupEvent) -> None:
+        self._recorder.stop()
+        save_usage(self._usage_path, self._recorded, self._recorder.observed)
+
+    async def _release(self, released: Dict[str, Set[str]]) -> None:
+        for resource in get_registered_resources():
+            keys = released.get(resource._name)
+            if not keys:
+                continue
+            if isinstance(resource, AsyncSharedResource):
+                await resource._release(_matching(keys))
+            else:
+                resource._release(_matching(keys))
+
+
+class SharedResourceScoping(PluginConfig):
+    plugin = SharedResourceScopingPlugin
+    description = "Finalizes shared resources after the last scenario that uses them"
+
+    # Path of the JSON file with the instances used by each scenario, updated on every run
+    usage_path: Union[str, Path] = Path(".vedro") / "shared_resource_usage.json"
@@ -0,0 +1,535 @@
+import asyncio
+import sys
+from abc import ABC, abstractmethod
+from asyncio import iscoroutinefunction
+from collections import deque
+from functools import update_wrapper
+from inspect import isawaitable
+from threading import Event, Lock
+from time import monotonic
+from typing import (
+    Any,
+    AsyncContextManager,
+    Awaitable,
+    Callable,
+    ContextManager,
+    Deque,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
+
+if sys.version_info >= (3, 10):
+    from typing import ParamSpec
+else:
+    from typing_extensions import ParamSpec
+
+from ._base_resource import Finalizer
+from ._finalization import finalization
+from ._keys import KeyMaker
+
+__all__ = ("shared_pool", "SyncSharedPool", "AsyncSharedPool", "PoolInfo",)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+ResetHook = Callable[[Any], Any]
+
+
+class PoolInfo(NamedTuple):
+    """
+    Statistics of a shared pool, aggregated over all argument sets.
+    """
+
+    checkouts: int
+    waits: int
+    total_wait_time: float
+    max_wait_time: float
+    size: int
+    idle: int
+
+
+class _Handoff(Generic[R]):
+    """
+    What a waiter receives: either a checked-in instance or a permission to create one.
+    """
+
+    __slots__ = ("instance", "create",)
+
+    def __init__(self, instance: Optional[R] = None, *, create: bool = False) -> None:
+        self.instance = instance
+        self.create = create
+
+
+class _SyncWaiter(Generic[R]):
+    __slots__ = ("event", "handoff",)
+
+    def __init__(self) -> None:
+        self.event = Event()
+        self.handoff: Optional[_Handoff[R]] = None
+
+
+class _Pool(Generic[R]):
+    __slots__ = ("args", "kwargs", "idle", "size", "waiters", "closed",)
+
+    def __init__(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+        self.args = args
+        self.kwargs = kwargs
+        self.idle: Deque[R] = deque()
+        self.size = 0  # created plus being created
+        self.waiters: Deque[Any] = deque()
+        self.closed = False
+
+
+class _BaseSharedPool(ABC, Generic[R]):
+    def __init__(self, func: Callable[..., Any], *,
+                 min_size: int,
+                 max_size: int,
+                 type_sensitive: bool,
+                 reset: Optional[ResetHook] = None,
+                 finalizer: Optional[Finalizer] = None) -> None:
+        update_wrapper(self, func)  # type: ignore[arg-type]
+        self._func = func
+        self._min_size = min_size
+        self._max_size = max_size
+        self._key_maker = KeyMaker(func, type_sensitive)
+        self._reset = reset
+        self._finalizer = finalizer
+        self._pools: Dict[Hashable, _Pool[R]] = {}
+        # Pools of the checked-out instances, one per checkout, since a factory may return
+        # the same object more than once
+        self._in_use: Dict[int, List[_Pool[R]]] = {}
+        self._checkouts = 0
+        self._waits = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._cleanup_registered = False
+
+    def pool_info(self) -> PoolInfo:
+        """
+        Return checkout and waiting statistics together with the current pool sizes.
+
+        :return: A `PoolInfo` named tuple.
+        """
+        return PoolInfo(
+            checkouts=self._checkouts,
+            waits=self._waits,
+            total_wait_time=self._total_wait_time,
+            max_wait_time=self._max_wait_time,
+            size=sum(pool.size for pool in self._pools.values()),
+            idle=sum(len(pool.idle) for pool in self._pools.values()),
+        )
+
+    def _get_pool(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> _Pool[R]:
+        key = self._key_maker(args, kwargs)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = _Pool(args, kwargs)
+            if self._finalizer is not None and not self._cleanup_registered:
+                # Idle instances left when the suite ends are finalized by the coordinator
+                self._cleanup_registered = True
+                finalization.schedule_pool(self)
+        return pool
+
+    @abstractmethod
+    def close(self) -> Any:
+        """
+        Finalize all idle instances; instances in use are finalized when checked in.
+
+        The finalization coordinator calls it at the end of the suite, awaiting it if it is a
+        coroutine function.
+        """
+
+    def _lend(self, pool: _Pool[R], instance: R) -> None:
+        self._in_use.setdefault(id(instance), []).append(pool)
+
+    def _take_back(self, instance: R) -> Optional[_Pool[R]]:
+        pools = self._in_use.get(id(instance))
+        if not pools:
+            return None
+        pool = pools.pop()
+        if not pools:
+            del self._in_use[id(instance)]
+        return pool
+
+    def _record_wait(self, started_at: float) -> None:
+        elapsed = monotonic() - started_at
+        self._waits += 1
+        self._total_wait_time += elapsed
+        self._max_wait_time = max(self._max_wait_time, elapsed)
+
+    def _release_slots(self, pool: _Pool[R], count: int = 1) -> List[Any]:
+        # Freed slots go to the first waiters, which are then allowed to create an instance
+        pool.size -= count
+        creators: List[Any] = []
+        while pool.waiters and len(creators) < count:
+            waiter = pool.waiters.popleft()
+            if self._is_waiting(waiter):
+                pool.size += 1
+                creators.append(waiter)
+        return creators
+
+    def _is_waiting(self, waiter: Any) -> bool:
+        return True
+
+    def _drop_pools(self) -> List[R]:
+        dropped: List[R] = []
+        for pool in self._pools.values():
+            pool.closed = True
+            dropped.extend(pool.idle)
+            pool.size -= len(pool.idle)
+            pool.idle.clear()
+        self._pools.clear()
+        self._cleanup_registered = False
+        return dropped
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self._func!r}>"
+
+
+class SyncSharedPool(_BaseSharedPool[R], Generic[P, R]):
+    """
+    A thread-safe pool of instances built by a synchronous factory, one pool per argument set.
+
+    Waiters are served in FIFO order: an instance checked in while others are waiting is
+    handed directly to the longest-waiting caller.
+    """
+
+    def __init__(self, func: Callable[P, R], **kwargs: Any) -> None:
+        super().__init__(func, **kwargs)
+        self._lock = Lock()
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> ContextManager[R]:
+        return _SyncLease(self, args, kwargs)
+
+    def checkout(self, *args: P.args, **kwargs: P.kwargs) -> R:
+        """
+        Take an instance out of the pool, creating or waiting for one if none is idle.
+
+        :return: The checked-out instance, which must be returned with `checkin()`.
+        """
+        waiter: Optional[_SyncWaiter[R]] = None
+        with self._lock:
+            pool = self._get_pool(args, kwargs)
+            self._checkouts += 1
+            if pool.idle:
+                instance = pool.idle.pop()
+                self._lend(pool, instance)
+                return instance
+            if pool.size < self._max_size:
+                # The first checkout of an argument set fills the pool up to `min_size`
+                reserved = min(max(self._min_size - pool.size, 1), self._max_size - pool.size)
+                pool.size += reserved
+            else:
+                waiter = _SyncWaiter()
+                pool.waiters.append(waiter)
+
+        if waiter is not None:
+            started_at = monotonic()
+            waiter.event.wait()
+            with self._lock:
+                self._record_wait(started_at)
+            assert waiter.handoff is not None
+            if not waiter.handoff.create:
+                return cast(R, waiter.handoff.instance)
+            reserved = 1
+
+        try:
+            while reserved > 1:
+                self._checkin_new(pool, self._func(*pool.args, **pool.kwargs))
+                reserved -= 1
+            instance = self._func(*pool.args, **pool.kwargs)
+        except BaseException:
+            with self._lock:
+                creators = self._release_slots(pool, reserved)
+            self._hand_over(creators, _Handoff(create=True))
+            raise
+
+        with self._lock:
+            self._lend(pool, instance)
+        return instance
+
+    def checkin(self, instance: R) -> None:
+        """
+        Return a checked-out instance to its pool, running the reset hook first.
+
+        If the reset hook raises, the instance is finalized and removed from the pool.
+
+        :param instance: The instance previously returned by `checkout()`.
+        """
+        with self._lock:
+            pool = self._take_back(instance)
+        if pool is None:
+            raise ValueError(f"{instance!r} is not checked out from {self!r}")
+
+        if self._reset is not None and not pool.closed:
+            try:
+                self._reset(instance)
+            except Exception:
+                self._destroy(pool, instance)
+                return
+        self._checkin_new(pool, instance)
+
+    def close(self) -> None:
+        """
+        Finalize all idle instances; instances in use are finalized when checked in.
+        """
+        with self._lock:
+            dropped = self._drop_pools()
+        for instance in dropped:
+            self._finalize(instance)
+
+    def _checkin_new(self, pool: _Pool[R], instance: R) -> None:
+        with self._lock:
+            if pool.closed:
+                waiter = None
+            elif pool.waiters:
+                waiter = pool.waiters.popleft()
+                self._lend(pool, instance)
+            else:
+                pool.idle.append(instance)
+                return
+        if waiter is None:
+            self._destroy(pool, instance)
+        else:
+            self._hand_over([waiter], _Handoff(instance))
+
+    def _destroy(self, pool: _Pool[R], instance: R) -> None:
+        with self._lock:
+            creators = self._release_slots(pool)
+        self._finalize(instance)
+        self._hand_over(creators, _Handoff(create=True))
+
+    def _hand_over(self, waiters: List["_SyncWaiter[R]"], handoff: _Handoff[R]) -> None:
+        for waiter in waiters:
+            waiter.handoff = handoff
+            waiter.event.set()
+
+    def _finalize(self, instance: R) -> None:
+        if self._finalizer is not None:
+            self._finalizer(instance)
+
+
+class AsyncSharedPool(_BaseSharedPool[R], Generic[P, R]):
+    """
+    A pool of instances built by an asynchronous factory, one pool per argument set.
+
+    Waiters are served in FIFO order: an instance checked in while others are waiting is
+    handed directly to the longest-waiting task. A waiter cancelled after receiving an
+    instance passes it on, so no instance is lost.
+    """
+
+    def __init__(self, func: Callable[P, Awaitable[R]], **kwargs: Any) -> None:
+        super().__init__(func, **kwargs)
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> AsyncContextManager[R]:
+        return _AsyncLease(self, args, kwargs)
+
+    async def checkout(self, *args: P.args, **kwargs: P.kwargs) -> R:
+        """
+        Take an instance out of the pool, creating or waiting for one if none is idle.
+
+        :return: The checked-out instance, which must be returned with `checkin()`.
+        """
+        pool = self._get_pool(args, kwargs)
+        self._checkouts += 1
+        if pool.idle:
+            instance = pool.idle.pop()
+            self._lend(pool, instance)
+            return instance
+
+        if pool.size < self._max_size:
+            # The first checkout of an argument set fills the pool up to `min_size`
+            reserved = min(max(self._min_size - pool.size, 1), self._max_size - pool.size)
+            pool.size += reserved
+        else:
+            waiter: "asyncio.Future[_Handoff[R]]" = asyncio.get_running_loop().create_future()
+            pool.waiters.append(waiter)
+            started_at = monotonic()
+            try:
+                handoff = await waiter
+            except asyncio.CancelledError:
+                if not waiter.cancelled():
+                    await self._pass_on(pool, waiter.result())
+                elif waiter in pool.waiters:
+                    pool.waiters.remove(waiter)
+                raise
+            finally:
+                self._record_wait(started_at)
+            if not handoff.create:
+                return cast(R, handoff.instance)
+            reserved = 1
+
+        try:
+            while reserved > 1:
+                await self._checkin_new(pool, await self._func(*pool.args, **pool.kwargs))
+                reserved -= 1
+            instance = await self._func(*pool.args, **pool.kwargs)
+        except BaseException:
+            self._hand_over(self._release_slots(pool, reserved), _Handoff(create=True))
+            raise
+
+        self._lend(pool, instance)
+        return instance
+
+    async def checkin(self, instance: R) -> None:
+        """
+        Return a checked-out instance to its pool, running the reset hook first.
+
+        If the reset hook raises, the instance is finalized and removed from the pool.
+
+        :param instance: The instance previously returned by `checkout()`.
+        """
+        pool = self._take_back(instance)
+        if pool is None:
+            raise ValueError(f"{instance!r} is not checked out from {self!r}")
+
+        if self._reset is not None and not pool.closed:
+            try:
+                result = self._reset(instance)
+                if isawaitable(result):
+                    await result
+            except Exception:
+                await self._destroy(pool, instance)
+                return
+        await self._checkin_new(pool, instance)
+
+    async def close(self) -> None:
+        """
+        Finalize all idle instances; instances in use are finalized when checked in.
+        """
+        for instance in self._drop_pools():
+            await self._finalize(instance)
+
+    async def _checkin_new(self, pool: _Pool[R], instance: R) -> None:
+        if pool.closed:
+            await self._destroy(pool, instance)
+            return
+        while pool.waiters:
+            waiter = pool.waiters.popleft()
+            if self._is_waiting(waiter):
+                self._lend(pool, instance)
+                waiter.set_result(_Handoff(instance))
+                return
+        pool.idle.append(instance)
+
+    async def _pass_on(self, pool: _Pool[R], handoff: _Handoff[R]) -> None:
+        # A waiter was cancelled after being served, so its instance or slot goes to the next one
+        if handoff.create:
+            self._hand_over(self._release_slots(pool), _Handoff(create=True))
+        else:
+            self._take_back(cast(R, handoff.instance))
+            await self._checkin_new(pool, cast(R, handoff.instance))
+
+    async def _destroy(self, pool: _Pool[R], instance: R) -> None:
+        creators = self._release_slots(pool)
+        await self._finalize(instance)
+        self._hand_over(creators, _Handoff(create=True))
+
+    def _is_waiting(self, waiter: "asyncio.Future[_Handoff[R]]") -> bool:
+        return not waiter.done()
+
+    def _hand_over(self, waiters: List["asyncio.Future[_Handoff[R]]"],
+                   handoff: _Handoff[R]) -> None:
+        for waiter in waiters:
+            waiter.set_result(handoff)
+
+    async def _finalize(self, instance: R) -> None:
+        if self._finalizer is not None:
+            result = self._finalizer(instance)
+            if isawaitable(result):
+                await result
+
+
+class _SyncLease(Generic[R]):
+    __slots__ = ("_pool", "_args", "_kwargs", "_instance",)
+
+    def __init__(self, pool: SyncSharedPool[Any, R],
+                 args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+        self._pool = pool
+        self._args = args
+        self._kwargs = kwargs
+
+    def __enter__(self) -> R:
+        self._instance = self._pool.checkout(*self._args, **self._kwargs)
+        return self._instance
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._pool.checkin(self._instance)
+
+
+class _AsyncLease(Generic[R]):
+    __slots__ = ("_pool", "_args", "_kwargs", "_instance",)
+
+    def __init__(self, pool: AsyncSharedPool[Any, R],
+                 args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+        self._pool = pool
+        self._args = args
+        self._kwargs = kwargs
+
+    async def __aenter__(self) -> R:
+        self._instance = await self._pool.checkout(*self._args, **self._kwargs)
+        return self._instance
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self._pool.checkin(self._instance)
+
+
+def shared_pool(*,
+                min_size: int = 0,
+                max_size: int = 8,
+                type_sensitive: bool = False,
+                reset: Optional[ResetHook] = None,
+                finalizer: Optional[Finalizer] = None,
+                ) -> Callable[[Callable[P, R]],
+                              Union[SyncSharedPool[P, R], AsyncSharedPool[P, Any]]]:
+    """
+    A decorator that keeps a pool of instances built by the same factory.
+
+    Where `shared_resource` hands the same instance to every caller, `shared_pool` lends each
+    caller an instance of its own for the duration of a `with` (or `async with`) block. Like
+    `shared_resource`, each unique set of arguments gets its own pool.
+
+        @shared_pool(max_size=4, reset=lambda conn: conn.rollback())
+        def db_connection(dsn: str) -> Connection:
+            return connect(dsn)
+
+        with db_connection(DSN) as conn:
+            ...
+
+    :param min_size: The number of instances created on the first checkout of an argument set.
+                     Defaults to 0.
+    :param max_size: The maximum number of instances per argument set; further checkouts wait
+                     (FIFO) until an instance is checked in. Defaults to 8.
+    :param type_sensitive: If True, values of different types (e.g., `1` and `1.0`) get
+                           separate pools. Defaults to False.
+    :param reset: An optional callable run on every instance when it is checked in, e.g. to
+                  roll back a transaction. If it raises, the instance is finalized and
+                  replaced. It may be a coroutine function for asynchronous factories.
+    :param finalizer: An optional callable that receives every instance removed from the pool,
+                      including idle instances when the test suite ends.
+    :return: A decorator that wraps the target function with pooling capabilities.
+    """
+    if not 0 <= min_size <= max_size or max_size < 1:
+        raise ValueError(f"Invalid pool size: min_size={min_size}, max_size={max_size}")
+
+    def wrapper(func: Callable[P, R]) -> Union[SyncSharedPool[P, R], AsyncSharedPool[P, Any]]:
+        options: Dict[str, Any] = dict(min_size=min_size, max_size=max_size,
+                                       type_sensitive=type_sensitive, reset=reset,
+                                       finalizer=finalizer)
+        if iscoroutinefunction(func):
+            return AsyncSharedPool(func, **options)
+        for hook in (reset, finalizer):
+            if hook is not None and iscoroutinefunction(hook):
+                raise TypeError(
+                    f"Hook {hook!r} of synchronous pool {func!r} must not be a coroutine function"
+                )
+        return SyncSharedPool(func, **options)
+    return wrapper
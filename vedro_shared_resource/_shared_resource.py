@@ -0,0 +1,190 @@
+import sys
+from asyncio import iscoroutinefunction
+from inspect import isasyncgenfunction
+from pathlib import Path
+from typing import Any, Callable, Dict, Literal, Optional, Sequence, TypeVar, Union, cast
+
+if sys.version_info >= (3, 10):
+    from typing import ParamSpec
+else:
+    from typing_extensions import ParamSpec
+
+from ._async_resource import AsyncSharedResource
+from ._base_resource import Finalizer, Validator
+from ._dependencies import Dependency
+from ._eviction import EvictionPolicy, resolve_eviction
+from ._lazy import LazyAsyncSharedResource, LazySyncSharedResource
+from ._persistent import DEFAULT_CACHE_DIR, Codec, resolve_codec
+from ._sizing import SizeEstimator, deep_sizeof
+from ._sync_resource import SyncSharedResource
+
+__all__ = ("shared_resource",)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+def shared_resource(*,
+                    max_instances: Optional[int] = 128,
+                    min_instances: int = 0,
+                    type_sensitive: bool = False,
+                    finalizer: Optional[Finalizer] = None,
+                    cross_process: Optional[Literal["value", "proxy"]] = None,
+                    ttl: Optional[float] = None,
+                    refresh_ahead: Optional[float] = None,
+                    idle_timeout: Optional[float] = None,
+                    validate: Optional[Validator] = None,
+                    validate_interval: float = 0.0,
+                    persist: Optional[Union[Literal["pickle", "marshal", "json"], Codec]] = None,
+                    persist_dir: Union[str, Path] = DEFAULT_CACHE_DIR,
+                    max_bytes: Optional[int] = None,
+                    sizeof: SizeEstimator = deep_sizeof,
+                    lazy: bool = False,
+                    depends_on: Sequence[Dependency] = (),
+                    eviction: Union[Literal["lru", "lookahead", "cost"], EvictionPolicy] = "lru",
+                    tags: Union[str, Sequence[str]] = (),
+                    ) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """
+    A decorator for caching function call results (memoization).
+
+    This decorator supports both synchronous and asynchronous functions. Results are kept in
+    a least-recently-used cache, and for asynchronous functions concurrent calls with the same
+    arguments share a single initialization.
+
+    The function may also be a (sync or async) generator that yields the resource once: the
+    code before `yield` sets it up, and the code after `yield` tears it down whenever the
+    instance is finalized (on eviction, expiration, a failed health check, `cache_clear()` or
+    at the end of the suite).
+
+    It is useful for sharing expensive-to-compute or frequently accessed resources across multiple
+    calls, reducing redundant computations and improving performance.
+
+    :param max_instances: The maximum number of cached results to retain. Once the cache reaches
+                          this limit, the least-recently-used entry is evicted; None means no
+                          limit, like `maxsize=None` of `functools.lru_cache`. Defaults to 128.
+    :param min_instances: The number of instances the global cache budget (see
+                          `set_cache_budget()`) never evicts below. Defaults to 0.
+    :param type_sensitive: If True, values of different types (e.g., `1` and `1.0`) are cached
+                           separately. Defaults to False.
+    :param finalizer: An optional callable that receives a cached result once it is evicted,
+                      cleared, or when the test suite ends. It may be a coroutine function for
+                      asynchronous resources. Defaults to None.
+    :param cross_process: Opt-in sharing between worker processes. When a
+                          `ResourceCoordinator` is running, instances are built once in the
+                          coordinator process and workers receive either a pickled copy
+                          (`"value"`) or a proxy forwarding method calls (`"proxy"`, synchronous
+                          functions only). Without a coordinator the function is cached locally.
+                          The decorated function must be importable at module level.
+                          Defaults to None.
+    :param ttl: An optional lifetime in seconds. A cached result older than this is finalized
+                and rebuilt on the next access. Defaults to None (no expiration).
+    :param refresh_ahead: An optional fraction of `ttl` (between 0 and 1) after which a cache
+                          hit starts rebuilding the instance in the background (a thread, or a
+                          task for asynchronous functions). Callers keep getting the old
+                          instance until the new one is ready; the old one is then finalized.
+                          Defaults to None (rebuild on the first access after expiration).
+    :param idle_timeout: An optional number of seconds a cached result may stay unused before
+                         it is finalized and rebuilt on the next access. Defaults to None.
+    :param validate: An optional health check that receives a cached result on access and
+                     returns whether it is still usable (it may be a coroutine function for
+                     asynchronous resources). A falsy result or an exception finalizes the
+                     instance and rebuilds it, while callers with the same arguments wait for
+                     the check. Defaults to None.
+    :param validate_interval: The minimum number of seconds between two health checks of the
+                              same instance, so that frequent hits stay cheap. Defaults to 0
+                              (check on every access).
+    :param persist: Opt-in persistent cache that keeps results on disk between runs, for
+                    factories that build pure data. Either the name of a built-in codec
+                    (`"pickle"`, `"marshal"`, `"json"`) or a custom `Codec`. Artifacts are keyed
+                    by a hash of the function source and its arguments; large artifacts are
+                    loaded through `mmap`. Defaults to None.
+    :param persist_dir: The directory of the persistent cache. Defaults to
+                        `.vedro/shared_resources`.
+    :param max_bytes: An optional memory budget for the cached results of this function. Each
+                      result is measured once it is built, and least-recently-used results are
+                      evicted until the total fits (the newest result is always kept).
+                      Defaults to None (only `max_instances` applies).
+    :param sizeof: Estimates the size of a result in bytes for `max_bytes`. Defaults to
+                   a recursive `sys.getsizeof`.
+    :param lazy: If True, calls return a proxy immediately and the resource is built on first
+                 use (attribute access or call), still once per key. For asynchronous
+                 functions the call is not awaited; `await proxy`, `await proxy.attr` and
+                 `await proxy.method(...)` build the resource first. Defaults to False.
+    :param depends_on: Shared resources (called without arguments) this one is built from,
+                       or their names in the module of the decorated function. Before the
+                       function runs, its dependencies are built in parallel, each starting
+                       its own dependencies the same way; cycles raise a `ValueError` on first
+                       use. At the end of the suite dependents are finalized before their
+                       dependencies. Defaults to ().
+    :param eviction: Which instances are evicted first once `max_instances` or `max_bytes`
+                     is exceeded: `"lru"` (least-recently-used), `"lookahead"` (the one whose
+                     next use in the scenario schedule is the furthest away, based on the
+                     usage recorded by `SharedResourceScoping` or `SharedResourceAffinity`
+                     during the previous run), `"cost"` (the one that is cheapest to rebuild
+                     given its measured initialization time, aged by recency), or a custom
+                     `EvictionPolicy` such as `CostAwareEviction(use_size=True)`. Defaults
+                     to `"lru"`.
+    :param tags: Labels of the external state the resource depends on, e.g. `"db"`.
+                 `invalidate_tag("db")` drops and finalizes the instances of every function
+                 with that tag. A single tag may be passed as a string. Defaults to ().
+    :return: A decorator that wraps the target function with caching capabilities.
+    """
+    if cross_process not in (None, "value", "proxy"):
+        raise ValueError(f"cross_process must be None, 'value' or 'proxy', got {cross_process!r}")
+    for name, seconds in (("ttl", ttl), ("idle_timeout", idle_timeout)):
+        if seconds is not None and seconds <= 0:
+            raise ValueError(f"{name} must be a positive number of seconds, got {seconds!r}")
+    if refresh_ahead is not None:
+        if ttl is None:
+            raise ValueError("refresh_ahead requires a ttl")
+        if not 0 < refresh_ahead < 1:
+            raise ValueError(f"refresh_ahead must be between 0 and 1, got {refresh_ahead!r}")
+    if max_bytes is not None and max_bytes <= 0:
+        raise ValueError(f"max_bytes must be positive, got {max_bytes!r}")
+    if validate_interval < 0:
+        raise ValueError(f"validate_interval must not be negative, got {validate_interval!r}")
+    if max_instances is not None and max_instances <= 0:
+        raise ValueError(f"max_instances must be positive or None, got {max_instances!r}")
+    if min_instances < 0:
+        raise ValueError(f"min_instances must not be negative, got {min_instances!r}")
+    options: Dict[str, Any] = dict(max_instances=max_instances, min_instances=min_instances,
+                                   type_sensitive=type_sensitive,
+                                   finalizer=finalizer, cross_process=cross_process,
+                                   ttl=ttl, refresh_ahead=refresh_ahead,
+                                   idle_timeout=idle_timeout,
+                                   validate=validate, validate_interval=validate_interval,
+                                   persist=resolve_codec(persist) if persist is not None else None,
+                                   persist_dir=persist_dir, max_bytes=max_bytes, sizeof=sizeof,
+                                   depends_on=depends_on,
+                                   tags=(tags,) if isinstance(tags, str) else tuple(tags))
+
+    resolve_eviction(eviction)  # fail early on unknown names
+
+    def wrapper(func: Callable[P, R]) -> Callable[P, R]:
+        options["eviction"] = resolve_eviction(eviction)
+        if cross_process is not None and "<locals>" in getattr(func, "__qualname__", "<locals>"):
+            raise ValueError(
+                f"Cross-process resource {func!r} must be defined at module level"
+            )
+        if iscoroutinefunction(func) or isasyncgenfunction(func):
+            if cross_process == "proxy":
+                raise TypeError(
+                    f"Asynchronous resource {func!r} can only be shared across processes "
+                    "by value"
+                )
+            async_cls = LazyAsyncSharedResource if lazy else AsyncSharedResource
+            return cast(Callable[P, R], async_cls(func, **options))
+        else:
+            if finalizer is not None and iscoroutinefunction(finalizer):
+                raise TypeError(
+                    f"Finalizer {finalizer!r} of synchronous resource {func!r} "
+                    "must not be a coroutine function"
+                )
+            if validate is not None and iscoroutinefunction(validate):
+                raise TypeError(
+                    f"Validator {validate!r} of synchronous resource {func!r} "
+                    "must not be a coroutine function"
+                )
+            sync_cls = LazySyncSharedResource if lazy else SyncSharedResource
+            return cast(Callable[P, R], sync_cls(func, **options))
+    return wrapper
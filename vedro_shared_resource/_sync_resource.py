@@ -0,0 +1,388 @@
+import asyncio
+import sys
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from math import inf
+from threading import Thread, current_thread, get_ident
+from time import monotonic, perf_counter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+if sys.version_info >= (3, 10):
+    from typing import ParamSpec
+else:
+    from typing_extensions import ParamSpec
+
+from ._base_resource import BaseSharedResource, CacheEntry
+
+__all__ = ("SyncSharedResource",)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_Teardown = Generator[Any, None, None]
+
+
+class _Flight(Generic[R]):
+    """
+    An in-flight initialization that concurrent callers with the same key wait for.
+    """
+
+    __slots__ = ("future", "owner",)
+
+    def __init__(self) -> None:
+        self.future: "Future[R]" = Future()
+        self.owner = get_ident()
+
+
+class SyncSharedResource(BaseSharedResource[R], Generic[P, R]):
+    """
+    A thread-safe LRU cache around a synchronous resource factory.
+
+    Unlike `functools.lru_cache`, evicted instances are passed to the finalizer as soon as
+    they drop out of the cache, so `max_instances` bounds the number of live instances.
+
+    Generator factories yield the instance: the code after `yield` runs in place of a
+    finalizer, after the `finalizer` if one is given.
+
+    Initialization is single-flight: concurrent callers with the same key wait for the one
+    in-flight call (and share its result or exception), while different keys are still built
+    in parallel since the cache lock is never held while the factory runs.
+    """
+
+    def __init__(self, func: Callable[P, R], **options: Any) -> None:
+        super().__init__(func, **options)
+        self._flights: Dict[Hashable, _Flight[R]] = {}
+        # Background refreshes (see `refresh_ahead`), joined at the end of the run since they
+        # finalize the instances they replace
+        self._refreshing: Set[Thread] = set()
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> R:
+        # The hit path is inlined here, misses (and expiring or validated resources) go
+        # through `_call`
+        key = self._key_maker(args, kwargs)
+        if not self._tracks_hits:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry.value
+        return self._call(args, kwargs, remote=True, key=key)
+
+    def _call_local(self, *args: P.args, **kwargs: P.kwargs) -> R:
+        # Entry point of the cross-process coordinator, which owns the instances it builds
+        return self._call(args, kwargs, remote=False)
+
+    def peek(self, *args: P.args, **kwargs: P.kwargs) -> Optional[R]:
+        """
+        Return the instance cached for the given arguments without building it, and without
+        counting a hit or refreshing its recency.
+
+        :return: The instance, or None if it is not cached (or has expired).
+        """
+        key = self._make_key(args, kwargs)
+        with self._lock:
+            entry = self._lookup(key)
+            return None if entry is None else entry.value
+
+    def _prewarm(self, executor: Executor, args: Any, kwargs: Any) -> "Future[R]":
+        # Callers with the same key join the in-flight initialization started here
+        return executor.submit(self._call, args, kwargs, remote=True)
+
+    def _call(self, args: Any, kwargs: Any, *, remote: bool,
+              key: Optional[Hashable] = None) -> R:
+        if key is None:
+            key = self._make_key(args, kwargs)
+        if self._recorder is not None:
+            self._recorder(self, key)
+        now = monotonic() if self._tracks_hits else 0.0
+        expired: List[CacheEntry[R]] = []
+        suspect: Optional[CacheEntry[R]] = None
+        try:
+            with self._lock:
+                if self._expires:
+                    expired = self._collect_expired(now)
+                flight = self._flights.get(key)
+                if flight is not None:
+                    # Either being built or being validated, both are shared with this call
+                    self._hits += 1
+                    is_leader = False
+                else:
+                    entry = self._entries.get(key)
+                    if entry is not None:
+                        self._entries.move_to_end(key)
+                        entry.last_access = now
+                        self._eviction.access(entry)
+                        if not self._validation_due(entry, now):
+                            self._hits += 1
+                            if now >= entry.refresh_at:
+                                entry.refresh_at = inf  # a single refresh per instance
+                                self._start_refresh(entry, args, kwargs, remote)
+                            return entry.value
+                        suspect = entry
+                    else:
+                        self._misses += 1
+                    flight = self._flights[key] = _Flight()
+                    is_leader = True
+        finally:
+            # Expired instances are finalized outside the lock, before their keys are rebuilt
+            if expired:
+                self._finalize_evicted(expired)
+
+        if not is_leader:
+            return self._join(flight)
+
+        try:
+            if suspect is not None and self._revalidate(suspect):
+                with self._lock:
+                    del self._flights[key]
+                flight.future.set_result(suspect.value)
+                return suspect.value
+            started_at = perf_counter()
+            value, owned, teardown = self._create(key, args, kwargs, remote)
+            entry = CacheEntry(key, value, owned=owned)
+            entry.teardown = teardown
+            if self._measures_size:
+                entry.size = self._sizeof(value)  # measured outside the lock
+            with self._lock:
+                entry.cost = perf_counter() - started_at
+                self._metrics.record_init(entry.cost)
+                del self._flights[key]
+                self._entries[key] = entry
+                self._eviction.admit(entry)
+                self._total_bytes += entry.size
+                if self._tracks_hits:
+                    self._track(entry, monotonic())
+                evicted = self._evict_overflow(keep=entry)
+                self._register_cleanup()
+        except BaseException as exc:
+            # Callers waiting for the flight get the error as well, whichever step failed
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.future.set_exception(exc)
+            raise
+
+        flight.future.set_result(value)
+        self._finalize_evicted(evicted)
+        if self._budget is not None:
+            self._budget.enforce(keep=entry)
+        return value
+
+    def _revalidate(self, entry: CacheEntry[R]) -> bool:
+        # Runs in the single-flight slot of the entry's key, so callers with the same key wait
+        # for the verdict (and for the replacement instance, if the check fails)
+        try:
+            healthy = bool(self._validate(entry.value))  # type: ignore[misc]
+        except Exception:
+            healthy = False
+        with self._lock:
+            if healthy:
+                self._hits += 1
+                entry.validated_at = monotonic()
+                return True
+            self._misses += 1
+            dropped = self._entries.get(entry.slot) is entry
+            if dropped:
+                self._remove(entry)
+        if dropped:  # otherwise it was already finalized by `cache_clear()`
+            self._finalize_evicted([entry])
+        return False
+
+    def _start_refresh(self, stale: CacheEntry[R], args: Any, kwargs: Any, remote: bool) -> None:
+        # Called with the lock held
+        thread = Thread(target=self._run_refresh, args=(stale, args, kwargs, remote),
+                        name="shared-resource-refresh", daemon=True)
+        self._refreshing.add(thread)
+        thread.start()
+
+    def _run_refresh(self, stale: CacheEntry[R], args: Any, kwargs: Any, remote: bool) -> None:
+        try:
+            self._refresh(stale, args, kwargs, remote)
+        finally:
+            with self._lock:
+                self._refreshing.discard(current_thread())
+
+    def _refresh(self, stale: CacheEntry[R], args: Any, kwargs: Any, remote: bool) -> None:
+        # Builds the replacement while callers keep getting the stale instance; if the build
+        # fails, the stale one is simply rebuilt once it expires
+        started_at = perf_counter()
+        try:
+            value, owned, teardown = self._create(stale.key, args, kwargs, remote)
+        except Exception:
+            return
+        entry = CacheEntry(stale.key, value, owned=owned)
+        entry.teardown = teardown
+        if self._measures_size:
+            entry.size = self._sizeof(value)
+        with self._lock:
+            entry.cost = perf_counter() - started_at
+            self._metrics.record_init(entry.cost)
+            if self._entries.get(stale.slot) is stale:
+                self._entries[stale.slot] = entry
+                self._total_bytes += entry.size - stale.size
+                self._eviction.admit(entry)
+                self._track(entry, monotonic())
+                # The replacement may be bigger than the stale instance it took over from
+                replaced = [stale] + self._evict_overflow(keep=entry)
+            else:
+                replaced = [entry]  # dropped meanwhile, so the replacement is not needed either
+        self._finalize_evicted(replaced)
+        if self._budget is not None and replaced[0] is stale:
+            self._budget.enforce(keep=entry)
+
+    def _join(self, flight: "_Flight[R]") -> R:
+        if flight.owner == get_ident():
+            raise RuntimeError(
+                f"{self!r} was called recursively with the same arguments during initialization"
+            )
+        started_at = perf_counter()
+        try:
+            return flight.future.result()
+        finally:
+            with self._lock:
+                self._metrics.record_wait(perf_counter() - started_at)
+
+    def _create(self, key: Hashable, args: Any, kwargs: Any,
+                remote: bool) -> Tuple[R, bool, Optional[_Teardown]]:
+        client = self._get_coordinator_client(remote)
+        if client is not None:
+            value: R = client.acquire(self._name, args, kwargs,
+                                      proxy=(self._cross_process == "proxy"))
+            return value, False, None
+        if self._store is None:
+            value, teardown = self._run_factory(args, kwargs)
+            return value, True, teardown
+        found, value = self._store.load(key)
+        if not found:
+            value, teardown = self._run_factory(args, kwargs)
+            self._store.store(key, value)
+            return value, True, teardown
+        # Instances loaded from disk were not set up by the generator, so nothing to tear down
+        return value, True, None
+
+    def _run_factory(self, args: Any, kwargs: Any) -> Tuple[R, Optional[_Teardown]]:
+        if self._depends_on:
+            self._build_dependencies()
+        if not self._generator:
+            return self._func(*args, **kwargs), None
+        generator = self._func(*args, **kwargs)
+        try:
+            value: R = next(generator)
+        except StopIteration:
+            raise RuntimeError(f"Generator resource {self!r} did not yield") from None
+        return value, generator
+
+    def _build_dependencies(self) -> None:
+        # Dependencies are built in parallel (each of them starts its own dependencies the same
+        # way), so the whole graph takes as long as its critical path. The factory itself then
+        # gets them as cache hits
+        dependencies = self._get_dependencies()
+        for dependency in dependencies:
+            if not isinstance(dependency, SyncSharedResource):
+                raise TypeError(
+                    f"Synchronous resource {self!r} cannot depend on {dependency!r}"
+                )
+        first, *others = dependencies
+        if not others:
+            first._call((), {}, remote=True)
+            return
+        with ThreadPoolExecutor(max_workers=len(others)) as executor:
+            futures = [executor.submit(d._call, (), {}, remote=True) for d in others]
+            first._call((), {}, remote=True)
+            for future in futures:
+                future.result()
+
+    def cache_clear(self) -> None:
+        """
+        Drop all cached instances, passing each of them to the finalizer.
+
+        Every instance is finalized even if some finalizers fail; the first error is then
+        re-raised.
+        """
+        self._finalize(self._take_all())
+
+    def _take_all(self) -> List[CacheEntry[R]]:
+        with self._lock:
+            self._cleanup_registered = False
+            return self._drop_all()
+
+    async def _wait_finalizing(self) -> None:
+        # A refresh that completes after the instances were taken finalizes its replacement
+        # itself, so the threads are joined without blocking the event loop
+        with self._lock:
+            pending = list(self._refreshing)
+        if pending:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, _join_all, pending)
+
+    def _release(self, predicate: Callable[[Hashable], bool]) -> None:
+        # Drops and finalizes the instances whose keys match, e.g. once no remaining
+        # scenario needs them
+        with self._lock:
+            released = self._take_entries(predicate)
+        self._finalize(released)
+
+    def _budget_victim(self, keep: Optional[CacheEntry[R]]) -> Optional[CacheEntry[R]]:
+        with self._lock:
+            return super()._budget_victim(keep)
+
+    def _budget_remove(self, entry: CacheEntry[R]) -> bool:
+        with self._lock:
+            return super()._budget_remove(entry)
+
+    def _finalize_evicted(self, entries: List[CacheEntry[R]]) -> None:
+        try:
+            self._finalize(entries)
+        except Exception as exc:
+            self._warn_finalizer_failed(exc)
+
+    def _finalize(self, entries: Iterable[CacheEntry[R]]) -> None:
+        # Every instance is finalized, the first error is raised once all of them are
+        if not self._finalizes:
+            return
+        errors: List[Exception] = []
+        for entry in entries:
+            if not entry.owned:
+                continue
+            try:
+                self._finalize_entry(entry)
+            except Exception as exc:
+                errors.append(exc)
+        if errors:
+            raise errors[0]
+
+    def _finalize_entry(self, entry: CacheEntry[R]) -> None:
+        try:
+            if self._finalizer is not None:
+                self._finalizer(entry.value)
+        finally:
+            if entry.teardown is not None:
+                _tear_down(entry.teardown)
+
+
+def _join_all(threads: List[Thread]) -> None:
+    for thread in threads:
+        thread.join()
+
+
+def _tear_down(generator: _Teardown) -> None:
+    # Runs the code after `yield`, like the exit of `contextlib.contextmanager`
+    try:
+        next(generator)
+    except StopIteration:
+        return
+    generator.close()
+    raise RuntimeError(f"Generator {generator!r} of a shared resource yielded more than once")
@@ -0,0 +1,38 @@
+from threading import Lock
+from typing import Any, Dict, Iterable
+from weakref import WeakSet
+
+__all__ = ("register_tags", "invalidate_tag",)
+
+# Tag -> the decorated functions whose instances carry it
+_index: "Dict[str, WeakSet[Any]]" = {}
+_lock = Lock()
+
+
+def register_tags(resource: Any, tags: Iterable[str]) -> None:
+    """
+    Add a decorated function to the tag index.
+
+    Resources are held weakly, like in the resource registry.
+
+    :param resource: The decorated function object.
+    :param tags: The tags of all its instances.
+    """
+    with _lock:
+        for tag in tags:
+            _index.setdefault(tag, WeakSet()).add(resource)
+
+
+def invalidate_tag(tag: str) -> int:
+    """
+    Drop and finalize every cached instance carrying a tag, across all shared resources.
+
+    Only the functions declared with the tag are visited. Instances of asynchronous
+    resources are finalized in the background of the running event loop, like evicted ones.
+
+    :param tag: A tag given to `shared_resource(tags=...)`.
+    :return: The number of instances dropped.
+    """
+    with _lock:
+        resources = list(_index.get(tag, ()))
+    return sum(resource._invalidate_all() for resource in resources)
@@ -0,0 +1,171 @@
+import hashlib
+import json
+from bisect import bisect_left
+from math import inf
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple, Union
+
+from ._keys import encode_key
+from ._registry import get_registered_resources
+
+__all__ = ("Usage", "UsageRecorder", "UsageSchedule", "key_id", "load_usage", "save_usage",
+           "schedule",)
+
+# (resource name, key id)
+Usage = Tuple[str, str]
+
+_USAGE_VERSION = 1
+
+# Recorders of the plugins that are currently observing resource calls
+_recorders: List["UsageRecorder"] = []
+
+
+def key_id(key: Hashable) -> str:
+    """
+    Return an identifier of a cache key that is stable between runs.
+
+    Keys are encoded with `encode_key`. Keys that cannot be pickled fall back to their
+    `repr()`, which is stable for common argument types but not for objects with the default
+    `repr()`; such keys are simply never matched with a previous run.
+
+    :param key: A cache key.
+    :return: A short hex digest.
+    """
+    try:
+        data = encode_key(key)
+    except Exception:
+        data = repr(key).encode()
+    return hashlib.sha1(data).hexdigest()[:16]
+
+
+def load_usage(path: Union[str, Path]) -> Dict[str, List[Usage]]:
+    """
+    Read the instances used by each scenario during a previous run.
+
+    :param path: The usage file.
+    :return: A mapping of scenario unique ids to usages; empty if the file is missing,
+             unreadable or written by an incompatible version.
+    """
+    try:
+        data = json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != _USAGE_VERSION:
+        return {}
+    return {uid: [(name, key) for name, key in entries]
+            for uid, entries in data.get("scenarios", {}).items()}
+
+
+def save_usage(path: Union[str, Path], recorded: Dict[str, List[Usage]],
+               observed: Dict[str, Set[Usage]]) -> None:
+    """
+    Write the usage file, replacing the recorded usage of every scenario that ran.
+
+    :param path: The usage file.
+    :param recorded: The usage loaded at startup.
+    :param observed: The usage of the scenarios of this run.
+    """
+    usage = {uid: [list(u) for u in entries] for uid, entries in recorded.items()}
+    usage.update({uid: sorted(list(u) for u in entries) for uid, entries in observed.items()})
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"version": _USAGE_VERSION, "scenarios": usage}))
+
+
+class UsageSchedule:
+    """
+    The planned accesses of the current run: which scenarios, in the scheduled order, used
+    each instance during the previous run, and which of them is running now.
+    """
+
+    def __init__(self) -> None:
+        self._uses: Dict[Usage, List[int]] = {}
+        self._positions: Dict[str, int] = {}
+        self._position = 0
+
+    def plan(self, unique_ids: Iterable[str], recorded: Dict[str, List[Usage]]) -> None:
+        self.reset()
+        for position, unique_id in enumerate(unique_ids):
+            self._positions[unique_id] = position
+            for usage in recorded.get(unique_id, ()):
+                self._uses.setdefault(usage, []).append(position)
+
+    def advance(self, unique_id: str) -> None:
+        # Scenarios that are not in the plan keep the position of the previous one
+        self._position = self._positions.get(unique_id, self._position)
+
+    def next_use(self, usage: Usage) -> Optional[float]:
+        """
+        Return the position of the next scheduled scenario that uses an instance.
+
+        The running scenario counts as a future use.
+
+        :param usage: The resource name and key id of the instance.
+        :return: The position, `inf` if no remaining scenario uses the instance, or None if
+                 the instance does not appear in the plan at all.
+        """
+        uses = self._uses.get(usage)
+        if uses is None:
+            return None
+        idx = bisect_left(uses, self._position)
+        return uses[idx] if idx < len(uses) else inf
+
+    def reset(self) -> None:
+        self._uses.clear()
+        self._positions.clear()
+        self._position = 0
+
+
+schedule = UsageSchedule()
+
+
+def _record(resource: Any, key: Hashable) -> None:
+    for recorder in _recorders:
+        recorder._record(resource, key)
+
+
+class UsageRecorder:
+    """
+    Collects the (resource, key) pairs that each scenario requests from shared resources.
+
+    Several plugins may record at the same time; the resources are observed while at least
+    one recorder is started. Started recorders also keep the global `schedule` up to date.
+    """
+
+    def __init__(self) -> None:
+        self.observed: Dict[str, Set[Usage]] = {}
+        # Raw (resource, key) pairs of the running scenario, turned into ids once it ends
+        self._current: Optional[Set[Tuple[Any, Hashable]]] = None
+
+    def start(self, scheduled: Iterable[str], recorded: Dict[str, List[Usage]]) -> None:
+        if self in _recorders:
+            return
+        if not _recorders:
+            schedule.plan(scheduled, recorded)
+        _recorders.append(self)
+        for resource in get_registered_resources():
+            resource._set_recorder(_record)
+
+    def stop(self) -> None:
+        if self not in _recorders:
+            return
+        _recorders.remove(self)
+        if not _recorders:
+            schedule.reset()
+            for resource in get_registered_resources():
+                resource._set_recorder(None)
+
+    def scenario_started(self, unique_id: str) -> None:
+        schedule.advance(unique_id)
+        self._current = set()
+
+    def scenario_finished(self, unique_id: str) -> None:
+        if self._current is not None:
+            self.observed[unique_id] = {(resource._name, key_id(key))
+                                        for resource, key in self._current}
+            self._current = None
+
+    def _record(self, resource: Any, key: Hashable) -> None:
+        current = self._current
+        if current is not None:
+            current.add((resource, key))